@@ -10,19 +10,24 @@ import time
 import random
 import requests
 import base64
-import yaml
-import markdown
+import threading
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional
-import schedule
-from core.local_llm_content import MultilingualLocalLLMContentGenerator
-from core.enhanced_research_llm import EnhancedResearchLLMGenerator
-from content.claude_content import ClaudeContentGenerator
-from seo.seo_optimizer import MultilingualSEOOptimizer
+from core.provider_router import ProviderRouter
+from core.sectioned_generation import SectionedGenerator
+from core.services import LazyService, ServiceContainer, get_shared_services
 
 class AutoContentSystem:
-    def __init__(self):
+    # Generators are built on first use and shared with the other subsystems
+    local_llm = LazyService("local_llm")
+    claude = LazyService("claude")
+    enhanced_research = LazyService("enhanced_research")
+    seo_optimizer = LazyService("seo_optimizer")
+    
+    def __init__(self, services: Optional[ServiceContainer] = None):
+        self.services = services or get_shared_services()
         self.config_file = "config/settings.json"  # Use new settings file
         self.site_url = os.getenv("WP_SITE_URL") or self._load_config_value("site_url") or "https://agenticaiupdates.space"
         self.api_url = f"{self.site_url}/wp-json/wp/v2"
@@ -32,17 +37,23 @@ class AutoContentSystem:
         # WordPress website info
         self.wordpress_website = None
         
-        # Initialize local LLM generator
-        self.local_llm = MultilingualLocalLLMContentGenerator()
+        # Local LLM generation; providers are kept here because the generators are shared with other subsystems
         self.use_local_llm = False  # Default to template-based generation
+        self.local_llm_provider = "deepseek"
+        self.research_llm_provider = "deepseek"
+        self.use_sectioned_llm = False  # Generate template sections in parallel with the local LLM
+        self.languages = ["english"]  # Local LLM posts are written in each language, the first one is the main post
+        
+        # A slow or failed local generation is hedged or failed over down this chain; unavailable providers are skipped
+        self.routing_config = {
+            "fallback_chain": ["claude"]
+        }
+        self._provider_router: Optional[ProviderRouter] = None
+        self._router_lock = threading.Lock()
         
-        # Initialize enhanced research + LLM generator
-        self.enhanced_research = EnhancedResearchLLMGenerator()
+        # Enhanced research + LLM generation
         self.use_research_llm = False  # Default to template-based generation
         
-        # Initialize SEO optimizer
-        self.seo_optimizer = MultilingualSEOOptimizer()
-        
         # Load dynamic configuration
         self.image_collections = self._load_image_config().get("collections", self._get_default_image_collections())
         self.featured_image_map = self._load_image_config().get("featured_map", self._get_default_featured_map())
@@ -234,8 +245,10 @@ class AutoContentSystem:
     def enable_local_llm(self, provider: str = "deepseek") -> bool:
         """Enable local LLM content generation"""
         try:
-            self.local_llm.set_provider(provider)
-            if self.local_llm.test_connection():
+            if provider not in self.local_llm.providers:
+                raise ValueError(f"Unknown provider: {provider}")
+            if self.local_llm.test_connection(provider):
+                self.local_llm_provider = provider
                 self.use_local_llm = True
                 print(f"✅ Local LLM enabled: {provider}")
                 return True
@@ -246,6 +259,23 @@ class AutoContentSystem:
             print(f"❌ Error enabling local LLM: {e}")
             return False
     
+    @property
+    def provider_router(self) -> ProviderRouter:
+        """Router over the local models and Claude, built when the first local LLM post needs it"""
+        with self._router_lock:
+            if self._provider_router is None:
+                providers = {name: partial(self.local_llm.generate_from_prompt, provider=name)
+                             for name in self.local_llm.providers}
+                providers["claude"] = self.claude.generate_content_with_custom_prompt
+                self._provider_router = ProviderRouter(providers, chain=self.routing_config["fallback_chain"],
+                                                       is_available=self._provider_available)
+            return self._provider_router
+    
+    def _provider_available(self, provider: str) -> bool:
+        if provider == "claude":
+            return self.claude.is_available()
+        return self.local_llm.is_available(provider)
+    
     def disable_local_llm(self):
         """Disable local LLM and use template generation"""
         self.use_local_llm = False
@@ -254,8 +284,10 @@ class AutoContentSystem:
     def enable_research_llm(self, provider: str = "deepseek") -> bool:
         """Enable research-enhanced LLM content generation"""
         try:
-            self.enhanced_research.local_llm.set_provider(provider)
-            if self.enhanced_research.local_llm.test_connection():
+            if provider not in self.enhanced_research.local_llm.providers:
+                raise ValueError(f"Unknown provider: {provider}")
+            if self.enhanced_research.local_llm.test_connection(provider):
+                self.research_llm_provider = provider
                 self.use_research_llm = True
                 self.use_local_llm = False  # Disable basic LLM when using research
                 print(f"✅ Research-enhanced LLM enabled: {provider}")
@@ -300,6 +332,7 @@ class AutoContentSystem:
     
     def create_blog_post(self, content_idea: Dict) -> str:
         """Create a complete blog post"""
+        import yaml
         
         # Generate SEO-friendly description
         description = f"Discover how {content_idea['topic'].lower()} is transforming marketing in {datetime.now().year}. Learn implementation strategies, best practices, and future trends."
@@ -358,10 +391,15 @@ Recent industry research indicates that companies implementing advanced {content
         
         content_sections.append(intro.strip())
         
-        # Main sections
+        # Main sections; sections the LLM could not write fall back to templates
+        if self.use_sectioned_llm:
+            section_bodies = self.generate_sections_parallel(content_idea)
+        else:
+            section_bodies = [None] * len(content_idea["sections"])
+        
         for i, section in enumerate(content_idea["sections"]):
-            section_content = self.generate_section_content(section, content_idea["topic"], i)
-            content_sections.append(f"## {section}\n\n{section_content}")
+            section_content = section_bodies[i] or self.generate_section_content(section, content_idea["topic"], i)
+            content_sections.append(f"## {section}\n\n{section_content.strip()}")
         
         # Conclusion
         conclusion = f"""
@@ -384,6 +422,15 @@ The future of marketing lies in the intelligent application of these technologie
         
         return full_content
     
+    def generate_sections_parallel(self, content_idea: Dict) -> List[Optional[str]]:
+        """Generate every outline section concurrently with the local LLM, in outline order"""
+        provider = self.local_llm_provider
+        generator = SectionedGenerator(
+            lambda prompt: self.local_llm.generate_from_prompt(prompt, provider=provider), provider)
+        return generator.generate_sections(
+            content_idea["topic"], content_idea["sections"],
+            lambda title: self.local_llm.create_multilingual_content_prompt(title, "section", "english"))
+    
     def generate_section_content(self, section_title: str, topic: str, section_index: int) -> str:
         """Generate content for a specific section"""
         
@@ -583,6 +630,8 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
     
     def publish_to_wordpress(self, file_path: str) -> bool:
         """Publish blog post to WordPress with clean content"""
+        import markdown
+        import yaml
         
         if not self.load_credentials():
             print("❌ Failed to load WordPress credentials")
@@ -819,12 +868,44 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
             print(f"❌ Error uploading featured image: {e}")
             return None
     
+    def generate_local_llm_posts(self, topic: str):
+        """Write the topic in every configured language with the local LLM and save the posts.
+        The languages share one research pass and are generated concurrently, each starting on the
+        local provider and hedged or failed over down the routing chain.
+        Returns (main post or None, posts in the other languages)."""
+        posts = self.local_llm.generate_multilingual_fanout(topic, self.languages, providers=[self.local_llm_provider],
+                                                            router=self.provider_router)
+        
+        saved = []
+        for language in self.languages:
+            post = posts.get(language)
+            if post:
+                post["file_path"] = self.local_llm.save_local_llm_post(post, self.content_dir)
+                saved.append(post)
+            else:
+                print(f"❌ No {language} version of '{topic}'")
+        
+        # Translations are only published alongside their main post
+        if not saved or saved[0]["language"] != self.languages[0]:
+            return None, []
+        return saved[0], saved[1:]
+    
+    def _publish_translations(self, translations: List[Dict]):
+        for post in translations:
+            if self.publish_to_wordpress(post["file_path"]):
+                print(f"🎉 Published {post['language']} version: {post['title']}")
+            else:
+                print(f"❌ Failed to publish {post['language']} version: {post['title']}")
+    
     def create_and_publish_post(self):
         """Create and publish a new blog post"""
         
         print(f"\n🚀 Creating new blog post at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         try:
+            post_data = None
+            translations = []
+            
             if self.use_research_llm:
                 # Use research-enhanced LLM for content generation
                 print("🌐🤖 Using Research-Enhanced LLM for content generation...")
@@ -832,42 +913,37 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
                 post_data = self.enhanced_research.create_comprehensive_research_content(
                     topic=topic,
                     use_local_llm=True,
-                    llm_provider="deepseek"
+                    llm_provider=self.research_llm_provider
                 )
                 
-                if not post_data:
+                if post_data:
+                    print(f"📝 Topic: {post_data['title']}")
+                    
+                    # Save research-enhanced content
+                    file_path = self.enhanced_research.save_enhanced_content(post_data, self.content_dir)
+                    print(f"💾 Saved to: {file_path}")
+                    print(f"💰 Cost: {post_data['metadata']['generation_cost']}")
+                    print(f"📊 Research sources: {post_data['metadata']['data_sources']}")
+                    print(f"📈 Statistics: {post_data['metadata']['statistics_verified']}")
+                else:
+                    # Only this post falls back; the next scheduled run tries the LLM again
                     print("❌ Research LLM failed, falling back to template generation")
-                    self.use_research_llm = False
-                    return self.create_and_publish_post()
-                
-                print(f"📝 Topic: {post_data['title']}")
-                
-                # Save research-enhanced content
-                file_path = self.enhanced_research.save_enhanced_content(post_data, self.content_dir)
-                print(f"💾 Saved to: {file_path}")
-                print(f"💰 Cost: {post_data['metadata']['generation_cost']}")
-                print(f"📊 Research sources: {post_data['metadata']['data_sources']}")
-                print(f"📈 Statistics: {post_data['metadata']['statistics_verified']}")
                 
             elif self.use_local_llm:
                 # Use local LLM for content generation
                 print("🤖 Using Local LLM for content generation...")
                 topic = random.choice(self.topics)
-                post_data = self.local_llm.generate_blog_post_with_local_llm(topic)
+                post_data, translations = self.generate_local_llm_posts(topic)
                 
-                if not post_data:
+                if post_data:
+                    print(f"📝 Topic: {post_data['title']}")
+                    file_path = post_data["file_path"]
+                    print(f"💾 Saved to: {file_path}")
+                    print(f"💰 Cost: $0.00 (Local LLM)")
+                else:
                     print("❌ Local LLM failed, falling back to template generation")
-                    self.use_local_llm = False
-                    return self.create_and_publish_post()
-                
-                print(f"📝 Topic: {post_data['title']}")
                 
-                # Save local LLM generated content
-                file_path = self.local_llm.save_local_llm_post(post_data, self.content_dir)
-                print(f"💾 Saved to: {file_path}")
-                print(f"💰 Cost: $0.00 (Local LLM)")
-                
-            else:
+            if not post_data:
                 # Use template-based generation
                 print("📝 Using template-based content generation...")
                 content_idea = self.generate_content_idea()
@@ -881,18 +957,12 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
                 print(f"💾 Saved to: {file_path}")
             
             # Publish to WordPress
+            title = post_data['title'] if post_data else content_idea['title']
             if self.publish_to_wordpress(file_path):
-                if self.use_research_llm or self.use_local_llm:
-                    title = post_data['title']
-                else:
-                    title = content_idea['title']
                 print(f"🎉 Successfully published: {title}")
+                self._publish_translations(translations)
                 return True
             else:
-                if self.use_research_llm or self.use_local_llm:
-                    title = post_data['title']
-                else:
-                    title = content_idea['title']
                 print(f"❌ Failed to publish: {title}")
                 return False
                 
@@ -907,46 +977,43 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
         print(f"📝 Custom Topic: {custom_topic}")
         
         try:
+            post_data = None
+            translations = []
+            
             if self.use_research_llm:
                 # Use research-enhanced LLM for content generation
                 print("🌐🤖 Using Research-Enhanced LLM for custom topic...")
                 post_data = self.enhanced_research.create_comprehensive_research_content(
                     topic=custom_topic,
                     use_local_llm=True,
-                    llm_provider="deepseek"
+                    llm_provider=self.research_llm_provider
                 )
                 
-                if not post_data:
+                if post_data:
+                    print(f"📝 Generated Title: {post_data['title']}")
+                    
+                    # Save research-enhanced content
+                    file_path = self.enhanced_research.save_enhanced_content(post_data, self.content_dir)
+                    print(f"💾 Saved to: {file_path}")
+                    print(f"💰 Cost: {post_data['metadata']['generation_cost']}")
+                    print(f"📊 Research sources: {post_data['metadata']['data_sources']}")
+                else:
                     print("❌ Research LLM failed, falling back to template generation")
-                    self.use_research_llm = False
-                    return self.create_and_publish_custom_post(custom_topic)
-                
-                print(f"📝 Generated Title: {post_data['title']}")
-                
-                # Save research-enhanced content
-                file_path = self.enhanced_research.save_enhanced_content(post_data, self.content_dir)
-                print(f"💾 Saved to: {file_path}")
-                print(f"💰 Cost: {post_data['metadata']['generation_cost']}")
-                print(f"📊 Research sources: {post_data['metadata']['data_sources']}")
                 
             elif self.use_local_llm:
                 # Use local LLM for content generation
                 print("🤖 Using Local LLM for custom topic...")
-                post_data = self.local_llm.generate_blog_post_with_local_llm(custom_topic)
+                post_data, translations = self.generate_local_llm_posts(custom_topic)
                 
-                if not post_data:
+                if post_data:
+                    print(f"📝 Generated Title: {post_data['title']}")
+                    file_path = post_data["file_path"]
+                    print(f"💾 Saved to: {file_path}")
+                    print(f"💰 Cost: $0.00 (Local LLM)")
+                else:
                     print("❌ Local LLM failed, falling back to template generation")
-                    self.use_local_llm = False
-                    return self.create_and_publish_custom_post(custom_topic)
-                
-                print(f"📝 Generated Title: {post_data['title']}")
                 
-                # Save local LLM generated content
-                file_path = self.local_llm.save_local_llm_post(post_data, self.content_dir)
-                print(f"💾 Saved to: {file_path}")
-                print(f"💰 Cost: $0.00 (Local LLM)")
-                
-            else:
+            if not post_data:
                 # Use template-based generation with custom topic
                 print("📝 Using template-based generation for custom topic...")
                 
@@ -984,18 +1051,12 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
                 print(f"💾 Saved to: {file_path}")
             
             # Publish to WordPress
+            title = post_data['title'] if post_data else content_idea['title']
             if self.publish_to_wordpress(file_path):
-                if self.use_research_llm or self.use_local_llm:
-                    title = post_data['title']
-                else:
-                    title = content_idea['title']
                 print(f"🎉 Successfully published custom post: {title}")
+                self._publish_translations(translations)
                 return True
             else:
-                if self.use_research_llm or self.use_local_llm:
-                    title = post_data['title']
-                else:
-                    title = content_idea['title']
                 print(f"❌ Failed to publish custom post: {title}")
                 return False
                 
@@ -1005,6 +1066,7 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
     
     def run_continuous_publishing(self):
         """Run continuous content publishing"""
+        import schedule
         
         # Get publishing interval from config or environment
         interval = int(os.getenv("PUBLISH_INTERVAL") or self._load_config_value("publish_interval") or 5)
@@ -1023,9 +1085,32 @@ Investment in {topic.lower()} is expected to continue growing, with venture capi
         self.create_and_publish_post()
         
         # Run scheduler
+        warmed_for_run = None
         while True:
             schedule.run_pending()
+            warmed_for_run = self._warm_up_before_next_run(warmed_for_run)
             time.sleep(60)  # Check every minute
+    
+    def _warm_up_before_next_run(self, warmed_for_run):
+        """Load the local model shortly before the next scheduled post so it does not pay the cold start"""
+        import schedule
+        residency = self.local_llm.model_residency
+        if not (self.use_local_llm or self.use_research_llm) or not residency["warm_up_before_runs"]:
+            return warmed_for_run
+        
+        next_run = schedule.next_run()
+        idle_seconds = schedule.idle_seconds()
+        if next_run is None or next_run == warmed_for_run or idle_seconds is None:
+            return warmed_for_run
+        
+        # Sleep granularity is a minute, so warm up once the next run is within the lead time plus one check
+        if idle_seconds <= residency["warm_up_lead_seconds"] + 60:
+            if self.use_research_llm:
+                self.enhanced_research.local_llm.warm_up_in_background(self.research_llm_provider)
+            else:
+                self.local_llm.warm_up_in_background(self.local_llm_provider)
+            return next_run
+        return warmed_for_run
 
 def main():
     """Main function"""
@@ -5,15 +5,78 @@ Integrates with Anthropic's Claude API for high-quality content creation
 """
 
 import requests
+import hashlib
 import json
 import random
 import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Connection problems after which a streamed generation can be resumed
+STREAM_INTERRUPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# API statuses worth retrying (rate limits, server errors, overloaded)
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504, 529)
+
+# Checkpoint files held by running generations, with the descriptor holding each file's lock
+_claimed_checkpoints: Dict[Path, Optional[int]] = {}
+_claims_lock = threading.Lock()
+
+
+def _claim_checkpoint(path: Path) -> bool:
+    """Claim a checkpoint file for one generation. Threads are kept apart in-process and,
+    where fcntl exists, processes by an advisory lock on the file itself."""
+    with _claims_lock:
+        if path in _claimed_checkpoints:
+            return False
+        
+        fd = None
+        if fcntl is not None:
+            fd = os.open(str(path), os.O_RDWR | os.O_CREAT)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                # A file unlinked by its previous owner after we opened it is no longer the checkpoint
+                if os.fstat(fd).st_ino != os.stat(str(path)).st_ino:
+                    raise OSError("checkpoint was replaced")
+            except OSError:
+                os.close(fd)
+                return False
+        
+        _claimed_checkpoints[path] = fd
+        return True
+
+
+def _release_checkpoint(path: Path):
+    with _claims_lock:
+        fd = _claimed_checkpoints.pop(path, None)
+        if fd is not None:
+            os.close(fd)  # Closing releases the lock
+
+
+@dataclass
+class ClaudeGeneration:
+    """Outcome of one generation call. Metrics belong to the caller, so concurrent calls on a
+    shared generator never see each other's numbers."""
+    content: Optional[str] = None
+    metrics: Dict = field(default_factory=dict)
+
 class ClaudeContentGenerator:
-    def __init__(self):
+    def __init__(self, transport=None):
         self.api_key = os.getenv('ANTHROPIC_API_KEY', '')
         self.api_url = "https://api.anthropic.com/v1/messages"
         # Use Claude 3.5 Sonnet as default (best balance of performance and cost)
@@ -31,6 +94,29 @@ class ClaudeContentGenerator:
             "claude-3-haiku": "claude-3-haiku-20240307"         # $0.25/$1.25 per MTok - Fast & cheap
         }
         
+        # Streaming generation: text is checkpointed to disk as it arrives and resumed after failures
+        self.streaming_config = {
+            "enabled": True,
+            "connect_timeout": 10,
+            "idle_timeout": 60,  # Longest silence allowed between events
+            "max_resume_attempts": 3,
+            "retry_delay": 5,
+            "checkpoint_dir": "cache/claude_checkpoints"
+        }
+        
+        # Generations of scoped calls (e.g. queued jobs) are cached on disk; set to None to always call the API.
+        # Imported here because importing the core package pulls this module back in.
+        from core.llm_cache import get_shared_llm_cache
+        from core.llm_transport import get_shared_llm_transport
+        from core.provider_health import get_shared_health_registry
+        self.llm_cache = get_shared_llm_cache()
+        
+        # Provider health shared with the other generators, updated by every generation
+        self.health = get_shared_health_registry()
+        
+        # Pooled keep-alive sessions shared with the other LLM generators
+        self.transport = transport or get_shared_llm_transport()
+        
         # Load content topics from config
         self.topics = self._load_topics_config()
     
@@ -83,6 +169,13 @@ class ClaudeContentGenerator:
         self.api_key = api_key
         os.environ['ANTHROPIC_API_KEY'] = api_key
     
+    def is_available(self) -> bool:
+        """Check Claude's health from the shared registry instead of paying for a probe on every call"""
+        if not self.api_key:
+            print("❌ No Anthropic API key found. Set ANTHROPIC_API_KEY environment variable.")
+            return False
+        return self.health.is_available("claude", self.test_connection)
+    
     def test_connection(self) -> bool:
         """Test connection to Claude API"""
         if not self.api_key:
@@ -96,7 +189,7 @@ class ClaudeContentGenerator:
                 "content-type": "application/json"
             }
             
-            response = requests.post(
+            response = self.transport.post(
                 self.api_url,
                 headers=headers,
                 json={
@@ -120,7 +213,8 @@ class ClaudeContentGenerator:
             print(f"❌ Claude connection failed: {e}")
             return False
     
-    def generate_content_with_claude(self, topic: str, keyword: str = None, target_audience: str = "Marketing professionals") -> str:
+    def generate_content_with_claude(self, topic: str, keyword: str = None, target_audience: str = "Marketing professionals",
+                                     bypass_cache: bool = False, cache_scope: Optional[str] = None) -> str:
         """Generate content using Claude API with retry logic"""
         
         if not self.api_key:
@@ -132,10 +226,40 @@ class ClaudeContentGenerator:
             keyword = topic
         
         prompt = self.create_content_prompt(topic, keyword, target_audience)
+        generation = ClaudeGeneration()
+        return self._cached_generation(
+            prompt, lambda: self._generate_for_topic(prompt, topic, keyword, target_audience, generation),
+            bypass_cache, cache_scope)
+    
+    def _cached_generation(self, prompt: str, generate, bypass_cache: bool = False,
+                           cache_scope: Optional[str] = None) -> Optional[str]:
+        """Serve a prompt from the response cache or generate and store it.
+        Only scoped calls use the cache: a retry of the same job gets its article back,
+        while other items with the same prompt are generated afresh."""
+        def tracked_generate():
+            content = generate()
+            if content:
+                self.health.record_success("claude")
+            else:
+                self.health.record_failure("claude", "generation failed")
+            return content
+        
+        if self.llm_cache is None or not cache_scope:
+            return tracked_generate()
+        return self.llm_cache.get_or_generate("claude", self.model, prompt, 0.7, self.max_tokens,
+                                              tracked_generate, bypass=bypass_cache, scope=cache_scope)
+    
+    def _generate_for_topic(self, prompt: str, topic: str, keyword: str, target_audience: str,
+                            generation: ClaudeGeneration) -> Optional[str]:
+        """Run one topic generation, streaming or with the legacy retry loop"""
+        if self.streaming_config["enabled"]:
+            print(f"🤖 Generating blog post with Claude: {topic}")
+            return self._generate_streaming(prompt, generation)
         
         # Retry configuration
         max_retries = 3
         timeout_seconds = 180  # Increased to 3 minutes for long content
+        max_tokens = self.max_tokens
         
         for attempt in range(max_retries):
             try:
@@ -147,12 +271,12 @@ class ClaudeContentGenerator:
                     "content-type": "application/json"
                 }
                 
-                response = requests.post(
+                response = self.transport.post(
                     self.api_url,
                     headers=headers,
                     json={
                         "model": self.model,
-                        "max_tokens": self.max_tokens,
+                        "max_tokens": max_tokens,
                         "messages": [
                             {"role": "user", "content": prompt}
                         ],
@@ -181,8 +305,8 @@ class ClaudeContentGenerator:
                     print(f"🔄 Retrying with shorter content request...")
                     # Use shorter prompt for retry attempts
                     prompt = self.create_short_content_prompt(topic, keyword, target_audience)
-                    # Reduce max_tokens for retry attempts
-                    self.max_tokens = max(4000, self.max_tokens - 1000)
+                    # Reduce max_tokens for this request's retry attempts only
+                    max_tokens = max(4000, max_tokens - 1000)
                 continue
                 
             except Exception as e:
@@ -350,6 +474,14 @@ Remember to:
             print("❌ Failed to generate content with Claude")
             return None
         
+        return self.build_blog_post(topic, content, keyword, target_audience, custom_prompt)
+    
+    def build_blog_post(self, topic: str, content: str, keyword: str = None, target_audience: str = "Marketing professionals",
+                        custom_prompt: str = None, generation_method: str = "claude") -> Dict:
+        """Wrap generated content in the blog post structure"""
+        from core.prompt_budget import estimate_tokens
+        prompt = custom_prompt or self.create_content_prompt(topic, keyword or topic, target_audience)
+        
         # Extract title from content if using custom prompt (multilingual support)
         title = topic  # fallback
         if custom_prompt and content:
@@ -377,11 +509,12 @@ Remember to:
             "meta_description": self.generate_meta_description(topic),
             "image_keywords": self.generate_image_keywords(topic),
             "word_count": len(content.split()),
-            "generation_method": "claude",
+            "generation_method": generation_method,
             "topic": topic,
             "keyword": keyword or topic,
             "target_audience": target_audience,
-            "estimated_cost": self.estimate_cost(content),
+            "estimated_cost": self.estimate_cost(content, prompt) if generation_method == "claude" else 0.0,
+            "prompt_tokens": estimate_tokens(prompt, "claude"),
             "seo_keywords": [keyword or topic] + self.generate_tags(topic)[:3]
         }
         
@@ -446,11 +579,12 @@ Remember to:
         ]
         return keywords
     
-    def estimate_cost(self, content: str) -> float:
-        """Estimate cost based on content length and model"""
-        # Rough token estimation (1 token ≈ 4 characters)
-        input_tokens = 1000  # Approximate prompt tokens
-        output_tokens = len(content) // 4
+    def estimate_cost(self, content: str, prompt: str = None) -> float:
+        """Estimate cost based on prompt and content length and model"""
+        from core.prompt_budget import estimate_tokens
+        
+        input_tokens = estimate_tokens(prompt, "claude") if prompt else 1000  # Approximate when the prompt is unknown
+        output_tokens = estimate_tokens(content, "claude")
         
         # Claude 4 pricing per million tokens
         if "claude-sonnet-4" in self.model:
@@ -512,12 +646,29 @@ Remember to:
         print(f"💾 Claude post saved: {filepath}")
         return str(filepath)
     
-    def generate_content_with_custom_prompt(self, prompt: str) -> str:
+    def generate_content_with_custom_prompt(self, prompt: str, bypass_cache: bool = False,
+                                            cache_scope: Optional[str] = None) -> str:
         """Generate content using a custom prompt"""
-        
+        return self.generate_with_details(prompt, bypass_cache, cache_scope).content
+    
+    def generate_with_details(self, prompt: str, bypass_cache: bool = False,
+                              cache_scope: Optional[str] = None) -> ClaudeGeneration:
+        """Generate from a custom prompt and return the content with this call's streaming metrics"""
+        generation = ClaudeGeneration()
         if not self.api_key:
             print("❌ No Anthropic API key found")
-            return None
+            return generation
+        
+        generation.content = self._cached_generation(
+            prompt, lambda: self._generate_for_prompt(prompt, generation), bypass_cache, cache_scope)
+        if generation.content and not generation.metrics:
+            generation.metrics = {"model": self.model, "cached": True}
+        return generation
+    
+    def _generate_for_prompt(self, prompt: str, generation: ClaudeGeneration) -> Optional[str]:
+        """Run one custom-prompt generation"""
+        if self.streaming_config["enabled"]:
+            return self._generate_streaming(prompt, generation)
         
         try:
             headers = {
@@ -526,7 +677,7 @@ Remember to:
                 "content-type": "application/json"
             }
             
-            response = requests.post(
+            response = self.transport.post(
                 self.api_url,
                 headers=headers,
                 json={
@@ -553,6 +704,180 @@ Remember to:
             print(f"❌ Error generating content with Claude: {e}")
             return None
     
+    def generate_sectioned_content(self, topic: str, keyword: str = None, sections: Optional[List[str]] = None,
+                                   target_audience: str = "Marketing professionals", summary: str = "") -> Optional[str]:
+        """Generate a long-form article as parallel section requests instead of one long request.
+        Without sections an outline is requested first."""
+        from core.sectioned_generation import SectionedGenerator
+        
+        keyword = keyword or topic
+        
+        def section_prompt(title: str) -> str:
+            return (f"Write a detailed 500-700 word section titled \"{title}\" for an article about \"{keyword}\" "
+                    f"aimed at {target_audience}. Use markdown subheadings, concrete examples and practical advice, "
+                    f"and only cite statistics you can attribute to a source.")
+        
+        generator = SectionedGenerator(self.generate_content_with_custom_prompt, "claude")
+        return generator.generate_article(topic, section_prompt, sections=sections, summary=summary)
+    
+    def _checkpoint_path(self, prompt: str) -> Path:
+        """Checkpoint file for a prompt, so a rerun of the same request picks up the saved text"""
+        digest = hashlib.sha256(f"{self.model}\n{self.max_tokens}\n{prompt}".encode('utf-8')).hexdigest()[:24]
+        return Path(self.streaming_config["checkpoint_dir"]) / f"{digest}.txt"
+    
+    @contextmanager
+    def _claimed_checkpoint(self, prompt: str) -> Iterator[Path]:
+        """The prompt's checkpoint when no other generation holds it. A concurrent identical request
+        (parallel batch items, hedged duplicates) writes to a private file instead, so the two
+        never interleave chunks or delete each other's text. Reruns only resume the shared file."""
+        checkpoint = self._checkpoint_path(prompt)
+        checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        
+        if _claim_checkpoint(checkpoint):
+            try:
+                yield checkpoint
+            finally:
+                _release_checkpoint(checkpoint)
+            return
+        
+        yield checkpoint.with_name(f"{checkpoint.stem}-{uuid.uuid4().hex[:12]}.txt")
+    
+    def _generate_streaming(self, prompt: str, generation: Optional[ClaudeGeneration] = None) -> Optional[str]:
+        """Stream a generation into its checkpoint file, continuing from the saved text after failures.
+        The call's metrics are recorded on generation."""
+        generation = generation if generation is not None else ClaudeGeneration()
+        with self._claimed_checkpoint(prompt) as checkpoint:
+            return self._stream_to_checkpoint(prompt, checkpoint, generation)
+    
+    def _stream_to_checkpoint(self, prompt: str, checkpoint: Path, generation: ClaudeGeneration) -> Optional[str]:
+        """Stream into a claimed checkpoint file, resuming from its text after interruptions"""
+        partial = checkpoint.read_text(encoding='utf-8') if checkpoint.exists() else ""
+        if partial:
+            print(f"📂 Resuming from checkpoint with {len(partial)} characters")
+        
+        metrics = {
+            "model": self.model,
+            "ttft_seconds": None,
+            "total_seconds": 0.0,
+            "resumes": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "stop_reason": None,
+            "completed": False
+        }
+        generation.metrics = metrics
+        started = time.time()
+        
+        for attempt in range(self.streaming_config["max_resume_attempts"] + 1):
+            if attempt:
+                metrics["resumes"] += 1
+                print(f"🔁 Continuing from {len(partial)} characters (attempt {attempt + 1})")
+            
+            # The API rejects an assistant prefill that ends in whitespace
+            if partial != partial.rstrip():
+                partial = partial.rstrip()
+                checkpoint.write_text(partial, encoding='utf-8')
+            
+            try:
+                with open(checkpoint, 'a', encoding='utf-8') as f:
+                    for chunk in self.stream_content_with_claude(prompt, partial, metrics):
+                        if metrics["ttft_seconds"] is None:
+                            metrics["ttft_seconds"] = time.time() - started
+                        partial += chunk
+                        f.write(chunk)
+                        f.flush()
+                
+                metrics["completed"] = True
+                break
+                
+            except STREAM_INTERRUPTIONS as e:
+                print(f"⚠️ Claude stream interrupted: {e}")
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                print(f"❌ {e}")
+                if status not in RETRYABLE_STATUS_CODES:
+                    break
+                time.sleep(self.streaming_config["retry_delay"])
+            except Exception as e:
+                print(f"❌ Error generating content with Claude: {e}")
+                break
+        
+        metrics["total_seconds"] = time.time() - started
+        metrics["characters"] = len(partial)
+        
+        if not metrics["completed"]:
+            print(f"💾 Partial output kept in {checkpoint}")
+            return None
+        
+        checkpoint.unlink()
+        print(f"✅ Content generated: {len(partial)} characters in {metrics['total_seconds']:.1f}s")
+        return partial
+    
+    def stream_content_with_claude(self, prompt: str, partial: str = "", metrics: Optional[Dict] = None) -> Iterator[str]:
+        """Yield text from a streamed Messages API response.
+        When partial is given it is sent as the start of the assistant turn and the model continues it."""
+        messages = [{"role": "user", "content": prompt}]
+        if partial:
+            messages.append({"role": "assistant", "content": partial})
+        
+        # Output tokens already spent on the partial count against the budget
+        metrics = metrics if metrics is not None else {}
+        max_tokens = max(1, self.max_tokens - metrics.get("output_tokens", 0))
+        
+        response = self.transport.post(
+            self.api_url,
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json"
+            },
+            json={
+                "model": self.model,
+                "max_tokens": max_tokens,
+                "messages": messages,
+                "temperature": 0.7,
+                "stream": True
+            },
+            stream=True,
+            timeout=(self.streaming_config["connect_timeout"], self.streaming_config["idle_timeout"])
+        )
+        
+        with response:
+            if response.status_code != 200:
+                raise requests.exceptions.HTTPError(
+                    f"Claude API error: {response.status_code} - {response.text}", response=response)
+            
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                
+                event = json.loads(line[len("data:"):].strip())
+                event_type = event.get("type")
+                
+                if event_type == "content_block_delta":
+                    text = event.get("delta", {}).get("text", "")
+                    if text:
+                        yield text
+                elif event_type == "message_start":
+                    usage = event.get("message", {}).get("usage", {})
+                    metrics["input_tokens"] = usage.get("input_tokens", 0)
+                    metrics["request_output_tokens"] = 0
+                elif event_type == "message_delta":
+                    metrics["stop_reason"] = event.get("delta", {}).get("stop_reason")
+                    # Usage on message_delta is cumulative for this request
+                    request_tokens = event.get("usage", {}).get("output_tokens", 0)
+                    metrics["output_tokens"] = (metrics.get("output_tokens", 0) + request_tokens
+                                                - metrics.get("request_output_tokens", 0))
+                    metrics["request_output_tokens"] = request_tokens
+                elif event_type == "message_stop":
+                    return
+                elif event_type == "error":
+                    error = event.get("error", {})
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"{error.get('type', 'error')}: {error.get('message', '')}")
+        
+        raise requests.exceptions.ChunkedEncodingError("stream ended before message_stop")
+    
     def create_short_content_prompt(self, topic: str, keyword: str, target_audience: str = "Marketing professionals") -> str:
         """Create a shorter prompt for faster generation when timeouts occur"""
         
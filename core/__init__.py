@@ -7,13 +7,22 @@ This module contains the essential system modules and engines:
 - Settings Manager
 - Web Research Engine
 - Local LLM Integration
+
+Exports are imported on first access (PEP 562), so importing a single
+submodule such as core.settings_manager does not load the whole stack.
 """
 
-from .enhanced_research_llm import EnhancedResearchLLMGenerator
-from .project_manager import MultilingualProjectManager, ContentProject
-from .settings_manager import SettingsManager
-from .web_research_content import WebResearchContentGenerator
-from .local_llm_content import MultilingualLocalLLMContentGenerator
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'EnhancedResearchLLMGenerator': 'enhanced_research_llm',
+    'MultilingualProjectManager': 'project_manager',
+    'ContentProject': 'project_manager',
+    'SettingsManager': 'settings_manager',
+    'WebResearchContentGenerator': 'web_research_content',
+    'MultilingualLocalLLMContentGenerator': 'local_llm_content',
+}
 
 __all__ = [
     'EnhancedResearchLLMGenerator',
@@ -24,4 +33,16 @@ __all__ = [
     'MultilingualLocalLLMContentGenerator'
 ]
 
-__version__ = "1.0.0" 
\ No newline at end of file
+__version__ = "1.0.0"
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Asyncio research backend.
+Runs the Google News search, redirect resolution and article scraping of
+WebResearchContentGenerator as coroutines on one pooled aiohttp client, so
+many keywords and projects can be researched concurrently in a single event loop.
+Parsing, caching, rate limiting and the research store are shared with the
+sync generator; their blocking work (SQLite lookups, HTML and RSS parsing) runs
+in worker threads so it never stalls the event loop.
+
+aiohttp is listed in requirements.txt but only this backend needs it.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from core.http_cache import CachedResponse
+from core.web_research_content import ResearchRun, WebResearchContentGenerator
+
+
+class AsyncWebResearchContentGenerator:
+    """Async counterpart of WebResearchContentGenerator with the research methods as coroutines"""
+
+    def __init__(self, researcher: Optional[WebResearchContentGenerator] = None,
+                 max_connections: int = 32, keepalive_timeout: float = 30.0):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the async research backend: "
+                              "pip install 'aiohttp>=3.9' (listed in requirements.txt)")
+
+        # Parsing helpers, caches, the rate limiter and all configuration come from the sync generator
+        self.researcher = researcher or WebResearchContentGenerator()
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+
+        self._client: Optional["aiohttp.ClientSession"] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+
+    def _client_session(self) -> "aiohttp.ClientSession":
+        """Create the shared client on first use, inside the running event loop"""
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.researcher.concurrency_config["per_domain_concurrency"],
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._client = aiohttp.ClientSession(connector=connector, headers=dict(self.researcher.session.headers))
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = self.researcher.rate_limiter.host_for(url)
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.researcher.concurrency_config["per_domain_concurrency"])
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def _request(self, method: str, url: str, timeout: float = 15, max_bytes: Optional[int] = None,
+                       **kwargs) -> CachedResponse:
+        """Send a rate-limited request, backing off and retrying when the host throttles us"""
+        rate_limiter = self.researcher.rate_limiter
+        max_retries = self.researcher.concurrency_config["max_retries_on_throttle"]
+
+        for attempt in range(max_retries + 1):
+            async with self._host_semaphore(url):
+                wait = rate_limiter.reserve(url)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                async with self._client_session().request(
+                        method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as response:
+                    if method == 'HEAD':
+                        body = b""
+                    elif max_bytes is not None:
+                        body = await self._read_capped(response, max_bytes)
+                    else:
+                        body = await response.read()
+                    result = CachedResponse(str(response.url), response.status, body, dict(response.headers))
+
+            delay = rate_limiter.update_from_response(url, result)
+            if delay is None or attempt == max_retries or delay > rate_limiter.max_retry_after:
+                return result
+
+            print(f"⏳ {rate_limiter.host_for(url)} is throttling us, retrying in {delay:.0f}s")
+
+        return result
+
+    async def _read_capped(self, response, max_bytes: int) -> bytes:
+        """Read a body up to max_bytes; the rest is never downloaded"""
+        chunks = []
+        total = 0
+        async for chunk in response.content.iter_chunked(self.researcher.scrape_config["chunk_size"]):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_bytes:
+                break
+        return b"".join(chunks)[:max_bytes]
+
+    async def _cached_get(self, url: str, content_type: str, max_bytes: Optional[int] = None,
+                          timeout: float = 15) -> CachedResponse:
+        """GET through the shared response cache, revalidating stale entries with conditional requests"""
+        http_cache = self.researcher.http_cache
+        if http_cache is None:
+            return await self._request('GET', url, timeout=timeout, max_bytes=max_bytes)
+
+        lookup = await asyncio.to_thread(http_cache.lookup, url, content_type)
+        if lookup.fresh:
+            return lookup.cached
+
+        started = time.time()
+        response = await self._request('GET', url, timeout=timeout, max_bytes=max_bytes,
+                                       headers=lookup.conditional_headers)
+        return await asyncio.to_thread(http_cache.complete, lookup, response, time.time() - started)
+
+    async def search_google_news(self, query: str, days_back: int = 30, max_results: int = 10,
+                                 resolve_urls: bool = True) -> List[Dict]:
+        """Search Google News for recent articles"""
+        research_store = self.researcher.research_store
+        if research_store is not None:
+            stored = await asyncio.to_thread(research_store.get_search_results, query, max_results)
+            if stored is not None:
+                if resolve_urls:
+                    await asyncio.gather(*(self.resolve_article_url(article) for article in stored))
+                return stored
+
+        try:
+            response = await self._cached_get(self.researcher._google_news_search_url(query), 'rss', timeout=10)
+            if response.status_code != 200:
+                return []
+
+            articles = await asyncio.to_thread(self.researcher._parse_google_news_rss, response.content, max_results)
+            if resolve_urls:
+                await asyncio.gather(*(self.resolve_article_url(article) for article in articles))
+
+            if research_store is not None:
+                await asyncio.to_thread(research_store.save_search_results, query, articles, max_results)
+
+            return articles
+
+        except Exception as e:
+            print(f"❌ Error searching Google News: {e}")
+            return []
+
+    async def resolve_article_url(self, article: Dict) -> str:
+        """Resolve an article's Google News link in place, once, and return the final URL"""
+        if not article.get('resolved'):
+            article['url'] = await self.extract_actual_url(article.get('google_news_url', article['url']))
+            article['resolved'] = True
+        return article['url']
+
+    async def extract_actual_url(self, google_news_url: str) -> str:
+        """Extract actual article URL from Google News redirect"""
+        http_cache = self.researcher.http_cache
+        fallback_url = google_news_url.replace('https://news.google.com/rss/articles/', 'https://news.google.com/articles/')
+
+        if http_cache is not None:
+            cached = await asyncio.to_thread(http_cache.get_redirect, google_news_url)
+            if cached is not None:
+                final_url, resolved = cached
+                return final_url if resolved else fallback_url
+
+        try:
+            response = await self._request('HEAD', google_news_url, timeout=10, allow_redirects=True)
+            actual_url = self.researcher._redirect_target(response.url)
+        except Exception as e:
+            print(f"❌ Error extracting URL: {e}")
+            actual_url = None
+
+        if http_cache is not None:
+            await asyncio.to_thread(http_cache.store_redirect, google_news_url, actual_url,
+                                    resolved=actual_url is not None)
+
+        return actual_url or fallback_url
+
+    async def scrape_article_content(self, url: str) -> Dict:
+        """Scrape content from an article URL"""
+        research_store = self.researcher.research_store
+        if research_store is not None:
+            stored = await asyncio.to_thread(research_store.get_article, url)
+            if stored is not None:
+                return stored
+
+        try:
+            response = await self._cached_get(url, 'article', max_bytes=self.researcher.scrape_config["max_bytes"],
+                                              timeout=15)
+            return await asyncio.to_thread(self.researcher._build_scraped_article, url, response)
+
+        except Exception as e:
+            print(f"❌ Error scraping {url}: {e}")
+            return {}
+
+    async def _resolve_and_scrape(self, article: Dict) -> Dict:
+        return await self.scrape_article_content(await self.resolve_article_url(article))
+
+    async def research_topic_comprehensively(self, topic: str) -> Dict:
+        """Conduct comprehensive research on a topic"""
+        run = ResearchRun(self.researcher, topic)
+        pending = {}
+
+        def submit_scrapes():
+            in_flight = sum(1 for task_type, _ in pending.values() if task_type == "scrape")
+            for index, article in run.next_scrapes(in_flight):
+                pending[asyncio.ensure_future(self._resolve_and_scrape(article))] = ("scrape", index)
+
+        for query in run.search_queries:
+            print(f"  📰 Searching: {query}")
+            task = asyncio.ensure_future(self.search_google_news(query, days_back=60, resolve_urls=False))
+            pending[task] = ("search", query)
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task_type, payload = pending.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    print(f"❌ Research task failed: {e}")
+                    result = None
+
+                if task_type == "search":
+                    run.add_search_results(payload, result)
+                else:
+                    run.add_scraped(payload, result)
+
+                submit_scrapes()
+
+        # Resolve only the articles cited as sources
+        sources = await asyncio.gather(*(self.resolve_article_url(article) for article in run.unique_articles()[:10]))
+        return await asyncio.to_thread(run.finish, list(sources))
+
+    async def research_topics(self, topics: List[str]) -> List[Dict]:
+        """Research several topics concurrently on the shared client"""
+        return list(await asyncio.gather(*(self.research_topic_comprehensively(topic) for topic in topics)))
+
+
+def research_topics_concurrently(topics: List[str],
+                                 researcher: Optional[WebResearchContentGenerator] = None) -> List[Dict]:
+    """Sync entry point: research many topics in one event loop and return results in order"""
+
+    async def run():
+        async with AsyncWebResearchContentGenerator(researcher) as async_researcher:
+            return await async_researcher.research_topics(topics)
+
+    return asyncio.run(run())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Concurrent batch execution of content items across projects.
+Items from many projects share one worker pool. Each pipeline stage
+(research, LLM generation, image fetch, save) has its own concurrency cap,
+LLM calls are additionally capped per provider, and throughput is reported
+live in items per hour.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from core.concurrency_limits import ConcurrencyLimits
+
+# Work of one stage allowed at once across all running items. LLM work takes its provider
+# slot before the llm slot, so items queued for a busy provider hold no llm slot and never
+# hold back another provider's work.
+DEFAULT_STAGE_LIMITS: Dict[str, int] = {
+    "research": 4,
+    "llm": 8,
+    "image": 4,
+    "save": 2,
+}
+
+
+def create_stage_limits(limits: Optional[Dict[str, int]] = None) -> ConcurrencyLimits:
+    """Stage caps with defaults, optionally overridden per stage"""
+    return ConcurrencyLimits(default_limit=2, limits={**DEFAULT_STAGE_LIMITS, **(limits or {})})
+
+
+@dataclass
+class BatchItem:
+    """One piece of content to generate"""
+    project_id: str
+    keyword: str
+    index: int
+    success: Optional[bool] = None
+    content_index: Optional[int] = None  # Project progress count after this item was saved
+    seconds: float = 0.0
+    job: Optional[Any] = None  # Queue job the item was leased from
+
+
+class ThroughputMeter:
+    """Completed and failed items with a rolling items-per-hour rate"""
+
+    def __init__(self, window_seconds: float = 3600.0):
+        self.window_seconds = window_seconds
+        self.started = time.time()
+        self.completed = 0
+        self.failed = 0
+        self._completions: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def record(self, success: bool):
+        now = time.time()
+        with self._lock:
+            if success:
+                self.completed += 1
+                self._completions.append(now)
+            else:
+                self.failed += 1
+            while self._completions and now - self._completions[0] > self.window_seconds:
+                self._completions.popleft()
+
+    def items_per_hour(self) -> float:
+        """Completions in the rolling window, scaled to an hour"""
+        now = time.time()
+        with self._lock:
+            recent = sum(1 for finished in self._completions if now - finished <= self.window_seconds)
+        elapsed = min(self.window_seconds, max(now - self.started, 1.0))
+        return recent * 3600.0 / elapsed
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            completed, failed = self.completed, self.failed
+        return {
+            "completed": completed,
+            "failed": failed,
+            "elapsed_seconds": time.time() - self.started,
+            "items_per_hour": self.items_per_hour()
+        }
+
+
+class BatchRunner:
+    """Run batch items on a worker pool and report live throughput"""
+
+    def __init__(self, process: Callable[[BatchItem], Optional[int]], max_workers: int = 8):
+        self.process = process  # Returns the item's content index, or None on failure
+        self.max_workers = max_workers
+        self.meter = ThroughputMeter()
+
+    def _run_item(self, item: BatchItem) -> BatchItem:
+        started = time.time()
+        try:
+            item.content_index = self.process(item)
+        except Exception as e:
+            print(f"❌ Item {item.index} of {item.project_id} failed: {e}")
+            item.content_index = None
+        item.success = item.content_index is not None
+        item.seconds = time.time() - started
+        self.meter.record(item.success)
+        return item
+
+    def run_from(self, next_item: Callable[[], Optional[BatchItem]]) -> List[BatchItem]:
+        """Process items pulled from a source (such as a job queue) until it runs dry; returns them in finishing order"""
+        self.meter = ThroughputMeter()
+        finished: List[BatchItem] = []
+        finished_lock = threading.Lock()
+        print(f"🏭 Running queued items with {self.max_workers} workers")
+
+        def worker():
+            while True:
+                item = next_item()
+                if item is None:
+                    return
+                self._run_item(item)
+                with finished_lock:
+                    finished.append(item)
+                    done = len(finished)
+                stats = self.meter.snapshot()
+                status = "✅" if item.success else "❌"
+                print(f"{status} {item.keyword} ({item.seconds:.0f}s) | {done} done, {stats['failed']} failed, "
+                      f"📈 {stats['items_per_hour']:.1f} items/hour")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch") as executor:
+            for future in [executor.submit(worker) for _ in range(self.max_workers)]:
+                future.result()
+
+        return finished
+
+    def get_stats(self) -> Dict[str, float]:
+        """Live throughput of the current or last run"""
+        return self.meter.snapshot()
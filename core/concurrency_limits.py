@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Named concurrency limits for LLM providers and pipeline stages.
+Each key (a provider name such as "claude" or "deepseek") gets its own
+semaphore, so parallel work never sends more requests to a provider than it
+can serve at once.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Requests a provider serves in parallel; local models share one GPU, so they stay low
+DEFAULT_LIMITS: Dict[str, int] = {
+    "claude": 4,
+}
+
+
+class ConcurrencyLimits:
+    """Per-key bounded semaphores"""
+
+    def __init__(self, default_limit: int = 2, limits: Optional[Dict[str, int]] = None):
+        self.default_limit = default_limit
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, key: str) -> int:
+        return max(1, self.limits.get(key, self.default_limit))
+
+    def set_limit(self, key: str, limit: int):
+        """Change a key's limit; requests already holding a slot keep it"""
+        with self._lock:
+            self.limits[key] = limit
+            self._semaphores.pop(key, None)
+
+    def _semaphore(self, key: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.limit_for(key))
+                self._semaphores[key] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, key: str):
+        """Hold one of the key's slots for the duration of the block"""
+        semaphore = self._semaphore(key)
+        with semaphore:
+            yield
+
+
+_shared_limits: Optional[ConcurrencyLimits] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_concurrency_limits() -> ConcurrencyLimits:
+    """Return the process-wide limits shared by every generator"""
+    global _shared_limits
+    with _shared_lock:
+        if _shared_limits is None:
+            _shared_limits = ConcurrencyLimits()
+        return _shared_limits
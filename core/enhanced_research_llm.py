@@ -6,16 +6,17 @@ Combines real web research data with local LLM content generation for comprehens
 
 import logging
 import json
-import yaml
 import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, List, Optional, Any, Union
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 
 from core.web_research_content import WebResearchContentGenerator
 from core.local_llm_content import MultilingualLocalLLMContentGenerator
+from core.llm_transport import LLMTransport, get_shared_llm_transport
+from core.prompt_budget import PromptBudget
 from seo.seo_optimizer import MultilingualSEOOptimizer
 
 # Configure logging
@@ -41,6 +42,7 @@ class ContentConfig:
     max_statistics: int = 10
     max_insights: int = 8
     max_articles: int = 6
+    max_prompt_tokens: int = 6000  # Input budget for research prompts, research included
     prompt_template_file: Optional[str] = None
     topics_config_file: Optional[str] = None
 
@@ -82,7 +84,8 @@ class EnhancedResearchLLMGenerator:
                  config: Optional[ContentConfig] = None,
                  web_researcher: Optional[WebResearchContentGenerator] = None,
                  local_llm: Optional[MultilingualLocalLLMContentGenerator] = None,
-                 seo_optimizer: Optional[MultilingualSEOOptimizer] = None):
+                 seo_optimizer: Optional[MultilingualSEOOptimizer] = None,
+                 transport: Optional[LLMTransport] = None):
         """
         Initialize the enhanced research LLM generator
         
@@ -91,12 +94,18 @@ class EnhancedResearchLLMGenerator:
             web_researcher: Web research component (injected for testing)
             local_llm: Local LLM component (injected for testing)
             seo_optimizer: SEO optimizer component (injected for testing)
+            transport: Pooled LLM HTTP transport (shared process-wide by default)
         """
         self.config = config or ContentConfig()
         self.web_researcher = web_researcher or WebResearchContentGenerator()
-        self.local_llm = local_llm or MultilingualLocalLLMContentGenerator()
+        self.transport = transport or get_shared_llm_transport()
+        self.local_llm = local_llm or MultilingualLocalLLMContentGenerator(transport=self.transport)
         self.seo_optimizer = seo_optimizer or MultilingualSEOOptimizer()
         
+        # Research is packed into the prompt by relevance until the token budget is spent
+        self.prompt_budget = PromptBudget(self.config.max_prompt_tokens, self.config.default_llm_provider)
+        self.last_prompt_report: Dict[str, Any] = {}
+        
         # Load topics from config file or use defaults
         self.enhanced_topics = self._load_topics_config()
         
@@ -108,6 +117,7 @@ class EnhancedResearchLLMGenerator:
             try:
                 with open(self.config.topics_config_file, 'r', encoding='utf-8') as f:
                     if self.config.topics_config_file.endswith('.yaml') or self.config.topics_config_file.endswith('.yml'):
+                        import yaml
                         return yaml.safe_load(f)
                     else:
                         return json.load(f)
@@ -241,10 +251,8 @@ class EnhancedResearchLLMGenerator:
             Enhanced content dictionary or None if enhancement fails
         """
         try:
-            # Set LLM provider
-            self.local_llm.set_provider(llm_provider)
-            
-            if not self.local_llm.test_connection():
+            # The provider is passed per call: the local LLM generator is shared with other subsystems
+            if not self.local_llm.test_connection(llm_provider):
                 logger.warning(f"{llm_provider} not available, skipping LLM enhancement")
                 return None
             
@@ -256,7 +264,7 @@ class EnhancedResearchLLMGenerator:
                 return None
             
             # Generate enhanced content with LLM
-            llm_content = self.local_llm.generate_content_with_local_llm(enhanced_prompt, "blog_post")
+            llm_content = self.local_llm.generate_content_with_local_llm(enhanced_prompt, "blog_post", provider=llm_provider)
             
             if not llm_content:
                 logger.warning("LLM content generation returned empty result")
@@ -303,23 +311,26 @@ class EnhancedResearchLLMGenerator:
                 except Exception as e:
                     logger.warning(f"Failed to load prompt template: {e}, using default")
             
-            # Extract key data points with config limits
-            statistics = research_data.get('statistics', [])[:self.config.max_statistics]
-            insights = research_data.get('key_insights', [])[:self.config.max_insights]
-            articles = research_data.get('articles', [])[:self.config.max_articles]
-            
-            # Create dynamic prompt using project context instead of rigid template
-            return self._create_dynamic_contextual_prompt(topic, statistics, insights, articles)
+            # Create dynamic prompt using project context instead of rigid template,
+            # with the research most relevant to the topic that fits the token budget
+            return self._budgeted_prompt(
+                research_data, topic,
+                lambda context: self._create_dynamic_contextual_prompt(topic, [], [], [], research_context=context))
             
         except Exception as e:
             logger.error(f"Failed to create research enhanced prompt: {e}")
             return None
 
-    def _create_dynamic_contextual_prompt(self, topic: str, statistics: List, insights: List, articles: List) -> str:
+    def _create_dynamic_contextual_prompt(self, topic: str, statistics: List, insights: List, articles: List,
+                                          research_context: Optional[str] = None) -> str:
         """
-        Create a dynamic, contextually-aware prompt that leverages Claude's creative capabilities
+        Create a dynamic, contextually-aware prompt that leverages Claude's creative capabilities.
+        A prebuilt research_context replaces the one formatted from the lists.
         """
         
+        if research_context is not None:
+            return self._dynamic_prompt_text(topic, research_context)
+        
         # Create research context from actual data only
         research_context = ""
         
@@ -345,7 +356,12 @@ class EnhancedResearchLLMGenerator:
                 clean_title = title.replace('<', '').replace('>', '').replace('…', '...')
                 clean_desc = description.replace('<', '').replace('>', '').replace('…', '...')
                 research_context += f"{i}. {clean_title}: {clean_desc}\n"
-
+        
+        return self._dynamic_prompt_text(topic, research_context)
+    
+    def _dynamic_prompt_text(self, topic: str, research_context: str) -> str:
+        """Fill the dynamic prompt around a formatted research context"""
+        
         # Dynamic, creative prompt that gives Claude freedom within constraints
         prompt = f"""You are a world-class content strategist with deep expertise in {topic}. 
 
@@ -522,6 +538,7 @@ Begin writing your comprehensive, original article now:"""
         Path(content_dir).mkdir(exist_ok=True)
         
         # Create comprehensive YAML front matter
+        import yaml
         yaml_content = yaml.dump(content_data["metadata"], default_flow_style=False)
         full_content = f"---\n{yaml_content}---\n\n{content_data['content']}"
         
@@ -636,57 +653,42 @@ Begin writing your comprehensive, original article now:"""
         
         lang_config = language_instructions.get(language, language_instructions['english'])
         
-        # Create research context
-        research_context = self._format_research_context(research_data)
-        
         # Create dynamic, project-aware prompt
         if language == 'farsi':
-            return self._create_farsi_project_prompt(
-                project_name, project_description, keyword, target_audience, 
-                target_words, research_context, lang_config, seo_focus
-            )
+            create_prompt = self._create_farsi_project_prompt
         elif language == 'spanish':
-            return self._create_spanish_project_prompt(
-                project_name, project_description, keyword, target_audience,
-                target_words, research_context, lang_config, seo_focus
-            )
+            create_prompt = self._create_spanish_project_prompt
         else:
-            return self._create_english_project_prompt(
+            create_prompt = self._create_english_project_prompt
+        
+        # Research context is packed by relevance to the keyword within the token budget
+        return self._budgeted_prompt(
+            research_data or {}, keyword,
+            lambda research_context: create_prompt(
                 project_name, project_description, keyword, target_audience,
                 target_words, research_context, lang_config, seo_focus
-            )
+            ))
     
-    def _format_research_context(self, research_data: Dict[str, Any]) -> str:
-        """Format research data for prompt context"""
-        context = ""
-        
-        insights = research_data.get('key_insights', [])[:self.config.max_insights]
-        if insights:
-            context += "\n🔍 VERIFIED MARKET INSIGHTS:\n"
-            for i, insight in enumerate(insights, 1):
-                clean_insight = str(insight).replace('<', '').replace('>', '').replace('…', '...')[:200]
-                context += f"{i}. {clean_insight}\n"
-        
-        statistics = research_data.get('statistics', [])[:self.config.max_statistics]
-        if statistics:
-            context += "\n📊 VERIFIED DATA POINTS:\n"
-            for i, stat in enumerate(statistics, 1):
-                value = stat.get('value', 'Market trend')
-                stat_context = stat.get('context', 'industry development')[:150]
-                clean_context = str(stat_context).replace('<', '').replace('>', '').replace('…', '...')
-                context += f"{i}. {value}: {clean_context}\n"
-        
-        articles = research_data.get('articles', [])[:self.config.max_articles]
-        if articles:
-            context += "\n📰 CURRENT INDUSTRY SOURCES:\n"
-            for i, article in enumerate(articles, 1):
-                title = article.get('title', 'Industry Report')[:80]
-                description = article.get('description', 'Current analysis')[:150]
-                clean_title = str(title).replace('<', '').replace('>', '').replace('…', '...')
-                clean_desc = str(description).replace('<', '').replace('>', '').replace('…', '...')
-                context += f"{i}. {clean_title}: {clean_desc}\n"
-        
-        return context
+    def _budgeted_prompt(self, research_data: Dict[str, Any], keyword: str, build_prompt: Callable[[str], str]) -> str:
+        """Build a prompt whose research context fills only the token budget left by its fixed text"""
+        budget = self.prompt_budget.remaining(build_prompt(""))
+        packed = self.prompt_budget.pack(research_data, keyword, budget, max_per_kind={
+            "statistic": self.config.max_statistics,
+            "insight": self.config.max_insights,
+            "article": self.config.max_articles
+        })
+        prompt = build_prompt(packed.text)
+        
+        self.last_prompt_report = {
+            "prompt_tokens": self.prompt_budget.count(prompt),
+            "research_tokens": packed.tokens,
+            "budget_tokens": self.prompt_budget.max_input_tokens,
+            "snippets_used": len(packed.used),
+            "snippets_dropped": len(packed.dropped)
+        }
+        logger.info(f"Prompt size: ~{self.last_prompt_report['prompt_tokens']} tokens "
+                    f"({len(packed.used)} research snippets used, {len(packed.dropped)} dropped)")
+        return prompt
     
     def _create_english_project_prompt(self, project_name: str, project_description: str, 
                                      keyword: str, target_audience: str, target_words: int,
@@ -899,6 +901,7 @@ def load_config_from_file(config_path: str) -> Optional[ContentConfig]:
         
         with open(config_file, 'r', encoding='utf-8') as f:
             if config_path.endswith(('.yaml', '.yml')):
+                import yaml
                 config_data = yaml.safe_load(f)
             else:
                 config_data = json.load(f)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache for research fetches.
+Responses are stored in SQLite keyed by normalized URL, expire per content type,
+and are revalidated with conditional GETs once stale.
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from requests.structures import CaseInsensitiveDict
+
+# Seconds a cached response is served without revalidation
+DEFAULT_TTLS = {
+    "rss": 30 * 60,
+    "article": 7 * 24 * 3600,
+    "default": 3600,
+}
+
+# Seconds a resolved redirect (and a failed resolution) is remembered
+REDIRECT_TTL = 30 * 24 * 3600
+NEGATIVE_REDIRECT_TTL = 3600
+
+# Query parameters that never change the response body
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+
+@dataclass
+class CachedResponse:
+    """Minimal response object shared by cached and live fetches"""
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    def __post_init__(self):
+        # Header lookups must not depend on the case the server used
+        self.headers = CaseInsensitiveDict(self.headers)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+
+@dataclass
+class CacheLookup:
+    """Result of checking the cache before a request"""
+    key: str
+    content_type: str
+    cached: Optional[CachedResponse] = None
+    fresh: bool = False
+    conditional_headers: Dict[str, str] = field(default_factory=dict)
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent addresses share one cache entry"""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+
+    query = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+             if not key.lower().startswith(TRACKING_PARAMS)]
+    path = parsed.path or '/'
+
+    return urlunparse((scheme, netloc, path, parsed.params, urlencode(sorted(query)), ''))
+
+
+class HTTPResponseCache:
+    """SQLite-backed response cache with TTLs, conditional GETs and size-based eviction"""
+
+    def __init__(self, db_path: str = "cache/http_cache.sqlite", max_size_bytes: int = 200 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None, redirect_ttl: int = REDIRECT_TTL,
+                 negative_redirect_ttl: int = NEGATIVE_REDIRECT_TTL):
+        self.db_path = Path(db_path)
+        self.max_size_bytes = max_size_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.redirect_ttl = redirect_ttl
+        self.negative_redirect_ttl = negative_redirect_ttl
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stored": 0,
+            "evicted": 0,
+            "bytes_saved": 0,
+            "seconds_saved": 0.0,
+            "redirect_hits": 0,
+            "redirect_misses": 0,
+        }
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                self.stats[name] += delta
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    final_url TEXT,
+                    content_type TEXT,
+                    status_code INTEGER,
+                    body BLOB,
+                    size INTEGER,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL,
+                    expires_at REAL,
+                    last_accessed REAL,
+                    fetch_seconds REAL,
+                    media_type TEXT
+                )
+            """)
+            # Databases created before the server's Content-Type was kept
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(responses)")]
+            if "media_type" not in columns:
+                self._conn.execute("ALTER TABLE responses ADD COLUMN media_type TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(last_accessed)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS redirects (
+                    source_url TEXT PRIMARY KEY,
+                    final_url TEXT,
+                    resolved INTEGER,
+                    expires_at REAL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def _ttl(self, content_type: str) -> int:
+        return self.ttls.get(content_type, self.ttls["default"])
+
+    def _load(self, key: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            cursor = self._connection().execute(
+                "SELECT final_url, status_code, body, etag, last_modified, expires_at, fetch_seconds, media_type "
+                "FROM responses WHERE url = ?", (key,))
+            return cursor.fetchone()
+
+    def _touch(self, key: str, expires_at: Optional[float] = None):
+        with self._lock:
+            conn = self._connection()
+            if expires_at is None:
+                conn.execute("UPDATE responses SET last_accessed = ? WHERE url = ?", (time.time(), key))
+            else:
+                conn.execute("UPDATE responses SET last_accessed = ?, expires_at = ? WHERE url = ?",
+                             (time.time(), expires_at, key))
+            conn.commit()
+
+    def _store(self, key: str, content_type: str, response, body: bytes, fetch_seconds: float):
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (url, final_url, content_type, status_code, body, size, etag, "
+                "last_modified, fetched_at, expires_at, last_accessed, fetch_seconds, media_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, content_type, response.status_code, compressed, len(compressed),
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 now, now + self._ttl(content_type), now, fetch_seconds, response.headers.get('Content-Type')))
+            conn.commit()
+        self._count(stored=1)
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its size budget"""
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_size_bytes:
+                return
+
+            target = int(self.max_size_bytes * 0.9)
+            doomed = []
+            for url, size in conn.execute("SELECT url, size FROM responses ORDER BY last_accessed"):
+                if total <= target:
+                    break
+                doomed.append((url,))
+                total -= size
+
+            conn.executemany("DELETE FROM responses WHERE url = ?", doomed)
+            conn.commit()
+        self._count(evicted=len(doomed))
+
+    def lookup(self, url: str, content_type: str) -> CacheLookup:
+        """Check the cache for a URL; a fresh entry is counted as a hit and needs no request"""
+        key = normalize_url(url)
+        row = self._load(key)
+        if row is None:
+            return CacheLookup(key, content_type)
+
+        final_url, status_code, body, etag, last_modified, expires_at, fetch_seconds, media_type = row
+        headers = {'Content-Type': media_type} if media_type else {}
+        cached = CachedResponse(final_url, status_code, zlib.decompress(body), headers, from_cache=True)
+
+        if expires_at > time.time():
+            self._touch(key)
+            self._count(hits=1, bytes_saved=len(cached.content), seconds_saved=fetch_seconds or 0.0)
+            return CacheLookup(key, content_type, cached, fresh=True)
+
+        conditional_headers = {}
+        if etag:
+            conditional_headers['If-None-Match'] = etag
+        if last_modified:
+            conditional_headers['If-Modified-Since'] = last_modified
+        return CacheLookup(key, content_type, cached, conditional_headers=conditional_headers)
+
+    def complete(self, lookup: CacheLookup, response: CachedResponse, fetch_seconds: float) -> CachedResponse:
+        """Record the network response for a lookup and return what the caller should use"""
+        if response.status_code == 304 and lookup.cached is not None:
+            self._touch(lookup.key, time.time() + self._ttl(lookup.content_type))
+            self._count(revalidated=1, bytes_saved=len(lookup.cached.content))
+            return lookup.cached
+
+        self._count(misses=1)
+        if response.status_code == 200:
+            self._store(lookup.key, lookup.content_type, response, response.content, fetch_seconds)
+        return response
+
+    def fetch(self, url: str, content_type: str, fetcher: Callable[[Dict[str, str]], object],
+              read_body: Callable[[object], bytes] = lambda response: response.content) -> CachedResponse:
+        """Serve a URL from cache, revalidating or fetching through fetcher(headers) when needed"""
+        lookup = self.lookup(url, content_type)
+        if lookup.fresh:
+            return lookup.cached
+
+        started = time.time()
+        response = fetcher(lookup.conditional_headers)
+
+        if response.status_code == 304 and lookup.cached is not None:
+            if hasattr(response, 'close'):
+                response.close()
+            live = CachedResponse(response.url, 304, b"", dict(response.headers))
+        else:
+            live = CachedResponse(response.url, response.status_code, read_body(response), dict(response.headers))
+
+        return self.complete(lookup, live, time.time() - started)
+
+    def get_redirect(self, url: str) -> Optional[Tuple[Optional[str], bool]]:
+        """Return (final_url, resolved) for a remembered redirect, or None if unknown or expired"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT final_url, resolved, expires_at FROM redirects WHERE source_url = ?",
+                (normalize_url(url),)).fetchone()
+
+        if row is None or row[2] <= time.time():
+            self._count(redirect_misses=1)
+            return None
+
+        self._count(redirect_hits=1)
+        return row[0], bool(row[1])
+
+    def store_redirect(self, url: str, final_url: Optional[str], resolved: bool = True):
+        """Remember where a URL redirects to; failed resolutions are kept for a shorter time"""
+        ttl = self.redirect_ttl if resolved else self.negative_redirect_ttl
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO redirects VALUES (?, ?, ?, ?)",
+                         (normalize_url(url), final_url, int(resolved), time.time() + ttl))
+            conn.commit()
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss counters and the current cache size"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+        with self._lock:
+            row = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        stats["entries"], stats["size_bytes"] = row
+        return stats
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM redirects")
+            conn.commit()
+
+
+_shared_cache: Optional[HTTPResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_http_cache() -> HTTPResponseCache:
+    """Return the process-wide response cache used by the research path"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPResponseCache()
+        return _shared_cache
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Durable job queue for content generation.
+Every (project, item) is one row in SQLite (WAL mode), so several threads or
+processes can work on the same projects: a worker leases a job, heartbeats
+while it runs, and either completes it (idempotently) or fails it into a
+retry with exponential backoff. Leases left behind by a crash expire and the
+job is picked up again. The queue records progress, so it lives next to the
+project files rather than in the disposable cache directory.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"  # Nothing left to generate, e.g. the project reached its target
+
+
+def make_worker_id() -> str:
+    """Identify the calling thread across processes and hosts"""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+@dataclass
+class Job:
+    """A leased job"""
+    id: str
+    project_id: str
+    keyword: str
+    item_index: int
+    attempts: int
+    worker_id: str
+
+
+class JobQueue:
+    """SQLite-backed work queue with leases, heartbeats and retries"""
+
+    def __init__(self, db_path: str = "job_queue.sqlite", lease_seconds: float = 900.0,
+                 max_attempts: int = 3, backoff_seconds: float = 60.0, max_backoff_seconds: float = 3600.0):
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds  # A job whose heartbeat stops for this long is handed out again
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds  # Doubled after every failed attempt
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use; transactions are explicit so leases are atomic across processes"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    project_id TEXT,
+                    keyword TEXT,
+                    item_index INTEGER,
+                    status TEXT,
+                    attempts INTEGER DEFAULT 0,
+                    available_at REAL,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    last_error TEXT,
+                    created_at REAL,
+                    updated_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(project_id, status, available_at)")
+            self._conn = conn
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def job_id(project_id: str, item_index: int) -> str:
+        return f"{project_id}:{item_index}"
+
+    def enqueue_project(self, project_id: str, keywords: List[str], target_count: int, completed_count: int = 0) -> int:
+        """Create one job per item of a project; items up to completed_count are recorded as done.
+        Existing jobs are left as they are, so this is safe to call on every run. Returns the jobs added."""
+        if not keywords:
+            raise ValueError(f"Project {project_id} has no keywords to enqueue")
+        
+        now = time.time()
+        rows = []
+        for item_index in range(1, target_count + 1):
+            status = DONE if item_index <= completed_count else PENDING
+            rows.append((self.job_id(project_id, item_index), project_id, keywords[(item_index - 1) % len(keywords)],
+                         item_index, status, now, now, now))
+
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO jobs (id, project_id, keyword, item_index, status, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            return conn.total_changes - before
+
+    def lease(self, worker_id: str, project_ids: Optional[List[str]] = None,
+              lease_seconds: Optional[float] = None) -> Optional[Job]:
+        """Claim the next ready job: pending and past its backoff, or leased with an expired lease"""
+        now = time.time()
+        lease_seconds = lease_seconds or self.lease_seconds
+        project_filter, params = "", [PENDING, now, LEASED, now]
+        if project_ids:
+            project_filter = f" AND project_id IN ({', '.join('?' for _ in project_ids)})"
+            params.extend(project_ids)
+
+        with self._transaction() as conn:
+            # A job whose worker keeps dying is given up rather than handed out forever
+            conn.execute("""
+                UPDATE jobs SET status = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE status = ? AND lease_expires < ? AND attempts >= ?
+            """, (FAILED, "lease expired", now, LEASED, now, self.max_attempts))
+
+            row = conn.execute(f"""
+                SELECT id, project_id, keyword, item_index, attempts FROM jobs
+                WHERE ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?)){project_filter}
+                ORDER BY item_index, project_id LIMIT 1
+            """, params).fetchone()
+            if row is None:
+                return None
+
+            conn.execute("""
+                UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+            """, (LEASED, worker_id, now + lease_seconds, now, row[0]))
+
+        return Job(row[0], row[1], row[2], row[3], row[4] + 1, worker_id)
+
+    def heartbeat(self, job: Job, lease_seconds: Optional[float] = None) -> bool:
+        """Extend a lease; False when the job is no longer leased to this worker"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?
+            """, (now + (lease_seconds or self.lease_seconds), now, job.id, LEASED, job.worker_id))
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def keep_alive(self, job: Job, interval: Optional[float] = None):
+        """Heartbeat a job in the background for the duration of the block"""
+        stop = threading.Event()
+        interval = interval or self.lease_seconds / 3
+
+        def beat():
+            while not stop.wait(interval):
+                if not self.heartbeat(job):
+                    print(f"⚠️ Lease on {job.id} was lost")
+                    return
+
+        thread = threading.Thread(target=beat, daemon=True, name=f"heartbeat-{job.id}")
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job: Job, result: str = "") -> bool:
+        """Mark a job done. Idempotent: only the first completion returns True, even after a lost lease."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE jobs SET status = ?, result = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND status != ?
+            """, (DONE, result, now, job.id, DONE))
+            return cursor.rowcount == 1
+
+    def fail(self, job: Job, error: str = "") -> str:
+        """Return a job for a retry after backoff, or mark it failed once attempts run out; returns the new status"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                               (job.id, LEASED, job.worker_id)).fetchone()
+            if row is None:
+                return self._status(conn, job.id)
+
+            attempts = row[0]
+            if attempts >= self.max_attempts:
+                status, available_at = FAILED, now
+            else:
+                status = PENDING
+                available_at = now + min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+
+            conn.execute("""
+                UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL,
+                                updated_at = ?
+                WHERE id = ?
+            """, (status, available_at, error, now, job.id))
+            return status
+
+    def cancel(self, job: Job, reason: str = "") -> bool:
+        """Close a leased job without retrying it; False when the job is no longer leased to this worker"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE jobs SET status = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND status = ? AND lease_owner = ?
+            """, (CANCELLED, reason, now, job.id, LEASED, job.worker_id))
+            return cursor.rowcount == 1
+
+    @staticmethod
+    def _status(conn: sqlite3.Connection, job_id: str) -> Optional[str]:
+        row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def retry_failed(self, project_id: str) -> int:
+        """Give failed jobs of a project a fresh set of attempts"""
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE jobs SET status = ?, attempts = 0, available_at = ?, updated_at = ? WHERE project_id = ? AND status = ?
+            """, (PENDING, time.time(), time.time(), project_id, FAILED))
+            return cursor.rowcount
+
+    def next_retry_in(self, project_ids: List[str]) -> Optional[float]:
+        """Seconds until the earliest pending job of the projects becomes ready, None without pending jobs"""
+        if not project_ids:
+            return None
+        with self._lock:
+            row = self._connection().execute(f"""
+                SELECT MIN(available_at) FROM jobs WHERE status = ? AND project_id IN ({', '.join('?' for _ in project_ids)})
+            """, [PENDING, *project_ids]).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def counts(self, project_id: str) -> Dict[str, int]:
+        """Jobs per status for a project"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE project_id = ? GROUP BY status", (project_id,)).fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0, CANCELLED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def remove_project(self, project_id: str) -> int:
+        """Delete every job of a project"""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM jobs WHERE project_id = ?", (project_id,)).rowcount
+
+
+_shared_queue: Optional[JobQueue] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_job_queue() -> JobQueue:
+    """Return the process-wide job queue"""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = JobQueue()
+        return _shared_queue
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick multi-keyword matching.
+The automaton is built once per keyword set and finds every keyword in a
+single pass over the text, so scanning cost does not grow with the number
+of keywords. Being pure Python, a pass costs far more than one str.count, so
+counting a handful of keywords is left to str.count and the automaton is
+meant for scans over many keywords.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Up to this many keywords, one str.count per keyword beats a pass of the automaton
+DIRECT_COUNT_LIMIT = 256
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed set of keywords (substring semantics)"""
+
+    def __init__(self, keywords: Iterable[str], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.keywords: List[str] = []
+
+        # Trie transitions, failure links and keyword indexes emitted at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for keyword in keywords:
+            if keyword and keyword not in self.keywords:
+                self._add(keyword)
+        self._build_failure_links()
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _normalize_with_offsets(self, text: str) -> Tuple[str, Optional[List[int]]]:
+        """Normalized text plus, when lowercasing changed its length (e.g. 'İ'), the original offset of each character"""
+        normalized = self._normalize(text)
+        if len(normalized) == len(text):
+            return normalized, None
+
+        parts, offsets = [], []
+        for offset, char in enumerate(text):
+            lowered = char.lower()
+            parts.append(lowered)
+            offsets.extend([offset] * len(lowered))
+        return "".join(parts), offsets
+
+    def _add(self, keyword: str):
+        index = len(self.keywords)
+        self.keywords.append(keyword)
+
+        state = 0
+        for char in self._normalize(keyword):
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, keyword) for every occurrence, including overlapping ones.
+        Spans are offsets into the original text."""
+        goto, fail, output = self._goto, self._fail, self._output
+        lengths = [len(self._normalize(keyword)) for keyword in self.keywords]
+        normalized, offsets = self._normalize_with_offsets(text)
+        state = 0
+
+        for position, char in enumerate(normalized):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                start, end = position + 1 - lengths[index], position + 1
+                if offsets is not None:
+                    start, end = offsets[start], offsets[end - 1] + 1
+                yield start, end, self.keywords[index]
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Count non-overlapping occurrences of each keyword, like str.count per keyword"""
+        if len(self.keywords) <= DIRECT_COUNT_LIMIT:
+            normalized = self._normalize(text)
+            return {keyword: normalized.count(self._normalize(keyword)) for keyword in self.keywords}
+
+        counts = {keyword: 0 for keyword in self.keywords}
+        next_allowed = {keyword: 0 for keyword in self.keywords}
+
+        for start, end, keyword in self.iter_matches(text):
+            if start >= next_allowed[keyword]:
+                counts[keyword] += 1
+                next_allowed[keyword] = end
+
+        return counts
+
+    def first_matches(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """Return the (start, end) span of the first occurrence of each keyword found"""
+        found: Dict[str, Tuple[int, int]] = {}
+        for start, end, keyword in self.iter_matches(text):
+            if keyword not in found:
+                found[keyword] = (start, end)
+                if len(found) == len(self.keywords):
+                    break
+        return found
+
+    def find_any(self, text: str) -> Optional[str]:
+        """Return the first keyword to appear in the text, or None"""
+        for _, _, keyword in self.iter_matches(text):
+            return keyword
+        return None
+
+
+@lru_cache(maxsize=128)
+def get_keyword_matcher(keywords: Tuple[str, ...], case_sensitive: bool = False) -> KeywordMatcher:
+    """Return a cached matcher for a keyword set; pass keywords as a tuple"""
+    return KeywordMatcher(keywords, case_sensitive)
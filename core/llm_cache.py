@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Persistent cache for LLM generations.
+Responses are stored zlib-compressed in SQLite, keyed by a hash of provider,
+model, prompt, temperature, max_tokens and a scope, and evicted least recently
+used first once the cache outgrows its size budget. The scope names the work
+item a generation belongs to (e.g. a queued job), so a retry of that item reuses
+its article while another item with the same prompt gets a fresh one.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+def make_cache_key(provider: str, model: str, prompt: str, temperature: float, max_tokens: int,
+                   scope: str = "") -> str:
+    """Hash every input that changes what the model returns, plus the scope the generation belongs to"""
+    parts = [provider, model, prompt, float(temperature), int(max_tokens)]
+    if scope:
+        parts.append(scope)
+    payload = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed generation cache with LRU, size-based eviction"""
+
+    def __init__(self, db_path: str = "cache/llm_cache.sqlite", max_size_bytes: int = 500 * 1024 * 1024):
+        self.db_path = Path(db_path)
+        self.max_size_bytes = max_size_bytes
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stored": 0,
+            "evicted": 0,
+            "seconds_saved": 0.0,
+        }
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                self.stats[name] += delta
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model TEXT,
+                    body BLOB,
+                    size INTEGER,
+                    created_at REAL,
+                    last_accessed REAL,
+                    hits INTEGER,
+                    generation_seconds REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_accessed ON responses(last_accessed)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, provider: str, model: str, prompt: str, temperature: float, max_tokens: int,
+            scope: str = "") -> Optional[str]:
+        """Return a cached generation, or None"""
+        key = make_cache_key(provider, model, prompt, temperature, max_tokens, scope)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT body, generation_seconds FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET last_accessed = ?, hits = hits + 1 WHERE key = ?",
+                             (time.time(), key))
+                conn.commit()
+
+        if row is None:
+            self._count(misses=1)
+            return None
+
+        self._count(hits=1, seconds_saved=row[1] or 0.0)
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, provider: str, model: str, prompt: str, temperature: float, max_tokens: int,
+            response: str, generation_seconds: float = 0.0, scope: str = ""):
+        """Store a generation, replacing any previous one for the same inputs"""
+        key = make_cache_key(provider, model, prompt, temperature, max_tokens, scope)
+        compressed = zlib.compress(response.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (key, provider, model, compressed, len(compressed), now, now, 0, generation_seconds))
+            conn.commit()
+        self._count(stored=1)
+        self.evict()
+
+    def get_or_generate(self, provider: str, model: str, prompt: str, temperature: float, max_tokens: int,
+                        generate: Callable[[], Optional[str]], bypass: bool = False, scope: str = "") -> Optional[str]:
+        """Serve a generation from cache or run generate() and cache a non-empty result.
+        With bypass=True the cache is not read, but the fresh result still replaces the entry."""
+        if bypass:
+            self._count(bypassed=1)
+        else:
+            cached = self.get(provider, model, prompt, temperature, max_tokens, scope)
+            if cached is not None:
+                print(f"💾 Using cached {provider} response ({len(cached)} characters)")
+                return cached
+
+        started = time.time()
+        response = generate()
+        if response:
+            self.put(provider, model, prompt, temperature, max_tokens, response, time.time() - started, scope)
+        return response
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its size budget"""
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_size_bytes:
+                return
+
+            target = int(self.max_size_bytes * 0.9)
+            doomed = []
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_accessed"):
+                if total <= target:
+                    break
+                doomed.append((key,))
+                total -= size
+
+            conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            conn.commit()
+        self._count(evicted=len(doomed))
+
+    def invalidate(self, provider: str, model: str, prompt: str, temperature: float, max_tokens: int,
+                   scope: str = "") -> bool:
+        """Remove one cached generation; returns True if it existed"""
+        key = make_cache_key(provider, model, prompt, temperature, max_tokens, scope)
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount
+            conn.commit()
+        return deleted > 0
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss counters and the current cache size"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        with self._lock:
+            row = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        stats["entries"], stats["size_bytes"] = row
+        return stats
+
+    def clear(self):
+        """Remove every cached generation"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_llm_cache() -> LLMResponseCache:
+    """Return the process-wide generation cache shared by all LLM providers"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+        return _shared_cache
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP transport for LLM providers.
+Keeps one pooled, keep-alive requests.Session per provider endpoint so
+generations and connection probes reuse open TCP/TLS connections, and retries
+connection failures and overload responses at the adapter level.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Statuses that mean the request was not processed and can be sent again
+RETRY_STATUS_CODES = (429, 502, 503, 504, 529)
+
+
+class LLMTransport:
+    """Pooled sessions keyed by endpoint (scheme, host and port)"""
+
+    def __init__(self, pool_maxsize: int = 8, max_retries: int = 2, backoff_factor: float = 1.0,
+                 status_forcelist: Tuple[int, ...] = RETRY_STATUS_CODES,
+                 pool_sizes: Optional[Dict[str, int]] = None):
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = status_forcelist
+        self.pool_sizes = {self.endpoint_for(url): size for url, size in (pool_sizes or {}).items()}
+
+        self.stats: Dict[str, int] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_for(url: str) -> str:
+        """Reduce a URL to the endpoint whose connections can be shared"""
+        parsed = urlparse(url)
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+    def _retry(self) -> Retry:
+        # Reads are never retried: the server may already be generating, and a resend pays for it twice
+        return Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset(["GET", "HEAD", "POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+    def configure_endpoint(self, url: str, pool_maxsize: int):
+        """Set the pool size for one endpoint, replacing its session"""
+        endpoint = self.endpoint_for(url)
+        with self._lock:
+            self.pool_sizes[endpoint] = pool_maxsize
+            session = self._sessions.pop(endpoint, None)
+        if session is not None:
+            session.close()
+
+    def session_for(self, url: str) -> requests.Session:
+        """Return the pooled session for a URL's endpoint, creating it on first use"""
+        endpoint = self.endpoint_for(url)
+        with self._lock:
+            session = self._sessions.get(endpoint)
+            if session is None:
+                pool_size = self.pool_sizes.get(endpoint, self.pool_maxsize)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=self._retry())
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[endpoint] = session
+            self.stats[endpoint] = self.stats.get(endpoint, 0) + 1
+            return session
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the endpoint's pooled session"""
+        return self.session_for(url).post(url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the endpoint's pooled session"""
+        return self.session_for(url).get(url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Requests sent per endpoint"""
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_shared_transport: Optional[LLMTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_llm_transport() -> LLMTransport:
+    """Return the process-wide transport shared by all LLM generators"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = LLMTransport()
+        return _shared_transport
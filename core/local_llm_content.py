@@ -8,16 +8,51 @@ import os
 import json
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 import requests
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from core.settings_manager import SettingsManager
+from core.llm_cache import get_shared_llm_cache
+from core.llm_transport import LLMTransport, get_shared_llm_transport
+from core.provider_health import get_shared_health_registry
+from core.sectioned_generation import SectionedGenerator
+from core.concurrency_limits import get_shared_concurrency_limits
+from core.prompt_budget import PromptBudget
+
+# Providers served by Ollama's /api/generate endpoint
+OLLAMA_PROVIDERS = ["deepseek", "deepseek-32b", "deepseek-14b", "llama3.3:latest", "ollama"]
+
+# Connection problems after which a streamed generation can be resumed
+STREAM_INTERRUPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+@dataclass
+class LocalGeneration:
+    """Outcome of one generation call. It belongs to the caller, so concurrent calls on a
+    shared generator never see each other's partial output or metrics."""
+    provider: str
+    content: Optional[str] = None
+    partial: str = ""  # Text received before a failed generation; pass it back as resume_from
+    metrics: Dict = field(default_factory=dict)
 
 class MultilingualLocalLLMContentGenerator:
-    def __init__(self):
+    def __init__(self, transport: Optional[LLMTransport] = None, web_researcher=None):
         self.settings_manager = SettingsManager()
         
+        # Research for multilingual fan-out; without a researcher, callers pass research_data in
+        self.web_researcher = web_researcher
+        
+        # Pooled keep-alive sessions shared with the other LLM generators
+        self.transport = transport or get_shared_llm_transport()
+        
         # LLM Provider configurations
         self.providers = {
             "deepseek": {
@@ -30,7 +65,8 @@ class MultilingualLocalLLMContentGenerator:
                 "api_url": "http://localhost:11434/api/generate", 
                 "model": "deepseek-coder:32b",
                 "cost_per_token": 0.0,
-                "max_tokens": 32768  # Even larger context for 32B model
+                "max_tokens": 32768,  # Even larger context for 32B model
+                "keep_alive": "60m"  # Slowest model to load, keep it resident longest
             },
             "deepseek-14b": {
                 "api_url": "http://localhost:11434/api/generate",
@@ -67,6 +103,42 @@ class MultilingualLocalLLMContentGenerator:
         
         self.current_provider = "deepseek"  # Default to DeepSeek
         
+        # Streaming generation: an idle gap between chunks fails the request, not its total duration
+        self.streaming_config = {
+            "enabled": True,
+            "connect_timeout": 10,
+            "idle_timeout": 120,  # Longest silence allowed between chunks (covers model load time)
+            "max_resume_attempts": 2
+        }
+        
+        # Generations of scoped calls (e.g. queued jobs) are cached on disk; set to None to always call the model
+        self.llm_cache = get_shared_llm_cache()
+        
+        # Ollama model residency: providers may override keep_alive in their own config
+        self.model_residency = {
+            "keep_alive": "30m",  # Longer than the publishing interval so models stay loaded between posts
+            "warm_up_before_runs": True,
+            "warm_up_lead_seconds": 120,
+            "cold_load_threshold": 1.0  # Load times above this (seconds) count as a cold start
+        }
+        self.residency_stats: Dict[str, Dict] = {}
+        self._residency_lock = threading.Lock()
+        
+        # Provider health shared with the other generators, updated by every generation
+        self.health = get_shared_health_registry()
+        
+        # Per-provider request caps shared with the other generators
+        self.provider_limits = get_shared_concurrency_limits()
+        
+        # Research in fan-out prompts is packed by relevance to the topic within this input budget
+        self.research_budget = {
+            "max_prompt_tokens": 6000,
+            "max_statistics": 6,
+            "max_insights": 4,
+            "max_articles": 3
+        }
+        self.prompt_budget = PromptBudget(self.research_budget["max_prompt_tokens"], "default")
+        
         # Load multilingual content topics from config
         self.multilingual_topics = self._load_multilingual_topics_config()
 
@@ -126,7 +198,8 @@ class MultilingualLocalLLMContentGenerator:
         }
 
     def set_provider(self, provider: str, custom_config: Dict = None):
-        """Set the local LLM provider"""
+        """Set the default local LLM provider. The default applies to every caller of this
+        generator, so code sharing the service instance passes provider per call instead."""
         if provider in self.providers:
             self.current_provider = provider
         elif custom_config:
@@ -135,6 +208,11 @@ class MultilingualLocalLLMContentGenerator:
         else:
             raise ValueError(f"Unknown provider: {provider}")
 
+    def is_available(self, provider: str = None) -> bool:
+        """Check provider health from the shared registry, probing only when the cached state expired"""
+        provider = provider or self.current_provider
+        return self.health.is_available(provider, lambda: self.test_connection(provider))
+    
     def test_connection(self, provider: str = None) -> bool:
         """Test connection to local LLM"""
         test_provider = provider or self.current_provider
@@ -155,7 +233,7 @@ class MultilingualLocalLLMContentGenerator:
                     "anthropic-version": "2023-06-01"
                 }
                 
-                response = requests.post(
+                response = self.transport.post(
                     config["api_url"],
                     headers=headers,
                     json={
@@ -167,14 +245,15 @@ class MultilingualLocalLLMContentGenerator:
                 )
                 return response.status_code == 200
                 
-            elif test_provider in ["deepseek", "deepseek-32b", "deepseek-14b", "llama3.3:latest", "ollama"]:
+            elif test_provider in OLLAMA_PROVIDERS:
                 # Ollama API format
-                response = requests.post(
+                response = self.transport.post(
                     config["api_url"],
                     json={
                         "model": config["model"],
                         "prompt": "Hello",
                         "stream": False,
+                        "keep_alive": self._keep_alive(test_provider),
                         "options": {"max_tokens": 10}
                     },
                     timeout=30
@@ -182,7 +261,7 @@ class MultilingualLocalLLMContentGenerator:
                 return response.status_code == 200
             else:
                 # llama.cpp format
-                response = requests.post(
+                response = self.transport.post(
                     config["api_url"],
                     json={
                         "prompt": "Hello",
@@ -196,21 +275,71 @@ class MultilingualLocalLLMContentGenerator:
             print(f"Connection test failed: {e}")
             return False
 
-    def generate_content_with_local_llm(self, topic: str, content_type: str = "blog_post", language: str = "english") -> str:
-        """Generate multilingual content using local LLM"""
+    def generate_content_with_local_llm(self, topic: str, content_type: str = "blog_post", language: str = "english",
+                                        resume_from: Optional[str] = None, bypass_cache: bool = False,
+                                        provider: Optional[str] = None, cache_scope: Optional[str] = None) -> str:
+        """Generate multilingual content using local LLM.
+        Pass resume_from (the partial of a failed generate_with_details call) to continue an interrupted generation,
+        bypass_cache=True to regenerate even when a cached response exists, and provider to
+        use a model other than the current provider for this call only."""
         
         prompt = self.create_multilingual_content_prompt(topic, content_type, language)
-        config = self.providers[self.current_provider]
+        return self.generate_from_prompt(prompt, provider=provider, resume_from=resume_from, bypass_cache=bypass_cache,
+                                         cache_scope=cache_scope)
+    
+    def generate_from_prompt(self, prompt: str, provider: str = None, resume_from: Optional[str] = None,
+                             bypass_cache: bool = False, cache_scope: Optional[str] = None) -> Optional[str]:
+        """Generate from a ready-made prompt.
+        The provider is fixed for the call, so concurrent calls may use different providers."""
+        return self.generate_with_details(prompt, provider, resume_from, bypass_cache, cache_scope).content
+    
+    def generate_with_details(self, prompt: str, provider: str = None, resume_from: Optional[str] = None,
+                              bypass_cache: bool = False, cache_scope: Optional[str] = None) -> LocalGeneration:
+        """Like generate_from_prompt, but also returns this call's metrics and, on failure, its partial output.
+        The response cache is only used with a cache_scope (such as a queued job's id): a retry of that
+        job gets its article back, while other items with the same prompt are generated afresh."""
+        generation = LocalGeneration(provider or self.current_provider)
+        if self.llm_cache is None or not cache_scope:
+            generation.content = self._generate_from_prompt(prompt, generation, resume_from)
+            return generation
+        
+        config = self.providers[generation.provider]
+        generation.content = self.llm_cache.get_or_generate(
+            generation.provider, config["model"], prompt, 0.7, config["max_tokens"],
+            lambda: self._generate_from_prompt(prompt, generation, resume_from), bypass=bypass_cache, scope=cache_scope)
+        if generation.content and not generation.metrics:
+            generation.metrics = {"provider": generation.provider, "cached": True}
+        return generation
+    
+    def _generate_from_prompt(self, prompt: str, generation: LocalGeneration,
+                              resume_from: Optional[str] = None) -> Optional[str]:
+        """Run one generation and record the outcome in the health registry"""
+        content = self._run_generation(prompt, generation, resume_from)
+        if content:
+            self.health.record_success(generation.provider)
+        else:
+            self.health.record_failure(generation.provider, "generation failed")
+        return content
+    
+    def _run_generation(self, prompt: str, generation: LocalGeneration,
+                        resume_from: Optional[str] = None) -> Optional[str]:
+        """Run one generation on the call's provider"""
+        provider = generation.provider
+        if self.streaming_config["enabled"]:
+            return self._generate_streaming(prompt, generation, resume_from or "")
+        
+        config = self.providers[provider]
         
         try:
-            if self.current_provider in ["deepseek", "deepseek-32b", "deepseek-14b", "llama3.3:latest", "ollama"]:
+            if provider in OLLAMA_PROVIDERS:
                 # Ollama API format
-                response = requests.post(
+                response = self.transport.post(
                     config["api_url"],
                     json={
                         "model": config["model"],
                         "prompt": prompt,
                         "stream": False,
+                        "keep_alive": self._keep_alive(provider),
                         "options": {
                             "temperature": 0.7,
                             "top_p": 0.9,
@@ -222,11 +351,12 @@ class MultilingualLocalLLMContentGenerator:
                 
                 if response.status_code == 200:
                     result = response.json()
+                    self._record_ollama_timings(result, generation.metrics, provider)
                     return result.get("response", "")
                 
             else:
                 # llama.cpp format
-                response = requests.post(
+                response = self.transport.post(
                     config["api_url"],
                     json={
                         "prompt": prompt,
@@ -248,6 +378,207 @@ class MultilingualLocalLLMContentGenerator:
             print(f"❌ Error generating content: {e}")
             return None
     
+    def _generate_streaming(self, prompt: str, generation: LocalGeneration, partial: str = "") -> Optional[str]:
+        """Collect a streamed generation, resuming from the partial text when the connection drops"""
+        provider = generation.provider
+        metrics = {
+            "provider": provider,
+            "model": self.providers[provider]["model"],
+            "ttft_seconds": None,
+            "total_seconds": 0.0,
+            "chunks": 0,
+            "resumes": 0,
+            "completed": False
+        }
+        generation.metrics = metrics
+        started = time.time()
+        
+        for attempt in range(self.streaming_config["max_resume_attempts"] + 1):
+            if attempt:
+                metrics["resumes"] += 1
+                print(f"🔁 Resuming generation after {len(partial)} characters (attempt {attempt})")
+            
+            try:
+                for chunk in self.stream_content_with_local_llm(prompt, provider, partial, metrics):
+                    if metrics["ttft_seconds"] is None:
+                        metrics["ttft_seconds"] = time.time() - started
+                    metrics["chunks"] += 1
+                    partial += chunk
+                
+                metrics["completed"] = True
+                break
+                
+            except STREAM_INTERRUPTIONS as e:
+                print(f"⚠️ Stream interrupted: {e}")
+            except Exception as e:
+                print(f"❌ Error generating content: {e}")
+                break
+        
+        metrics["total_seconds"] = time.time() - started
+        metrics["characters"] = len(partial)
+        
+        if not metrics["completed"]:
+            generation.partial = partial
+            return None
+        
+        if metrics["ttft_seconds"] is not None:
+            print(f"⚡ First token after {metrics['ttft_seconds']:.1f}s, "
+                  f"{len(partial)} characters in {metrics['total_seconds']:.1f}s")
+        return partial
+    
+    def stream_content_with_local_llm(self, prompt: str, provider: str = None, partial: str = "",
+                                      metrics: Optional[Dict] = None) -> Iterator[str]:
+        """Yield generated text as it arrives (Ollama NDJSON or llama.cpp SSE).
+        When partial is given the model is asked to continue from it."""
+        provider = provider or self.current_provider
+        metrics = metrics if metrics is not None else {}
+        config = self.providers[provider]
+        timeout = (self.streaming_config["connect_timeout"], self.streaming_config["idle_timeout"])
+        
+        if provider in OLLAMA_PROVIDERS:
+            if partial:
+                prompt = (f"{prompt}\n\n---\nThe draft below was cut off. Continue writing exactly where it stops, "
+                          f"without repeating any of it:\n\n{partial}")
+            payload = {
+                "model": config["model"],
+                "prompt": prompt,
+                "stream": True,
+                "keep_alive": self._keep_alive(provider),
+                "options": {
+                    "temperature": 0.7,
+                    "top_p": 0.9,
+                    "max_tokens": config["max_tokens"]
+                }
+            }
+        else:
+            # llama.cpp completes raw text, so the partial output simply extends the prompt
+            payload = {
+                "prompt": prompt + partial,
+                "n_predict": config["max_tokens"],
+                "temperature": 0.7,
+                "top_p": 0.9,
+                "stream": True
+            }
+        
+        with self.transport.post(config["api_url"], json=payload, stream=True, timeout=timeout) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"LLM API error: {response.status_code}")
+            
+            # Neither server names a charset, and iter_lines only decodes when one is known
+            response.encoding = response.encoding or "utf-8"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                
+                if provider in OLLAMA_PROVIDERS:
+                    event = json.loads(line)
+                    if event.get("error"):
+                        raise RuntimeError(event["error"])
+                    text = event.get("response", "")
+                    done = event.get("done", False)
+                    if done:
+                        self._record_ollama_timings(event, metrics, provider)
+                else:
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[len("data:"):].strip())
+                    text = event.get("content", "")
+                    done = event.get("stop", False)
+                
+                if text:
+                    yield text
+                if done:
+                    return
+        
+        # The server closed the stream without a final event
+        raise requests.exceptions.ChunkedEncodingError("stream ended before the final chunk")
+    
+    def _record_ollama_timings(self, event: Dict, metrics: Dict, provider: str):
+        """Copy Ollama's final-chunk timings (nanoseconds) into the generation and residency metrics"""
+        for key in ("load_duration", "prompt_eval_duration", "eval_duration", "total_duration"):
+            if key in event:
+                metrics[key.replace("duration", "seconds")] = event[key] / 1e9
+        if "eval_count" in event:
+            metrics["eval_count"] = event["eval_count"]
+            if metrics.get("eval_seconds"):
+                metrics["tokens_per_second"] = event["eval_count"] / metrics["eval_seconds"]
+        
+        load_seconds = metrics.get("load_seconds", 0.0)
+        with self._residency_lock:
+            stats = self._residency_stats_for(provider)
+            stats["generations"] += 1
+            stats["load_seconds_total"] += load_seconds
+            stats["last_load_seconds"] = load_seconds
+            if "tokens_per_second" in metrics:
+                stats["last_tokens_per_second"] = metrics["tokens_per_second"]
+            if load_seconds > self.model_residency["cold_load_threshold"]:
+                stats["cold_loads"] += 1
+        
+        if load_seconds > self.model_residency["cold_load_threshold"]:
+            print(f"🧊 Cold start: {self.providers[provider]['model']} took {load_seconds:.1f}s to load")
+    
+    def _residency_stats_for(self, provider: str) -> Dict:
+        stats = self.residency_stats.get(provider)
+        if stats is None:
+            stats = {
+                "generations": 0,
+                "cold_loads": 0,
+                "warm_ups": 0,
+                "load_seconds_total": 0.0,
+                "last_load_seconds": 0.0,
+                "last_tokens_per_second": None
+            }
+            self.residency_stats[provider] = stats
+        return stats
+    
+    def _keep_alive(self, provider: str):
+        """How long Ollama keeps a provider's model loaded after a request"""
+        return self.providers[provider].get("keep_alive", self.model_residency["keep_alive"])
+    
+    def warm_up_model(self, provider: str = None) -> Optional[float]:
+        """Load an Ollama model into memory without generating; returns the seconds it took"""
+        provider = provider or self.current_provider
+        if provider not in OLLAMA_PROVIDERS:
+            return None
+        
+        config = self.providers[provider]
+        started = time.time()
+        try:
+            # A request with no prompt only loads the model and resets its keep_alive timer
+            response = self.transport.post(
+                config["api_url"],
+                json={"model": config["model"], "keep_alive": self._keep_alive(provider)},
+                timeout=(self.streaming_config["connect_timeout"], self.streaming_config["idle_timeout"])
+            )
+            if response.status_code != 200:
+                print(f"❌ Warm-up failed for {config['model']}: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"❌ Warm-up failed for {config['model']}: {e}")
+            return None
+        
+        seconds = time.time() - started
+        with self._residency_lock:
+            self._residency_stats_for(provider)["warm_ups"] += 1
+        print(f"🔥 {config['model']} is loaded ({seconds:.1f}s)")
+        return seconds
+    
+    def warm_up_in_background(self, provider: str = None) -> threading.Thread:
+        """Start warm_up_model on a daemon thread so the caller does not wait for the load"""
+        thread = threading.Thread(target=self.warm_up_model, args=(provider or self.current_provider,), daemon=True)
+        thread.start()
+        return thread
+    
+    def generate_sectioned_content(self, topic: str, language: str = "english", sections: Optional[List[str]] = None,
+                                   summary: str = "", provider: str = None) -> Optional[str]:
+        """Generate a long-form article section by section in parallel.
+        Without sections an outline is requested from the model first."""
+        provider = provider or self.current_provider
+        generator = SectionedGenerator(lambda prompt: self.generate_from_prompt(prompt, provider=provider), provider)
+        return generator.generate_article(
+            topic, lambda title: self.create_multilingual_content_prompt(title, "section", language),
+            sections=sections, language=language, summary=summary)
+    
     def create_multilingual_content_prompt(self, topic: str, content_type: str, language: str) -> str:
         """Create language-specific optimized prompt for local LLM"""
         
@@ -445,18 +776,98 @@ Requisitos:
 
 Cree la sección más detallada y valiosa posible:"""
 
-    def generate_multilingual_blog_post(self, topic: str, language: str = "english") -> Dict:
-        """Generate complete multilingual blog post using local LLM"""
+    def generate_multilingual_blog_post(self, topic: str, language: str = "english", sectioned: bool = False,
+                                        provider: Optional[str] = None) -> Dict:
+        """Generate complete multilingual blog post using local LLM.
+        With sectioned=True the sections are generated in parallel from an outline."""
+        provider = provider or self.current_provider
         
-        print(f"🤖 Generating {language} content with {self.current_provider.upper()}...")
+        print(f"🤖 Generating {language} content with {provider.upper()}...")
         
         # Generate main content
-        content = self.generate_content_with_local_llm(topic, "blog_post", language)
+        if sectioned:
+            content = self.generate_sectioned_content(topic, language, provider=provider)
+        else:
+            content = self.generate_content_with_local_llm(topic, "blog_post", language, provider=provider)
         
         if not content:
             print(f"❌ Failed to generate {language} content with local LLM")
             return None
         
+        return self._build_multilingual_post(topic, language, content, provider)
+    
+    def generate_multilingual_fanout(self, topic: str, languages: List[str], providers: Optional[List[str]] = None,
+                                     research_data: Optional[Dict] = None, use_research: bool = True,
+                                     router=None) -> Dict[str, Optional[Dict]]:
+        """Generate one post per language concurrently from a single research pass.
+        Languages are spread round-robin over the available providers; returns {language: post or None}.
+        With a ProviderRouter each language starts on its provider and is hedged or failed over down the router's chain."""
+        
+        providers = [provider for provider in (providers or [self.current_provider]) if self.is_available(provider)]
+        if not providers:
+            print("❌ No available LLM provider for fan-out generation")
+            return {language: None for language in languages}
+        
+        if research_data is None and use_research and self.web_researcher is not None:
+            try:
+                research_data = self.web_researcher.research_topic_comprehensively(topic)
+            except Exception as e:
+                print(f"⚠️ Research failed, generating without it: {e}")
+        
+        assignments = {language: providers[index % len(providers)] for index, language in enumerate(languages)}
+        print(f"🌍 Generating {len(languages)} languages for '{topic}' on {', '.join(sorted(set(providers)))}")
+        
+        def generate_language(language: str) -> Optional[Dict]:
+            provider = assignments[language]
+            prompt = self._budgeted_prompt(self.create_multilingual_content_prompt(topic, "blog_post", language),
+                                           research_data or {}, topic)
+            if router is None:
+                with self.provider_limits.slot(provider):
+                    content = self.generate_from_prompt(prompt, provider=provider)
+            else:
+                # The router holds the provider slots itself
+                result = router.route(prompt, chain=[provider] + [name for name in router.chain if name != provider])
+                content, provider = result.content, result.provider or provider
+            
+            if not content:
+                print(f"❌ Failed to generate {language} content with {provider}")
+                return None
+            print(f"✅ {language} content generated with {provider}")
+            return self._build_multilingual_post(topic, language, content, provider)
+        
+        with ThreadPoolExecutor(max_workers=len(languages) or 1) as executor:
+            results = list(executor.map(generate_language, languages))
+        return dict(zip(languages, results))
+    
+    def save_local_llm_post(self, post_data: Dict, content_dir: str = "serie 1") -> str:
+        """Save a generated post with its YAML front matter; returns the file path"""
+        import yaml
+        
+        Path(content_dir).mkdir(parents=True, exist_ok=True)
+        yaml_content = yaml.dump(post_data["metadata"], default_flow_style=False, allow_unicode=True)
+        
+        file_path = Path(content_dir) / post_data["filename"]
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(f"---\n{yaml_content}---\n\n{post_data['content'].strip()}\n")
+        
+        return str(file_path)
+    
+    def _budgeted_prompt(self, base_prompt: str, research_data: Dict, topic: str) -> str:
+        """Append the shared research most relevant to the topic that fits the token budget left by the base prompt"""
+        header = "\n\nResearch findings to build on (only cite figures listed here):"
+        budget = self.prompt_budget.remaining(base_prompt + header)
+        packed = self.prompt_budget.pack(research_data, topic, budget, max_per_kind={
+            "statistic": self.research_budget["max_statistics"],
+            "insight": self.research_budget["max_insights"],
+            "article": self.research_budget["max_articles"]
+        })
+        if not packed.text:
+            return base_prompt
+        return base_prompt + header + packed.text
+    
+    def _build_multilingual_post(self, topic: str, language: str, content: str, provider: str) -> Dict:
+        """Wrap generated content with language-specific title, tags and front matter"""
+        
         # Get language configuration for metadata
         lang_config = self.settings_manager.get_language_config(language)
         content_templates = lang_config.content_templates if lang_config else {}
@@ -516,9 +927,9 @@ Cree la sección más detallada y valiosa posible:"""
             "author": "RasaDM AI Research Team",
             "reading_time": f"{random.randint(8, 15)} minutes",
             "seo_keywords": ", ".join(tags[:5]),
-            "generated_by": f"local_llm_{self.current_provider}",
+            "generated_by": f"local_llm_{provider}",
             "cost": "$0.00 (Local Generation)",
-            "model": self.providers[self.current_provider]["model"],
+            "model": self.providers[provider]["model"],
             "language": language,
             "cultural_context": lang_config.cultural_rules.get("cultural_context", "general") if lang_config else "general"
         }
@@ -529,7 +940,7 @@ Cree la sección más detallada y valiosa posible:"""
             "metadata": front_matter,
             "filename": filename,
             "topic": topic,
-            "provider": self.current_provider,
+            "provider": provider,
             "language": language
         }
 
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for research articles.
+Texts are fingerprinted with 64-bit SimHash and looked up in an in-memory
+LSH index that splits fingerprints into bands, so syndicated copies of the
+same story are caught without comparing every pair.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Google News titles end with " - Publisher"; the suffix differs between syndicated copies
+TITLE_SOURCE_SUFFIX = re.compile(r'\s+[-–|]\s+[^-–|]{1,60}$')
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """Split text into overlapping word n-grams; short texts fall back to single words"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return words
+    return [" ".join(words[index:index + size]) for index in range(len(words) - size + 1)]
+
+
+def simhash(text: str, shingle_size: int = 3, bits: int = 64) -> int:
+    """Compute a SimHash fingerprint where similar texts differ in few bits"""
+    weights = [0] * bits
+    for feature in shingles(text, shingle_size):
+        feature_hash = _feature_hash(feature)
+        for bit in range(bits):
+            weights[bit] += 1 if feature_hash >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(first ^ second).count('1')
+
+
+def normalize_title(title: str) -> str:
+    """Strip the publisher suffix that Google News appends to titles"""
+    return TITLE_SOURCE_SUFFIX.sub('', title or '').strip()
+
+
+class SimHashIndex:
+    """LSH index over SimHash fingerprints.
+
+    Fingerprints are split into max_distance + 1 bands; two fingerprints within
+    max_distance bits must agree on at least one band, so only same-band
+    candidates are compared.
+    """
+
+    def __init__(self, max_distance: int = 3, shingle_size: int = 3, bits: int = 64):
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.bits = bits
+
+        band_count = max_distance + 1
+        band_width = -(-bits // band_count)
+        self._bands: List[Tuple[int, int]] = [(start, min(band_width, bits - start))
+                                              for start in range(0, bits, band_width)]
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in self._bands]
+        self._fingerprints: Dict[str, int] = {}
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> start) & ((1 << width) - 1) for start, width in self._bands]
+
+    def fingerprint(self, text: str) -> int:
+        return simhash(text, self.shingle_size, self.bits)
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Return the key of an indexed near-duplicate, or None"""
+        for buckets, band_value in zip(self._buckets, self._band_values(fingerprint)):
+            for key in buckets.get(band_value, ()):
+                if hamming_distance(fingerprint, self._fingerprints[key]) <= self.max_distance:
+                    return key
+        return None
+
+    def add(self, key: str, fingerprint: int):
+        """Index a fingerprint under a key"""
+        self._fingerprints[key] = fingerprint
+        for buckets, band_value in zip(self._buckets, self._band_values(fingerprint)):
+            buckets.setdefault(band_value, set()).add(key)
+
+    def check_and_add(self, key: str, text: str) -> Optional[str]:
+        """Return the key of a near-duplicate if one is indexed; otherwise index the text and return None"""
+        if not text or not text.strip():
+            return None
+
+        fingerprint = self.fingerprint(text)
+        duplicate_of = self.find(fingerprint)
+        if duplicate_of is None:
+            self.add(key, fingerprint)
+        return duplicate_of
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
@@ -5,7 +5,9 @@ Manages multiple content projects with custom keywords, templates, research, and
 """
 
 import os
+import copy
 import json
+import threading
 import time
 import random
 import requests
@@ -14,11 +16,14 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import uuid
 from dataclasses import dataclass, asdict
-from content.auto_content_system import AutoContentSystem
-from core.web_research_content import WebResearchContentGenerator
-from core.local_llm_content import MultilingualLocalLLMContentGenerator
 from content.claude_content import ClaudeContentGenerator
-from core.settings_manager import SettingsManager
+from core.provider_router import ProviderRouter
+from core.batch_runner import BatchItem, BatchRunner, create_stage_limits
+from core.concurrency_limits import get_shared_concurrency_limits
+from core.job_queue import CANCELLED, DONE, FAILED, PENDING, Job, get_shared_job_queue, make_worker_id
+from core.project_store import create_project_store
+from core.services import LazyService, ServiceContainer, get_shared_services
+from functools import partial
 import re
 
 @dataclass
@@ -47,23 +52,48 @@ class ContentProject:
     cultural_context: str = "western_business"  # Cultural context for content
 
 class MultilingualProjectManager:
-    def __init__(self):
+    # Content generators are built on first use and shared with the other subsystems
+    auto_content = LazyService("auto_content")
+    web_research = LazyService("web_research")
+    local_llm = LazyService("local_llm")
+    claude = LazyService("claude")
+    enhanced_research_generator = LazyService("enhanced_research")
+    
+    def __init__(self, services: Optional[ServiceContainer] = None):
+        self.services = services or get_shared_services()
         self.projects_file = "projects.json"
         self.projects_dir = "projects"
         self.projects: Dict[str, ContentProject] = {}
         
+        # Guards project progress and the project store while batch items run in parallel
+        self._lock = threading.RLock()
+        
         # Initialize settings manager
-        self.settings_manager = SettingsManager()
+        self.settings_manager = self.services.get("settings_manager")
         
-        # Initialize content generators
-        self.auto_content = AutoContentSystem()
-        self.web_research = WebResearchContentGenerator()
-        self.local_llm = MultilingualLocalLLMContentGenerator()
-        self.claude = ClaudeContentGenerator()
+        # Project storage: "json" keeps projects.json, "sqlite" updates one row per project
+        # (scripts/utilities/migrate_projects_to_sqlite.py moves existing projects over)
+        backend = os.getenv("PROJECT_STORE") or self.settings_manager.get_setting("project_store", "json")
+        self.project_store = create_project_store(backend, self.projects_file if backend == "json" else None)
         
-        # Initialize enhanced research generator for project-aware prompts
-        from core.enhanced_research_llm import EnhancedResearchLLMGenerator
-        self.enhanced_research_generator = EnhancedResearchLLMGenerator()
+        # Claude requests are hedged with, and fail over to, the local models in the chain
+        self.routing_config = {
+            "claude_chain": ["claude", "deepseek"]
+        }
+        self._claude_models: Dict[str, ClaudeContentGenerator] = {}
+        self._provider_router: Optional[ProviderRouter] = None
+        
+        # Parallel batches: caps per pipeline stage, and per LLM provider shared with the generators
+        self.batch_config = {
+            "max_workers": 8,
+            "max_retry_wait": 300  # Longest a worker waits for a job's retry backoff before the run ends
+        }
+        self.last_batch_stats: Dict = {}
+        self.stage_limits = create_stage_limits()
+        self.provider_limits = get_shared_concurrency_limits()
+        
+        # Durable per-item jobs, so crashed runs resume and several processes can share projects
+        self.job_queue = get_shared_job_queue()
         
         # Load multilingual research sites from config
         self.multilingual_research_sites = self._load_research_sites_config()
@@ -71,38 +101,73 @@ class MultilingualProjectManager:
         self.load_projects()
         self.ensure_directories()
     
+    @property
+    def provider_router(self) -> ProviderRouter:
+        """Router over Claude and the local models, built when the first routed generation needs it"""
+        with self._lock:
+            if self._provider_router is None:
+                providers = {name: partial(self.local_llm.generate_from_prompt, provider=name)
+                             for name in self.local_llm.providers}
+                providers["claude"] = self.claude.generate_content_with_custom_prompt
+                self._provider_router = ProviderRouter(providers, chain=self.routing_config["claude_chain"],
+                                                       is_available=self._provider_available,
+                                                       stage_limits=self.stage_limits)
+            return self._provider_router
+    
     def ensure_directories(self):
         """Create necessary directories"""
         Path(self.projects_dir).mkdir(exist_ok=True)
     
     def load_projects(self):
-        """Load projects from file"""
-        if os.path.exists(self.projects_file):
-            try:
-                with open(self.projects_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for project_id, project_data in data.items():
-                        # Add language and cultural_context if missing (backward compatibility)
-                        if 'language' not in project_data:
-                            project_data['language'] = 'english'
-                        if 'cultural_context' not in project_data:
-                            project_data['cultural_context'] = 'western_business'
-                        
-                        self.projects[project_id] = ContentProject(**project_data)
-            except Exception as e:
-                print(f"Error loading projects: {e}")
+        """Load projects from the project store"""
+        try:
+            data = self.project_store.load_all()
+            for project_id, project_data in data.items():
+                # Add language and cultural_context if missing (backward compatibility)
+                if 'language' not in project_data:
+                    project_data['language'] = 'english'
+                if 'cultural_context' not in project_data:
+                    project_data['cultural_context'] = 'western_business'
+                
+                self.projects[project_id] = ContentProject(**project_data)
+        except Exception as e:
+            print(f"Error loading projects: {e}")
     
     def save_projects(self):
-        """Save projects to file"""
+        """Save all projects to the project store"""
         try:
-            data = {project_id: asdict(project) for project_id, project in self.projects.items()}
-            with open(self.projects_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                data = {project_id: asdict(project) for project_id, project in self.projects.items()}
+                self.project_store.save_all(data)
             return True
         except Exception as e:
             print(f"Error saving projects: {e}")
             return False
     
+    def save_project(self, project: ContentProject):
+        """Save one project; with the SQLite store only its row is rewritten.
+        Stored progress is never rolled back, and the project picks up items counted by other processes."""
+        try:
+            with self._lock:
+                saved = self.project_store.save_project(project.id, asdict(project))
+                project.completed_count = saved["completed_count"]
+            return True
+        except Exception as e:
+            print(f"Error saving project {project.id}: {e}")
+            return False
+    
+    def add_completed(self, project: ContentProject, count: int = 1) -> int:
+        """Count generated items in the project store, so processes sharing a project never overwrite
+        each other's progress; returns the new completed count"""
+        with self._lock:
+            try:
+                project.completed_count = self.project_store.add_completed(project.id, count)
+            except Exception as e:
+                print(f"Error saving progress of project {project.id}: {e}")
+                project.completed_count += count
+                self.save_project(project)
+            return project.completed_count
+    
     def create_project(self, name: str, description: str, keywords: List[str], 
                       content_type: str, target_count: int = 10, 
                       language: str = "english", **kwargs) -> str:
@@ -143,7 +208,7 @@ class MultilingualProjectManager:
         )
         
         self.projects[project_id] = project
-        self.save_projects()
+        self.save_project(project)
         
         print(f"✅ Created {language} project: {name} (ID: {project_id})")
         return project_id
@@ -160,14 +225,15 @@ class MultilingualProjectManager:
         """Update project status"""
         if project_id in self.projects:
             self.projects[project_id].status = status
-            self.save_projects()
+            self.save_project(self.projects[project_id])
     
     def remove_project(self, project_id: str) -> bool:
         """Remove a project completely"""
         try:
             if project_id in self.projects:
                 del self.projects[project_id]
-                self.save_projects()
+                self.project_store.delete_project(project_id)
+                self.job_queue.remove_project(project_id)
                 print(f"🗑️ Project {project_id} removed from system")
                 return True
             else:
@@ -192,17 +258,7 @@ class MultilingualProjectManager:
             return {"error": "Project not found"}
         
         project = self.projects[project_id]
-        
-        # Select topic based on language and project keywords
-        if custom_topic:
-            topic = custom_topic
-        else:
-            if project.language in self.local_llm.multilingual_topics:
-                available_topics = self.local_llm.multilingual_topics[project.language]
-                topic = random.choice(available_topics)
-            else:
-                # Fallback to project keywords
-                topic = random.choice(project.keywords) if project.keywords else "AI Marketing Trends"
+        topic = self._select_topic(project, custom_topic)
         
         print(f"🌍 Generating {project.language} content for: {topic}")
         
@@ -222,29 +278,69 @@ class MultilingualProjectManager:
             print(f"❌ Error generating content: {e}")
             return {"error": str(e)}
     
-    def _generate_with_local_llm(self, project: ContentProject, topic: str) -> Dict:
-        """Generate content using local LLM with language support"""
+    def generate_multilingual_content_set(self, project_id: str, languages: List[str],
+                                          custom_topic: str = None, providers: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Write one topic in several languages for a local LLM project.
+        The languages share one research pass and are generated concurrently, spread over
+        the project's model and any extra providers; returns {language: result}."""
         
-        # Set the LLM provider
-        self.local_llm.set_provider(project.llm_model)
+        if project_id not in self.projects:
+            return {language: {"error": "Project not found"} for language in languages}
         
-        # Generate multilingual content
-        result = self.local_llm.generate_multilingual_blog_post(topic, project.language)
+        project = self.projects[project_id]
+        if project.content_type != "local_llm":
+            return {language: {"error": "Language fan-out needs a local_llm project"} for language in languages}
         
-        if result:
+        topic = self._select_topic(project, custom_topic)
+        try:
+            return self._generate_local_llm_posts(project, topic, languages, providers)
+        except Exception as e:
+            print(f"❌ Error generating content: {e}")
+            return {language: {"error": str(e)} for language in languages}
+    
+    def _select_topic(self, project: ContentProject, custom_topic: str = None) -> str:
+        """Use the custom topic, else a configured topic for the project language, else a project keyword"""
+        if custom_topic:
+            return custom_topic
+        if project.language in self.local_llm.multilingual_topics:
+            return random.choice(self.local_llm.multilingual_topics[project.language])
+        return random.choice(project.keywords) if project.keywords else "AI Marketing Trends"
+    
+    def _generate_with_local_llm(self, project: ContentProject, topic: str) -> Dict:
+        """Generate content using local LLM with language support"""
+        return self._generate_local_llm_posts(project, topic, [project.language])[project.language]
+    
+    def _generate_local_llm_posts(self, project: ContentProject, topic: str, languages: List[str],
+                                  providers: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Generate the topic in each language with the local LLM fan-out and save every post"""
+        
+        posts = self.local_llm.generate_multilingual_fanout(
+            topic, languages, providers=[project.llm_model] + [p for p in providers or [] if p != project.llm_model])
+        
+        results = {}
+        for language in languages:
+            result = posts.get(language)
+            if not result:
+                results[language] = {"error": f"Failed to generate {language} content with local LLM"}
+                continue
+            
             # Save to project directory
-            file_path = self._save_project_content(project, result)
-            result["file_path"] = file_path
+            result["file_path"] = self._save_project_content(project, result)
             result["project_id"] = project.id
-            result["generation_method"] = f"local_llm_{project.llm_model}"
-            
+            result["generation_method"] = f"local_llm_{result['provider']}"
+            results[language] = result
+        
+        saved = sum(1 for result in results.values() if "file_path" in result)
+        if saved:
             # Update project completion count
-            project.completed_count += 1
-            self.save_projects()
-            
-            return result
+            self.add_completed(project, saved)
         
-        return {"error": "Failed to generate content with local LLM"}
+        return results
+    
+    def _save_project_content(self, project: ContentProject, result: Dict) -> str:
+        """Save a generated multilingual post to the project directory"""
+        with self.stage_limits.slot("save"):
+            return self.local_llm.save_local_llm_post(result, project.output_directory)
     
     def _generate_with_template(self, project: ContentProject, topic: str) -> Dict:
         """Generate content using language-specific templates"""
@@ -268,8 +364,7 @@ class MultilingualProjectManager:
             file_path = self._save_template_content(project, content_result, metadata)
             
             # Update project completion count
-            project.completed_count += 1
-            self.save_projects()
+            self.add_completed(project)
             
             return {
                 "title": content_result["title"],
@@ -539,9 +634,12 @@ Create comprehensive, original content."""
                     search_query = f"{keyword} marketing trends 2025"
                     
                     # Simulate research (in real implementation, you'd scrape these sites)
-                    site_data = self.web_research.search_google_news(search_query, max_results=3)
+                    site_data = self.web_research.search_google_news(search_query, max_results=3, resolve_urls=False)
                     
                     if site_data:
+                        # Only the cited articles need their redirects resolved
+                        for article in site_data[:2]:
+                            self.web_research.resolve_article_url(article)
                         research_results["sources"].extend(site_data[:2])
                         
                         # Extract key information
@@ -549,8 +647,6 @@ Create comprehensive, original content."""
                             if article.get("summary"):
                                 research_results["trends"].append(article["summary"][:200])
                     
-                    time.sleep(1)  # Rate limiting
-                    
                 except Exception as e:
                     print(f"⚠️ Research error for {site}: {e}")
                     continue
@@ -778,15 +874,24 @@ Create comprehensive, original content."""
     
     def generate_content_for_project(self, project_id: str, keyword: str = None) -> bool:
         """Generate one piece of content for a project"""
+        return self._generate_content_item(project_id, keyword) is not None
+    
+    def _generate_content_item(self, project_id: str, keyword: str = None, job: Optional[Job] = None) -> Optional[int]:
+        """Generate, save and count one piece of content; returns the project's progress count
+        after this item (the job's item number for queued items), or None on failure.
+        Safe to call from several threads at once."""
         
         project = self.get_project(project_id)
         if not project:
             print(f"❌ Project {project_id} not found")
-            return False
+            return None
         
         if project.completed_count >= project.target_count:
             print(f"✅ Project {project.name} is completed")
-            return False
+            if job is not None:
+                # Nothing is left to generate, so the job is closed instead of retried
+                self.job_queue.cancel(job, "project target reached")
+            return None
         
         # Select keyword
         if not keyword:
@@ -796,9 +901,13 @@ Create comprehensive, original content."""
         print(f"🚀 Generating content for project '{project.name}'")
         print(f"🎯 Keyword: {keyword}")
         
+        # Cached generations are reused only by retries of the same job, never by other items with the same keyword
+        cache_scope = job.id if job is not None else None
+        
         try:
             # Always perform research to get real data and avoid fabrication
-            research_data = self.perform_targeted_research(project, keyword)
+            with self.stage_limits.slot("research"):
+                research_data = self.perform_targeted_research(project, keyword)
             
             # Generate content based on type
             content_data = None
@@ -807,29 +916,27 @@ Create comprehensive, original content."""
                 template = self.generate_custom_template(project, keyword)
                 content_data = self.generate_template_content(project, template)
                 
-            elif project.content_type == "local_llm":
-                self.local_llm.set_provider(project.llm_model)
+            elif project.content_type in ("local_llm", "llama"):
+                # The provider is passed per call so projects on different models can run side by side
                 prompt = self.create_enhanced_prompt(project, keyword, research_data)
-                content = self.local_llm.generate_content_with_local_llm(keyword, "blog_post")
-                if content:
-                    content_data = self.create_content_structure(project, keyword, content)
-                    
-            elif project.content_type == "llama":
-                self.local_llm.set_provider(project.llm_model)
-                prompt = self.create_enhanced_prompt(project, keyword, research_data)
-                content = self.local_llm.generate_content_with_local_llm(keyword, "blog_post")
+                # Provider slot first: items queued for a busy model must not hold llm slots other models could use
+                with self.provider_limits.slot(project.llm_model), self.stage_limits.slot("llm"):
+                    content = self.local_llm.generate_content_with_local_llm(keyword, "blog_post", provider=project.llm_model,
+                                                                            cache_scope=cache_scope)
                 if content:
                     content_data = self.create_content_structure(project, keyword, content)
                     
             elif project.content_type == "research_llm":
                 # Use proper research method that returns compatible format
-                research_data = self.web_research.research_topic_comprehensively(keyword)
+                with self.stage_limits.slot("research"):
+                    research_data = self.web_research.research_topic_comprehensively(keyword)
                 
                 prompt = self.create_enhanced_prompt(project, keyword, research_data)
                 # Use enhanced research generator
-                research_content = self.web_research.generate_seo_optimized_content(
-                    keyword, research_data, [keyword] + project.seo_focus
-                )
+                with self.stage_limits.slot("llm"):
+                    research_content = self.web_research.generate_seo_optimized_content(
+                        keyword, research_data, [keyword] + project.seo_focus
+                    )
                 
                 # Transform research content to expected format
                 if research_content:
@@ -848,41 +955,36 @@ Create comprehensive, original content."""
                     content_data = None
                 
             elif project.content_type == "claude":
-                if not self.claude.test_connection():
-                    print("❌ Claude connection failed")
-                    return False
-                # Set Claude model if specified
-                if project.llm_model.startswith("claude-"):
-                    self.claude.set_model(project.llm_model)
-                
                 # Create language-specific and research-enhanced prompt
                 enhanced_prompt = self.create_enhanced_prompt(project, keyword, research_data)
-                content_data = self.claude.generate_blog_post_with_claude(keyword, custom_prompt=enhanced_prompt)
+                # The router takes the llm stage slot once each provider request holds its provider slot
+                content_data = self._generate_routed(keyword, enhanced_prompt, self._claude_for(project), cache_scope)
                 
             elif project.content_type == "claude_research":
-                if not self.claude.test_connection():
-                    print("❌ Claude connection failed")
-                    return False
-                # Set Claude model if specified
-                if project.llm_model.startswith("claude-"):
-                    self.claude.set_model(project.llm_model)
-                # Perform research first
-                research_data = self.perform_targeted_research(project, keyword)
                 # Generate enhanced prompt with research data
                 prompt = self.create_enhanced_prompt(project, keyword, research_data)
                 # Use Claude with research-enhanced prompt
-                content_data = self.claude.generate_blog_post_with_claude(keyword, custom_prompt=prompt)
+                content_data = self._generate_routed(keyword, prompt, self._claude_for(project), cache_scope)
             
             if content_data:
                 # Save content to project directory
                 filepath = self.save_project_content(project, content_data, keyword)
                 
                 # Update project progress
-                project.completed_count += 1
-                self.save_projects()
+                if job is None:
+                    content_index = self.add_completed(project)
+                else:
+                    with self._lock:
+                        # Completion is idempotent: an item another worker finished first is not counted twice
+                        if not self.job_queue.complete(job, filepath):
+                            print(f"⚠️ Item {job.item_index} was already completed by another worker")
+                            return None
+                        project.completed_count = max(project.completed_count, self.job_queue.counts(project_id)[DONE])
+                        content_index = job.item_index
+                        self.save_project(project)
                 
                 print(f"✅ Content generated: {filepath}")
-                print(f"📊 Progress: {project.completed_count}/{project.target_count}")
+                print(f"📊 Progress: {content_index}/{project.target_count}")
                 
                 # Publish if immediate
                 if project.publishing_schedule == "immediate":
@@ -890,14 +992,47 @@ Create comprehensive, original content."""
                     if success:
                         print(f"🌐 Content published")
                 
-                return True
+                return content_index
             else:
                 print("❌ Content generation failed")
-                return False
+                return None
                 
         except Exception as e:
             print(f"❌ Content generation error: {e}")
-            return False
+            return None
+    
+    def _provider_available(self, provider: str) -> bool:
+        if provider == "claude":
+            return self.claude.is_available()
+        return self.local_llm.is_available(provider)
+    
+    def _claude_for(self, project: ContentProject) -> ClaudeContentGenerator:
+        """Claude generator for the project's model; one copy per model, so projects never switch each other's model"""
+        if not project.llm_model.startswith("claude-"):
+            return self.claude
+        
+        with self._lock:
+            claude = self._claude_models.get(project.llm_model)
+            if claude is None:
+                claude = copy.copy(self.claude)
+                claude.set_model(project.llm_model)
+                self._claude_models[project.llm_model] = claude
+            return claude
+    
+    def _generate_routed(self, keyword: str, prompt: str, claude: Optional[ClaudeContentGenerator] = None,
+                         cache_scope: Optional[str] = None) -> Optional[Dict]:
+        """Generate a Claude post through the provider chain; a slow or failed Claude request is answered locally.
+        With a cache_scope every provider may serve a generation cached for that scope."""
+        claude = claude or self.claude
+        print(f"🤖 Generating blog post via {' → '.join(self.provider_router.chain)}: {keyword}")
+        providers = {"claude": partial(claude.generate_content_with_custom_prompt, cache_scope=cache_scope)}
+        if cache_scope:
+            providers.update({name: partial(self.local_llm.generate_from_prompt, provider=name, cache_scope=cache_scope)
+                              for name in self.local_llm.providers})
+        result = self.provider_router.route(prompt, providers=providers)
+        if not result.content:
+            return None
+        return claude.build_blog_post(keyword, result.content, custom_prompt=prompt, generation_method=result.provider)
     
     def generate_template_content(self, project: ContentProject, template: Dict) -> Dict:
         """Generate content using custom template"""
@@ -976,11 +1111,12 @@ Effective implementation of {keyword} requires careful planning, strategic think
         if isinstance(categories, list) and len(categories) == 1 and "," in categories[0]:
             categories = [cat.strip() for cat in categories[0].split(",")]
         
-        # Generate SEO-optimized featured image
-        featured_image = self.generate_featured_image_for_project(project, keyword)
-        
-        # Add images to content
-        content_with_images = self.add_seo_images_to_content(content_data.get("content", ""), project, keyword)
+        with self.stage_limits.slot("image"):
+            # Generate SEO-optimized featured image
+            featured_image = self.generate_featured_image_for_project(project, keyword)
+            
+            # Add images to content
+            content_with_images = self.add_seo_images_to_content(content_data.get("content", ""), project, keyword)
         
         front_matter = {
             "title": content_data['title'],
@@ -1031,93 +1167,138 @@ Effective implementation of {keyword} requires careful planning, strategic think
 {clean_content}
 """
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        with self.stage_limits.slot("save"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(markdown_content)
         
         return str(filepath)
     
     def run_project(self, project_id: str, batch_size: int = 1):
         """Run a project and generate all content pieces with scheduled publishing queue"""
+        return self.run_projects([project_id]).get(project_id)
+    
+    def run_projects(self, project_ids: List[str], max_workers: int = None) -> Dict[str, List[Dict]]:
+        """Generate the remaining content of several projects concurrently.
+        Items of all projects share one worker pool; returns each started project's publishing queue."""
         
-        project = self.get_project(project_id)
-        if not project:
-            print(f"❌ Project {project_id} not found")
-            return
-        
-        if project.status != "active":
-            print(f"⚠️ Project {project.name} is not active")
-            return
-        
-        print(f"🚀 Starting project '{project.name}'")
-        print(f"📊 Target: {project.target_count} contents")
-        print(f"✅ Completed: {project.completed_count}")
-        
-        # Calculate remaining content to generate
-        remaining_count = project.target_count - project.completed_count
-        print(f"🎯 Remaining: {remaining_count}")
-        
-        if remaining_count <= 0:
-            print(f"✅ Project '{project.name}' is already completed!")
-            return
-        
-        # Generate all remaining content pieces
-        generated_count = 0
-        publishing_queue = []
-        
-        for i in range(remaining_count):
-            if project.completed_count >= project.target_count:
-                break
+        started_ids = []
+        for project_id in project_ids:
+            project = self.get_project(project_id)
+            if not project:
+                print(f"❌ Project {project_id} not found")
+                continue
             
-            print(f"\n📝 Generating content {project.completed_count + 1}/{project.target_count}")
+            if project.status != "active":
+                print(f"⚠️ Project {project.name} is not active")
+                continue
             
-            success = self.generate_content_for_project(project_id)
-            if success:
-                generated_count += 1
-                
-                # Calculate publishing time for this content
-                if project.publishing_schedule != "immediate":
-                    # Calculate scheduled publishing time
-                    base_time = datetime.now()
-                    if i > 0:  # First content publishes immediately, others are scheduled
-                        minutes_delay = i * project.publishing_interval
-                        scheduled_time = base_time + timedelta(minutes=minutes_delay)
-                    else:
-                        scheduled_time = base_time  # First content publishes now
-                    
-                    # Add to publishing queue
-                    publishing_queue.append({
-                        'project_id': project_id,
-                        'content_index': project.completed_count,
-                        'scheduled_time': scheduled_time,
-                        'status': 'queued'
-                    })
-                    
-                    print(f"⏰ Content scheduled for publishing at: {scheduled_time.strftime('%Y-%m-%d %H:%M:%S')}")
-                else:
-                    # Immediate publishing
-                    print(f"📤 Publishing content immediately...")
-                    # TODO: Implement immediate publishing here
+            print(f"🚀 Starting project '{project.name}'")
+            print(f"📊 Target: {project.target_count} contents")
+            print(f"✅ Completed: {project.completed_count}")
             
-            # Reload project to get updated count
+            # Calculate remaining content to generate
+            remaining_count = project.target_count - project.completed_count
+            print(f"🎯 Remaining: {remaining_count}")
+            
+            if remaining_count <= 0:
+                print(f"✅ Project '{project.name}' is already completed!")
+                continue
+            
+            if not project.keywords:
+                # Skipped rather than failing the whole batch
+                print(f"❌ Project '{project.name}' has no keywords, skipping it")
+                continue
+            
+            # Jobs already in the queue (from an earlier or concurrent run) are kept as they are
+            added = self.job_queue.enqueue_project(project_id, project.keywords, project.target_count, project.completed_count)
+            counts = self.job_queue.counts(project_id)
+            print(f"🗂️ Queue: {added} new jobs, {counts[PENDING]} pending, {counts[DONE]} done, {counts[FAILED]} failed")
+            started_ids.append(project_id)
+        
+        if not started_ids:
+            return {}
+        
+        runner = BatchRunner(self._run_job, max_workers=max_workers or self.batch_config["max_workers"])
+        finished = runner.run_from(lambda: self._lease_batch_item(started_ids))
+        self.last_batch_stats = runner.get_stats()
+        if finished:
+            print(f"\n📈 Batch finished: {self.last_batch_stats['completed']} generated, "
+                  f"{self.last_batch_stats['failed']} failed, {self.last_batch_stats['items_per_hour']:.1f} items/hour")
+        
+        publishing_queues = {}
+        for project_id in started_ids:
             project = self.get_project(project_id)
+            succeeded = sorted((item for item in finished if item.project_id == project_id and item.success),
+                               key=lambda item: item.content_index)
+            publishing_queues[project_id] = self._schedule_publishing(project, succeeded)
+            
+            print(f"\n✅ Generated {len(succeeded)} contents for '{project.name}' in this batch")
+            counts = self.job_queue.counts(project_id)
+            if counts[PENDING] or counts[FAILED]:
+                print(f"🗂️ Left in queue: {counts[PENDING]} pending, {counts[FAILED]} failed")
+            
+            if project.completed_count >= project.target_count:
+                with self._lock:
+                    project.status = "completed"
+                    self.save_project(project)
+                print(f"🎉 Project '{project.name}' completed successfully!")
+        
+        return publishing_queues
+    
+    def _lease_batch_item(self, project_ids: List[str]) -> Optional[BatchItem]:
+        """Lease the next job of the projects, waiting out short retry backoffs; None when the run is done"""
+        worker_id = make_worker_id()
+        while True:
+            job = self.job_queue.lease(worker_id, project_ids)
+            if job:
+                return BatchItem(job.project_id, job.keyword, job.item_index, job=job)
             
-            # Brief pause between generations
-            time.sleep(2)
+            wait = self.job_queue.next_retry_in(project_ids)
+            if wait is None or wait > self.batch_config["max_retry_wait"]:
+                return None
+            time.sleep(wait + 0.1)
+    
+    def _run_job(self, item: BatchItem) -> Optional[int]:
+        """Generate a leased item, heartbeating its lease, and hand it back for a retry if it fails"""
+        job = item.job
+        print(f"\n📝 Generating item {job.item_index} of {job.project_id} (attempt {job.attempts})")
+        content_index = None
+        try:
+            with self.job_queue.keep_alive(job):
+                content_index = self._generate_content_item(job.project_id, job.keyword, job=job)
+        finally:
+            if content_index is None:
+                status = self.job_queue.fail(job, "generation failed")
+                if status == PENDING:
+                    print(f"🔁 Item {job.item_index} will be retried")
+                elif status == CANCELLED:
+                    print(f"⏹️ Item {job.item_index} skipped: project target already reached")
+        return content_index
+    
+    def _schedule_publishing(self, project: ContentProject, items: List[BatchItem]) -> List[Dict]:
+        """Queue generated items one publishing interval apart; immediate projects publish as they generate"""
+        if project.publishing_schedule == "immediate":
+            return []
         
-        # Save publishing queue to file
+        # First content publishes now, the others are scheduled
+        base_time = datetime.now()
+        publishing_queue = []
+        for position, item in enumerate(items):
+            scheduled_time = base_time + timedelta(minutes=position * project.publishing_interval)
+            publishing_queue.append({
+                'project_id': project.id,
+                'content_index': item.content_index,
+                'scheduled_time': scheduled_time,
+                'status': 'queued'
+            })
+        
+        # Save publishing queue to file (saving turns the times into strings, so print first)
         if publishing_queue:
-            self.save_publishing_queue(publishing_queue)
             print(f"\n📅 Created publishing queue with {len(publishing_queue)} items")
             print("📋 Publishing Schedule:")
             for item in publishing_queue:
                 print(f"   • Content {item['content_index']}: {item['scheduled_time'].strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        print(f"\n✅ Generated {generated_count} contents in this batch")
-        
-        if project.completed_count >= project.target_count:
-            project.status = "completed"
-            self.save_projects()
-            print(f"🎉 Project '{project.name}' completed successfully!")
+            self.save_publishing_queue(publishing_queue)
         
         return publishing_queue
     
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Storage backends for content projects.
+The JSON backend keeps the projects.json format but writes it atomically
+(temporary file and rename), so readers never see a half-written file. The
+SQLite backend stores one row per project in WAL mode, so a progress update
+rewrites a single row and dashboards can read while workers write.
+
+Several processes working on the same projects should use the SQLite backend.
+The JSON backend rewrites the whole file on every save; it serialises writers
+across processes with an advisory lock on its directory where fcntl exists,
+but on Windows only threads of one process are serialised.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+BACKENDS = ("json", "sqlite")
+
+
+def merge_progress(stored: Optional[Dict], data: Dict) -> Dict:
+    """Keep the higher completed_count, so saving a stale copy of a project never rolls its progress back"""
+    if stored and stored.get("completed_count", 0) > data.get("completed_count", 0):
+        return {**data, "completed_count": stored["completed_count"]}
+    return data
+
+
+class ProjectStore:
+    """Interface of a project storage backend; projects are plain dicts keyed by project ID"""
+
+    def load_all(self) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+    def save_all(self, projects: Dict[str, Dict]):
+        """Replace the stored projects with the given ones"""
+        raise NotImplementedError
+
+    def _update(self, project_id: str, update: Callable[[Optional[Dict]], Dict]) -> Dict:
+        """Atomically replace one stored project (None when absent) with update(stored); returns what was written"""
+        raise NotImplementedError
+
+    def save_project(self, project_id: str, data: Dict) -> Dict:
+        """Insert or update one project; a lower completed_count than the stored one is not written"""
+        return self._update(project_id, lambda stored: merge_progress(stored, data))
+
+    def add_completed(self, project_id: str, count: int = 1) -> int:
+        """Add to a stored project's completed_count in one step; returns the new count"""
+        def update(stored: Optional[Dict]) -> Dict:
+            if stored is None:
+                raise KeyError(f"Unknown project: {project_id}")
+            return {**stored, "completed_count": stored.get("completed_count", 0) + count}
+        return self._update(project_id, update)["completed_count"]
+
+    def delete_project(self, project_id: str):
+        raise NotImplementedError
+
+    def location(self) -> str:
+        raise NotImplementedError
+
+
+class JSONProjectStore(ProjectStore):
+    """All projects in one JSON file, rewritten atomically"""
+
+    def __init__(self, path: str = "projects.json"):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def location(self) -> str:
+        return str(self.path)
+
+    def load_all(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, projects: Dict[str, Dict]):
+        """Write to a temporary file next to the target and rename it into place"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(projects, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @contextmanager
+    def _locked(self):
+        """Serialise writers: threads through the lock, processes through flock on the directory where available.
+        The file itself is replaced on every write, so it cannot carry the lock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self.path.parent), os.O_RDONLY)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)  # Closing releases the lock
+
+    def save_all(self, projects: Dict[str, Dict]):
+        with self._locked():
+            self._write(projects)
+
+    def _update(self, project_id: str, update: Callable[[Optional[Dict]], Dict]) -> Dict:
+        # The file format has no per-project records, so this is a read-modify-write of the whole file
+        with self._locked():
+            projects = self.load_all()
+            data = update(projects.get(project_id))
+            projects[project_id] = data
+            self._write(projects)
+            return data
+
+    def delete_project(self, project_id: str):
+        with self._locked():
+            projects = self.load_all()
+            if projects.pop(project_id, None) is not None:
+                self._write(projects)
+
+
+class SQLiteProjectStore(ProjectStore):
+    """One row per project in SQLite, updated individually"""
+
+    def __init__(self, db_path: str = "projects.sqlite"):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def location(self) -> str:
+        return str(self.db_path)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS projects (
+                    id TEXT PRIMARY KEY,
+                    data TEXT,
+                    updated_at REAL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def load_all(self) -> Dict[str, Dict]:
+        with self._lock:
+            rows = self._connection().execute("SELECT id, data FROM projects ORDER BY rowid").fetchall()
+        return {project_id: json.loads(data) for project_id, data in rows}
+
+    def save_all(self, projects: Dict[str, Dict]):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                placeholders = ', '.join('?' for _ in projects)
+                conn.execute(f"DELETE FROM projects WHERE id NOT IN ({placeholders})", list(projects))
+                conn.executemany(
+                    "INSERT INTO projects (id, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    [(project_id, json.dumps(data, ensure_ascii=False), now) for project_id, data in projects.items()])
+
+    def _update(self, project_id: str, update: Callable[[Optional[Dict]], Dict]) -> Dict:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                # Take the write lock before reading, so another process cannot save in between
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT data FROM projects WHERE id = ?", (project_id,)).fetchone()
+                data = update(json.loads(row[0]) if row else None)
+                conn.execute(
+                    "INSERT INTO projects (id, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    (project_id, json.dumps(data, ensure_ascii=False), time.time()))
+            return data
+
+    def delete_project(self, project_id: str):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+
+
+def create_project_store(backend: str = "json", path: Optional[str] = None) -> ProjectStore:
+    """Build the configured backend, at its default location unless a path is given"""
+    if backend == "sqlite":
+        return SQLiteProjectStore(path or "projects.sqlite")
+    if backend == "json":
+        return JSONProjectStore(path or "projects.json")
+    raise ValueError(f"Unknown project store backend: {backend} (expected one of {', '.join(BACKENDS)})")
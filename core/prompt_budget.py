@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Token budgeting for research-backed prompts.
+Research snippets are ranked by relevance to the keyword and packed greedily
+into the input-token budget left after the prompt's fixed instructions, so
+prompts stay a predictable size for local prefill and Claude billing.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Average characters per token for Latin-script text; other scripts tokenize denser
+CHARS_PER_TOKEN = {
+    "claude": 3.5,
+    "default": 4.0,
+}
+NON_LATIN_CHARS_PER_TOKEN = 1.5
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Section headers and per-item limits of the rendered research context
+SNIPPET_SECTIONS = [
+    ("insight", "\n🔍 VERIFIED MARKET INSIGHTS:\n"),
+    ("statistic", "\n📊 VERIFIED DATA POINTS:\n"),
+    ("article", "\n📰 CURRENT INDUSTRY SOURCES:\n"),
+]
+
+# Statistics carry the facts the prompts insist on, so they win ties
+KIND_WEIGHTS = {"statistic": 0.3, "insight": 0.2, "article": 0.0}
+
+
+def estimate_tokens(text: str, provider: str = "default") -> int:
+    """Approximate a provider's token count for text without a tokenizer"""
+    if not text:
+        return 0
+    chars_per_token = CHARS_PER_TOKEN.get(provider, CHARS_PER_TOKEN["default"])
+    non_latin = sum(1 for char in text if ord(char) > 0x24F)
+    latin = len(text) - non_latin
+    return int(latin / chars_per_token + non_latin / NON_LATIN_CHARS_PER_TOKEN) + 1
+
+
+def _clean(text: Any, limit: int) -> str:
+    return str(text).replace('<', '').replace('>', '').replace('…', '...')[:limit]
+
+
+@dataclass
+class ResearchSnippet:
+    """One rankable line of research context"""
+    kind: str
+    text: str
+    score: float = 0.0
+    tokens: int = 0
+
+
+@dataclass
+class PackedContext:
+    """Research context that fits the budget, with what was left out"""
+    text: str
+    tokens: int
+    used: List[ResearchSnippet] = field(default_factory=list)
+    dropped: List[ResearchSnippet] = field(default_factory=list)
+
+
+def research_snippets(research_data: Dict[str, Any]) -> List[ResearchSnippet]:
+    """Flatten research data into snippets in the formats the prompts use"""
+    snippets = [ResearchSnippet("insight", _clean(insight, 200)) for insight in research_data.get('key_insights', [])]
+
+    for stat in research_data.get('statistics', []):
+        value = stat.get('value', 'Market trend')
+        snippets.append(ResearchSnippet("statistic", f"{value}: {_clean(stat.get('context', 'industry development'), 150)}"))
+
+    for article in research_data.get('articles', []):
+        title = _clean(article.get('title', 'Industry Report'), 80)
+        snippets.append(ResearchSnippet("article", f"{title}: {_clean(article.get('description', 'Current analysis'), 150)}"))
+
+    return [snippet for snippet in snippets if snippet.text.strip()]
+
+
+def score_snippet(snippet: ResearchSnippet, keyword: str) -> float:
+    """Relevance of a snippet to the keyword: share of keyword terms present, plus an exact-phrase bonus"""
+    text = snippet.text.lower()
+    terms = set(WORD_PATTERN.findall(keyword.lower()))
+    words = set(WORD_PATTERN.findall(text))
+
+    score = len(terms & words) / len(terms) if terms else 0.0
+    if keyword and keyword.lower() in text:
+        score += 1.0
+    return score + KIND_WEIGHTS.get(snippet.kind, 0.0)
+
+
+class PromptBudget:
+    """Packs the most relevant research into a provider's input-token budget"""
+
+    def __init__(self, max_input_tokens: int = 6000, provider: str = "claude"):
+        self.max_input_tokens = max_input_tokens
+        self.provider = provider
+
+    def count(self, text: str) -> int:
+        return estimate_tokens(text, self.provider)
+
+    def remaining(self, base_prompt: str) -> int:
+        """Tokens left for research once the fixed prompt text is counted"""
+        return max(0, self.max_input_tokens - self.count(base_prompt))
+
+    def pack(self, research_data: Dict[str, Any], keyword: str, budget_tokens: int,
+             max_per_kind: Optional[Dict[str, int]] = None) -> PackedContext:
+        """Choose the highest-scoring snippets that fit and render them grouped by kind"""
+        snippets = research_snippets(research_data)
+        for snippet in snippets:
+            snippet.score = score_snippet(snippet, keyword)
+            snippet.tokens = self.count(snippet.text) + 2  # Numbering and newline
+
+        # Stable sort keeps the research order among equally relevant snippets
+        ranked = sorted(snippets, key=lambda snippet: snippet.score, reverse=True)
+
+        used, dropped = [], []
+        per_kind: Dict[str, int] = {}
+        spent = 0
+        for snippet in ranked:
+            header_cost = 0 if per_kind.get(snippet.kind) else self.count(dict(SNIPPET_SECTIONS)[snippet.kind])
+            within_cap = max_per_kind is None or per_kind.get(snippet.kind, 0) < max_per_kind.get(snippet.kind, len(ranked))
+            if within_cap and spent + header_cost + snippet.tokens <= budget_tokens:
+                used.append(snippet)
+                per_kind[snippet.kind] = per_kind.get(snippet.kind, 0) + 1
+                spent += header_cost + snippet.tokens
+            else:
+                dropped.append(snippet)
+
+        text = ""
+        for kind, header in SNIPPET_SECTIONS:
+            chosen = [snippet for snippet in used if snippet.kind == kind]
+            if chosen:
+                text += header + "".join(f"{index}. {snippet.text}\n" for index, snippet in enumerate(chosen, 1))
+
+        return PackedContext(text, self.count(text), used, dropped)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Provider health registry for LLM backends.
+Health is cached for a TTL instead of probed before every request, real
+request outcomes update it passively, and a circuit breaker stops sending work
+to a provider after repeated failures until a cool-down has passed.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class ProviderHealth:
+    """Health state of one provider"""
+    provider: str
+    healthy: Optional[bool] = None
+    checked_at: float = 0.0
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    circuit: str = CLOSED
+    opened_at: float = 0.0
+    last_error: str = ""
+
+
+class ProviderHealthRegistry:
+    """TTL-cached provider health with a per-provider circuit breaker"""
+
+    def __init__(self, ttl_seconds: float = 300.0, failure_threshold: int = 3, reset_timeout: float = 120.0):
+        self.ttl_seconds = ttl_seconds  # How long a known state is trusted without probing
+        self.failure_threshold = failure_threshold  # Consecutive failures that open the circuit
+        self.reset_timeout = reset_timeout  # Seconds an open circuit waits before allowing a trial
+
+        self._providers: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def _health(self, provider: str) -> ProviderHealth:
+        health = self._providers.get(provider)
+        if health is None:
+            health = ProviderHealth(provider)
+            self._providers[provider] = health
+        return health
+
+    def _claim(self, provider: str) -> Optional[bool]:
+        """Decide availability from cached state; None means a probe is needed"""
+        now = time.time()
+        with self._lock:
+            health = self._health(provider)
+
+            if health.circuit in (OPEN, HALF_OPEN):
+                if now - health.opened_at < self.reset_timeout:
+                    return False
+                # Let one trial request through; the timer is re-armed in case it never reports back
+                health.circuit = HALF_OPEN
+                health.opened_at = now
+                return True
+
+            # Failures below the threshold are probed again rather than trusted for the whole TTL
+            if health.healthy and now - health.checked_at < self.ttl_seconds:
+                return True
+            return None
+
+    def is_available(self, provider: str, probe: Optional[Callable[[], bool]] = None) -> bool:
+        """Return whether work should be sent to a provider, probing only when the cached state expired"""
+        available = self._claim(provider)
+        if available is not None:
+            return available
+
+        if probe is None:
+            return True
+
+        try:
+            healthy = bool(probe())
+        except Exception as e:
+            healthy = False
+            self.record_failure(provider, str(e))
+            return False
+
+        if healthy:
+            self.record_success(provider)
+        else:
+            self.record_failure(provider, "health probe failed")
+        return healthy
+
+    def record_success(self, provider: str):
+        """Record a successful request; closes the circuit"""
+        with self._lock:
+            health = self._health(provider)
+            health.healthy = True
+            health.checked_at = time.time()
+            health.consecutive_failures = 0
+            health.successes += 1
+            if health.circuit != CLOSED:
+                print(f"✅ {provider} recovered, circuit closed")
+            health.circuit = CLOSED
+
+    def record_failure(self, provider: str, error: str = ""):
+        """Record a failed request; opens the circuit after repeated failures or a failed trial"""
+        with self._lock:
+            health = self._health(provider)
+            now = time.time()
+            health.healthy = False
+            health.checked_at = now
+            health.consecutive_failures += 1
+            health.failures += 1
+            health.last_error = error
+
+            if health.circuit == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                if health.circuit != OPEN:
+                    print(f"🚫 {provider} circuit open after {health.consecutive_failures} failures; "
+                          f"retrying in {self.reset_timeout:.0f}s")
+                health.circuit = OPEN
+                health.opened_at = now
+
+    def state(self, provider: str) -> str:
+        """Current circuit state of a provider"""
+        with self._lock:
+            health = self._health(provider)
+            if health.circuit == OPEN and time.time() - health.opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return health.circuit
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Health snapshot of every known provider"""
+        with self._lock:
+            return {provider: asdict(health) for provider, health in self._providers.items()}
+
+    def reset(self, provider: Optional[str] = None):
+        """Forget cached health for one provider, or all of them"""
+        with self._lock:
+            if provider is None:
+                self._providers.clear()
+            else:
+                self._providers.pop(provider, None)
+
+
+_shared_registry: Optional[ProviderHealthRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_health_registry() -> ProviderHealthRegistry:
+    """Return the process-wide provider health registry"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ProviderHealthRegistry()
+        return _shared_registry
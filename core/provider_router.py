@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Provider routing for LLM generation.
+A prompt goes to the first available provider of a chain. If it is still
+running after a hedge delay, the next provider is started as well and the
+first usable answer wins; failures move down the chain. The hedge delay is
+tuned from each provider's observed latency percentiles and counted from the
+moment the request gets its provider slot, so queueing is not mistaken for a
+slow provider.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from core.concurrency_limits import ConcurrencyLimits, get_shared_concurrency_limits
+from core.provider_health import get_shared_health_registry
+
+
+class LatencyTracker:
+    """Sliding window of successful generation latencies per provider"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(provider, deque(maxlen=self.window)).append(seconds)
+
+    def count(self, provider: str) -> int:
+        with self._lock:
+            return len(self._samples.get(provider, ()))
+
+    def percentile(self, provider: str, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the provider's recent latencies, None without samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        rank = max(0, min(len(samples) - 1, math.ceil(pct / 100 * len(samples)) - 1))
+        return samples[rank]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p90/p95 latency and sample count per provider"""
+        with self._lock:
+            providers = list(self._samples)
+        return {provider: {"count": self.count(provider),
+                           "p50": self.percentile(provider, 50),
+                           "p90": self.percentile(provider, 90),
+                           "p95": self.percentile(provider, 95)}
+                for provider in providers}
+
+
+@dataclass
+class _Attempt:
+    """One provider request of a route; started is set once the request holds its provider slot"""
+    provider: str
+    started: threading.Event = field(default_factory=threading.Event)
+    started_at: float = 0.0
+
+
+@dataclass
+class RouteResult:
+    """Outcome of one routed generation"""
+    content: Optional[str]
+    provider: Optional[str] = None
+    seconds: float = 0.0
+    hedged: bool = False
+    attempted: List[str] = field(default_factory=list)
+
+
+class ProviderRouter:
+    """Hedged, failover generation over a chain of providers"""
+
+    def __init__(self, providers: Dict[str, Callable[[str], Optional[str]]], chain: Optional[List[str]] = None,
+                 is_available: Optional[Callable[[str], bool]] = None, limits: Optional[ConcurrencyLimits] = None,
+                 stage_limits: Optional[ConcurrencyLimits] = None, stage: str = "llm"):
+        self.providers = providers
+        self.chain = chain or list(providers)
+        self.is_available = is_available or get_shared_health_registry().is_available
+        self.limits = limits or get_shared_concurrency_limits()
+        # Optional pipeline stage cap, taken after the provider slot so a busy provider holds no stage slot
+        self.stage_limits = stage_limits
+        self.stage = stage
+        self.latency = LatencyTracker()
+
+        self.config = {
+            "hedging": True,
+            "hedge_delay_seconds": 300.0,  # Delay before a provider has enough samples, above a full-length Claude article; None waits for samples
+            "hedge_percentile": 95,  # Hedge once a request is slower than this share of recent ones
+            "min_samples": 5,
+            "min_hedge_delay": 10.0,
+            "max_hedge_delay": 600.0,
+            "max_in_flight": 2,  # Primary plus one hedge
+            "slot_poll_seconds": 0.5  # How often a queued request is checked for having started
+        }
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """Seconds to wait on a running provider request before hedging; None means don't hedge yet"""
+        delay = self.config["hedge_delay_seconds"]
+        if self.latency.count(provider) >= self.config["min_samples"]:
+            delay = self.latency.percentile(provider, self.config["hedge_percentile"])
+        if delay is None:
+            return None
+        return max(self.config["min_hedge_delay"], min(self.config["max_hedge_delay"], delay))
+
+    def _call(self, attempt: _Attempt, generate: Callable[[str], Optional[str]], prompt: str) -> Optional[str]:
+        provider = attempt.provider
+        stage_slot = self.stage_limits.slot(self.stage) if self.stage_limits is not None else nullcontext()
+        with self.limits.slot(provider), stage_slot:
+            started = time.time()
+            attempt.started_at = started
+            attempt.started.set()
+            try:
+                content = generate(prompt)
+            except Exception as e:
+                print(f"❌ {provider} generation error: {e}")
+                return None
+        # Losers are recorded too, so a provider that keeps losing races still gets measured
+        if content:
+            self.latency.record(provider, time.time() - started)
+        return content
+
+    def route(self, prompt: str, chain: Optional[List[str]] = None,
+              providers: Optional[Dict[str, Callable[[str], Optional[str]]]] = None) -> RouteResult:
+        """Generate with the first provider to return content, hedging slow ones and failing over on errors.
+        providers overrides the generation function of chain entries for this call only."""
+        started = time.time()
+        generators = {**self.providers, **(providers or {})}
+        remaining = [provider for provider in (chain or self.chain) if provider in generators]
+        result = RouteResult(content=None)
+        pending: Dict[Future, str] = {}
+        latest: Optional[_Attempt] = None
+        # Each route has its own workers, so requests that lost a race cannot hold up other routes
+        executor = ThreadPoolExecutor(max_workers=self.config["max_in_flight"], thread_name_prefix="provider-router")
+
+        def launch() -> bool:
+            """Start the next available provider; availability is checked only when it is needed"""
+            nonlocal latest
+            while remaining:
+                provider = remaining.pop(0)
+                if not self.is_available(provider):
+                    print(f"⏭️ Skipping unavailable provider {provider}")
+                    continue
+                result.attempted.append(provider)
+                latest = _Attempt(provider)
+                pending[executor.submit(self._call, latest, generators[provider], prompt)] = provider
+                return True
+            return False
+
+        def hedge_wait() -> Tuple[Optional[float], bool]:
+            """Seconds to wait before the next check, and whether the latest request is due a hedge by then"""
+            if not (self.config["hedging"] and remaining and len(pending) < self.config["max_in_flight"]):
+                return None, False
+            if not latest.started.is_set():
+                # Still queued for its provider slot, so its hedge timer has not started
+                return self.config["slot_poll_seconds"], False
+            delay = self.hedge_delay(latest.provider)
+            if delay is None:
+                return None, False
+            return max(0.0, latest.started_at + delay - time.time()), True
+
+        try:
+            if not launch():
+                print("❌ No available provider in the chain")
+                return result
+
+            while pending:
+                timeout, hedge_due = hedge_wait()
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    if hedge_due:
+                        print(f"⏱️ {', '.join(pending.values())} still running, hedging with the next provider")
+                        result.hedged = launch() or result.hedged
+                    continue
+
+                for future in done:
+                    provider = pending.pop(future)
+                    content = future.result()
+                    if content:
+                        result.content = content
+                        result.provider = provider
+                        result.seconds = time.time() - started
+                        print(f"🏁 {provider} answered in {result.seconds:.1f}s")
+                        return result
+                    print(f"⚠️ {provider} failed")
+
+                # Fail over as soon as nothing is left running
+                if not pending and remaining:
+                    print("🔀 Failing over to the next provider")
+                    launch()
+        finally:
+            # Requests that lost the race finish in the background
+            executor.shutdown(wait=False)
+
+        result.seconds = time.time() - started
+        print(f"❌ All providers failed: {', '.join(result.attempted)}")
+        return result
+
+    def generate(self, prompt: str, chain: Optional[List[str]] = None) -> Optional[str]:
+        """Routed generation returning only the content"""
+        return self.route(prompt, chain).content
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Latency percentiles and current hedge delay per provider"""
+        summary = self.latency.summary()
+        for provider, stats in summary.items():
+            stats["hedge_delay"] = self.hedge_delay(provider)
+        return summary
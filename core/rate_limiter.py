@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Per-host token-bucket rate limiting for outbound HTTP requests.
+Each host gets its own bucket, so slow hosts never hold back fast ones.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# Requests per second and burst size for hosts that need gentler treatment
+DEFAULT_HOST_LIMITS: Dict[str, Tuple[float, int]] = {
+    "news.google.com": (0.5, 3),
+}
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of blocking"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(rate, 0.001)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._last:
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+            self._tokens -= 1
+            wait = max(0.0, self._last - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def pause_for(self, seconds: float):
+        """Stop handing out tokens for the given number of seconds"""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._last:
+                self._last = resume_at
+                self._tokens = min(self._tokens, 1.0)
+
+
+class HostRateLimiter:
+    """Shared rate limiter keyed by hostname, aware of 429 and Retry-After"""
+
+    def __init__(self, default_rate: float = 2.0, default_burst: int = 4,
+                 host_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_backoff: float = 10.0, max_retry_after: float = 120.0):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.default_backoff = default_backoff  # Used when a 429 carries no Retry-After
+        self.max_retry_after = max_retry_after  # Longer waits are not worth retrying
+        self.host_limits = dict(DEFAULT_HOST_LIMITS)
+        if host_limits:
+            self.host_limits.update(host_limits)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        """Normalize a URL to the hostname used as the bucket key"""
+        return (urlparse(url).hostname or url).lower()
+
+    def configure_host(self, host: str, rate: float, burst: int):
+        """Set the rate and burst for one host, replacing any existing bucket"""
+        host = host.lower()
+        with self._lock:
+            self.host_limits[host] = (rate, burst)
+            self._buckets[host] = TokenBucket(rate, burst)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.host_limits.get(host, (self.default_rate, self.default_burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot without blocking; returns seconds to wait before sending"""
+        return self._bucket(self.host_for(url)).reserve()
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the URL's host is allowed; returns seconds waited"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, url: str, retry_after: Optional[float] = None) -> float:
+        """Back off a host after it told us to slow down; returns the delay the server asked for.
+        The host is paused for at most max_retry_after, so one huge Retry-After cannot stall
+        every later request to it; callers give up on requests whose delay exceeds that."""
+        delay = self.default_backoff if retry_after is None else retry_after
+        self._bucket(self.host_for(url)).pause_for(min(delay, self.max_retry_after))
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given as seconds or an HTTP date"""
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def update_from_response(self, url: str, response) -> Optional[float]:
+        """Apply throttling signals from a response; returns the backoff delay if one was applied"""
+        retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+
+        if response.status_code == 429 or (response.status_code == 503 and retry_after is not None):
+            return self.penalize(url, retry_after)
+
+        return None
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide rate limiter used by the research path"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter()
+        return _shared_limiter
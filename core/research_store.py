@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Persistent research store shared by every project and run.
+Search results are kept per query and scraped articles per URL, each with a
+freshness timestamp, so overlapping keywords reuse earlier research.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Hours before stored research is considered stale
+DEFAULT_MAX_AGE_HOURS = {
+    "query": 24,
+    "article": 7 * 24,
+    "insights": 24,
+}
+
+
+class ResearchStore:
+    """SQLite store for search results, scraped articles, statistics and insights"""
+
+    def __init__(self, db_path: str = "cache/research_store.sqlite", max_age_hours: Optional[Dict[str, float]] = None):
+        self.db_path = Path(db_path)
+        self.max_age_hours = dict(DEFAULT_MAX_AGE_HOURS)
+        if max_age_hours:
+            self.max_age_hours.update(max_age_hours)
+
+        self.fts_enabled = False
+        self.stats = {"query_hits": 0, "query_misses": 0, "article_hits": 0, "article_misses": 0}
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database and create the schema on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS queries (
+                    query TEXT PRIMARY KEY,
+                    result_limit INTEGER,
+                    fetched_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS search_results (
+                    query TEXT,
+                    position INTEGER,
+                    google_news_url TEXT,
+                    url TEXT,
+                    title TEXT,
+                    description TEXT,
+                    published TEXT,
+                    source TEXT,
+                    PRIMARY KEY (query, position)
+                );
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    content TEXT,
+                    scraped_at TEXT,
+                    fetched_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS statistics (
+                    url TEXT,
+                    value TEXT,
+                    context TEXT,
+                    type TEXT,
+                    number REAL,
+                    unit TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_statistics_url ON statistics(url);
+                CREATE TABLE IF NOT EXISTS insights (
+                    topic TEXT PRIMARY KEY,
+                    insights TEXT,
+                    fetched_at REAL
+                );
+            """)
+
+            try:
+                conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS research_fts USING fts5(url UNINDEXED, title, body)")
+                self.fts_enabled = True
+            except sqlite3.OperationalError:
+                print("⚠️ SQLite FTS5 not available, research search falls back to LIKE")
+
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _is_fresh(self, fetched_at: float, kind: str, max_age_hours: Optional[float] = None) -> bool:
+        hours = self.max_age_hours[kind] if max_age_hours is None else max_age_hours
+        return time.time() - fetched_at <= hours * 3600
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _index(self, conn: sqlite3.Connection, url: str, title: str, body: str):
+        """Keep the full-text index in step with stored rows"""
+        if self.fts_enabled:
+            conn.execute("DELETE FROM research_fts WHERE url = ? AND title = ?", (url, title))
+            conn.execute("INSERT INTO research_fts (url, title, body) VALUES (?, ?, ?)", (url, title, body))
+
+    def get_search_results(self, query: str, max_results: int, max_age_hours: Optional[float] = None) -> Optional[List[Dict]]:
+        """Return stored search results for a query if fresh and complete enough, else None"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT result_limit, fetched_at FROM queries WHERE query = ?", (query,)).fetchone()
+            if row is None or row[0] < max_results or not self._is_fresh(row[1], "query", max_age_hours):
+                self._count("query_misses")
+                return None
+
+            results = conn.execute(
+                "SELECT google_news_url, url, title, description, published, source FROM search_results "
+                "WHERE query = ? ORDER BY position LIMIT ?", (query, max_results)).fetchall()
+
+        self._count("query_hits")
+        return [{
+            'title': title,
+            'url': url,
+            'google_news_url': google_news_url,
+            'resolved': url != google_news_url,
+            'published': published,
+            'description': description,
+            'source': source
+        } for google_news_url, url, title, description, published, source in results]
+
+    def save_search_results(self, query: str, articles: List[Dict], max_results: int):
+        """Replace the stored results for a query"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM search_results WHERE query = ?", (query,))
+            conn.executemany(
+                "INSERT INTO search_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(query, position, article.get('google_news_url', article['url']), article['url'],
+                  article.get('title', ''), article.get('description', ''), article.get('published', ''),
+                  article.get('source', ''))
+                 for position, article in enumerate(articles)])
+            conn.execute("INSERT OR REPLACE INTO queries VALUES (?, ?, ?)", (query, max_results, time.time()))
+            for article in articles:
+                self._index(conn, article.get('google_news_url', article['url']), article.get('title') or '',
+                            article.get('description') or '')
+            conn.commit()
+
+    def get_article(self, url: str, max_age_hours: Optional[float] = None) -> Optional[Dict]:
+        """Return a stored scraped article with its statistics if fresh, else None"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT content, scraped_at, fetched_at FROM articles WHERE url = ?", (url,)).fetchone()
+            if row is None or not self._is_fresh(row[2], "article", max_age_hours):
+                self._count("article_misses")
+                return None
+
+            statistics = conn.execute("SELECT value, context, type, number, unit FROM statistics WHERE url = ?",
+                                      (url,)).fetchall()
+
+        self._count("article_hits")
+        return {
+            'url': url,
+            'content': row[0],
+            'statistics': [{'value': value, 'context': context, 'type': stat_type, 'number': number, 'unit': unit}
+                           for value, context, stat_type, number, unit in statistics],
+            'scraped_at': row[1]
+        }
+
+    def save_article(self, scraped: Dict):
+        """Store a scraped article and its statistics"""
+        url = scraped['url']
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?)",
+                         (url, scraped.get('content', ''), scraped.get('scraped_at', ''), time.time()))
+            conn.execute("DELETE FROM statistics WHERE url = ?", (url,))
+            conn.executemany("INSERT INTO statistics VALUES (?, ?, ?, ?, ?, ?)",
+                             [(url, stat.get('value'), stat.get('context'), stat.get('type'),
+                               stat.get('number'), stat.get('unit'))
+                              for stat in scraped.get('statistics', [])])
+            self._index(conn, url, '', scraped.get('content', ''))
+            conn.commit()
+
+    def get_insights(self, topic: str, max_age_hours: Optional[float] = None) -> Optional[List[str]]:
+        """Return stored insights for a topic if fresh, else None"""
+        with self._lock:
+            row = self._connection().execute("SELECT insights, fetched_at FROM insights WHERE topic = ?",
+                                             (topic.lower(),)).fetchone()
+        if row is None or not self._is_fresh(row[1], "insights", max_age_hours):
+            return None
+        return json.loads(row[0])
+
+    def save_insights(self, topic: str, insights: List[str]):
+        """Store the insights derived for a topic"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO insights VALUES (?, ?, ?)",
+                         (topic.lower(), json.dumps(insights, ensure_ascii=False), time.time()))
+            conn.commit()
+
+    def search(self, text: str, limit: int = 20) -> List[Dict]:
+        """Full-text search over stored titles, descriptions and article bodies"""
+        with self._lock:
+            conn = self._connection()
+            if self.fts_enabled:
+                terms = " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+                if not terms:
+                    return []
+                rows = conn.execute(
+                    "SELECT url, title, snippet(research_fts, 2, '', '', '...', 24) FROM research_fts "
+                    "WHERE research_fts MATCH ? ORDER BY rank LIMIT ?", (terms, limit)).fetchall()
+            else:
+                pattern = f"%{text}%"
+                rows = conn.execute(
+                    "SELECT url, title, substr(description, 1, 200) FROM search_results "
+                    "WHERE title LIKE ? OR description LIKE ? "
+                    "UNION SELECT url, '', substr(content, 1, 200) FROM articles WHERE content LIKE ? LIMIT ?",
+                    (pattern, pattern, pattern, limit)).fetchall()
+
+        return [{'url': url, 'title': title, 'snippet': snippet} for url, title, snippet in rows]
+
+    def get_stats(self) -> Dict:
+        """Return reuse counters and row counts"""
+        with self._lock:
+            stats = dict(self.stats)
+            conn = self._connection()
+            stats["queries"] = conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+            stats["articles"] = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        return stats
+
+
+_shared_store: Optional[ResearchStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_research_store() -> ResearchStore:
+    """Return the process-wide research store"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ResearchStore()
+        return _shared_store
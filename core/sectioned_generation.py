@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Section-parallel generation for long-form articles.
+An outline is built first, then every section is generated concurrently
+(bounded per provider) with a shared context summary so sections do not
+overlap, and the results are stitched back together in outline order.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from core.concurrency_limits import ConcurrencyLimits, get_shared_concurrency_limits
+
+# Used when the model does not return a usable outline
+DEFAULT_SECTIONS = [
+    "Current State of {topic}",
+    "Key Trends and Technologies",
+    "Implementation Strategies and Best Practices",
+    "Case Studies and Real-World Examples",
+    "Challenges and Solutions",
+    "Future Outlook",
+]
+
+# Numbered, bulleted or markdown heading lines of an outline
+OUTLINE_LINE = re.compile(r'^\s*(?:#{1,6}\s+|\d+[.)]\s+|[-*•]\s+)(.+?)\s*$')
+
+
+def parse_outline(text: str, max_sections: int = 8) -> List[str]:
+    """Extract section headings from a model's outline response"""
+    sections = []
+    for line in (text or "").splitlines():
+        match = OUTLINE_LINE.match(line)
+        if match:
+            heading = match.group(1).strip().strip('*').strip()
+            if heading and heading not in sections:
+                sections.append(heading)
+    return sections[:max_sections]
+
+
+def create_outline_prompt(topic: str, language: str = "english", section_count: int = 6) -> str:
+    """Ask for section headings only, one per line"""
+    return f"""Create an outline for a comprehensive marketing blog post about "{topic}".
+
+Return exactly {section_count} section headings in {language}, one per line, as a numbered list.
+Do not include an introduction, a conclusion or any other text."""
+
+
+def create_section_context(topic: str, sections: List[str], index: int, summary: str = "") -> str:
+    """Shared context given to every section so they fit together without repeating each other"""
+    outline = "\n".join(f"{number}. {title}" for number, title in enumerate(sections, 1))
+    context = f"""
+
+Context: this is section {index + 1} of {len(sections)} of an article about "{topic}".
+Full outline:
+{outline}
+
+Write only the body of "{sections[index]}". Do not add an introduction or conclusion for the whole
+article, do not repeat the section heading, and leave topics covered by other sections to them."""
+    if summary:
+        context += f"\n\nKey facts for the whole article:\n{summary}"
+    return context
+
+
+class SectionedGenerator:
+    """Generate article sections concurrently on one provider and stitch them in order"""
+
+    def __init__(self, generate: Callable[[str], Optional[str]], provider: str,
+                 limits: Optional[ConcurrencyLimits] = None, max_workers: int = 8):
+        self.generate = generate
+        self.provider = provider
+        self.limits = limits or get_shared_concurrency_limits()
+        self.max_workers = max_workers
+
+    def _generate_limited(self, prompt: str) -> Optional[str]:
+        with self.limits.slot(self.provider):
+            return self.generate(prompt)
+
+    def build_outline(self, topic: str, language: str = "english", section_count: int = 6) -> List[str]:
+        """Ask the model for section headings, falling back to the default outline"""
+        sections = parse_outline(self._generate_limited(create_outline_prompt(topic, language, section_count)) or "",
+                                 max_sections=section_count)
+        if len(sections) < 2:
+            print("⚠️ No usable outline returned, using the default sections")
+            sections = [title.format(topic=topic) for title in DEFAULT_SECTIONS[:section_count]]
+        return sections
+
+    def generate_sections(self, topic: str, sections: List[str], section_prompt: Callable[[str], str],
+                          summary: str = "") -> List[Optional[str]]:
+        """Generate every section concurrently; results keep outline order, failed sections are None"""
+        prompts = [section_prompt(title) + create_section_context(topic, sections, index, summary)
+                   for index, title in enumerate(sections)]
+
+        print(f"🧩 Generating {len(sections)} sections with {self.provider} "
+              f"(up to {self.limits.limit_for(self.provider)} at once)")
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(prompts)) or 1) as executor:
+            return list(executor.map(self._generate_limited, prompts))
+
+    def generate_article(self, topic: str, section_prompt: Callable[[str], str], sections: Optional[List[str]] = None,
+                         language: str = "english", summary: str = "") -> Optional[str]:
+        """Build the outline if needed, generate all sections and join them as markdown"""
+        sections = sections or self.build_outline(topic, language)
+        bodies = self.generate_sections(topic, sections, section_prompt, summary)
+
+        failed = [title for title, body in zip(sections, bodies) if not body]
+        if failed:
+            print(f"❌ {len(failed)} of {len(sections)} sections failed: {', '.join(failed)}")
+            return None
+
+        return "\n\n".join(f"## {title}\n\n{body.strip()}" for title, body in zip(sections, bodies))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Lazy, shared component wiring.
+Generators are expensive to build (config files, NLTK checks, sessions), so
+they are registered here as factories and built on first use. Every subsystem
+asking the same container for a service gets the same instance.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ServiceContainer:
+    """Named factories whose products are built once, on first use"""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[["ServiceContainer"], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._building: List[str] = []
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[["ServiceContainer"], Any]):
+        """Register or replace a factory; an instance already built is kept until reset"""
+        with self._lock:
+            self._factories[name] = factory
+
+    def set(self, name: str, instance: Any):
+        """Use a ready-made instance, e.g. a test double"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        """Return the service, building it (and the services its factory asks for) on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._factories:
+                raise KeyError(f"Unknown service: {name}")
+            if name in self._building:
+                raise RuntimeError(f"Circular service dependency: {' -> '.join(self._building + [name])}")
+
+            self._building.append(name)
+            try:
+                instance = self._factories[name](self)
+            finally:
+                self._building.pop()
+            self._instances[name] = instance
+            return instance
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def reset(self, name: Optional[str] = None):
+        """Forget one built instance, or all of them, so the next get builds afresh"""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+
+class LazyService:
+    """Class attribute resolved from the instance's `services` container on first access.
+    The result is cached on the instance, and assigning the attribute overrides it."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.attr = name
+
+    def __set_name__(self, owner, attr: str):
+        self.attr = attr
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.services.get(self.name)
+        instance.__dict__[self.attr] = value
+        return value
+
+
+# Imports stay inside the factories so that only the services actually used are loaded
+def _settings_manager(services: ServiceContainer):
+    from core.settings_manager import SettingsManager
+    return SettingsManager()
+
+
+def _llm_transport(services: ServiceContainer):
+    from core.llm_transport import get_shared_llm_transport
+    return get_shared_llm_transport()
+
+
+def _web_research(services: ServiceContainer):
+    from core.web_research_content import WebResearchContentGenerator
+    return WebResearchContentGenerator()
+
+
+def _local_llm(services: ServiceContainer):
+    from core.local_llm_content import MultilingualLocalLLMContentGenerator
+    return MultilingualLocalLLMContentGenerator(transport=services.get("llm_transport"),
+                                                web_researcher=services.get("web_research"))
+
+
+def _claude(services: ServiceContainer):
+    from content.claude_content import ClaudeContentGenerator
+    return ClaudeContentGenerator(transport=services.get("llm_transport"))
+
+
+def _seo_optimizer(services: ServiceContainer):
+    from seo.seo_optimizer import MultilingualSEOOptimizer
+    return MultilingualSEOOptimizer()
+
+
+def _enhanced_research(services: ServiceContainer):
+    from core.enhanced_research_llm import EnhancedResearchLLMGenerator
+    return EnhancedResearchLLMGenerator(web_researcher=services.get("web_research"),
+                                        local_llm=services.get("local_llm"),
+                                        seo_optimizer=services.get("seo_optimizer"),
+                                        transport=services.get("llm_transport"))
+
+
+def _auto_content(services: ServiceContainer):
+    from content.auto_content_system import AutoContentSystem
+    return AutoContentSystem(services=services)
+
+
+DEFAULT_FACTORIES: Dict[str, Callable[[ServiceContainer], Any]] = {
+    "settings_manager": _settings_manager,
+    "llm_transport": _llm_transport,
+    "web_research": _web_research,
+    "local_llm": _local_llm,
+    "claude": _claude,
+    "seo_optimizer": _seo_optimizer,
+    "enhanced_research": _enhanced_research,
+    "auto_content": _auto_content,
+}
+
+
+def create_service_container() -> ServiceContainer:
+    """A container with the default generator factories"""
+    services = ServiceContainer()
+    for name, factory in DEFAULT_FACTORIES.items():
+        services.register(name, factory)
+    return services
+
+
+_shared_services: Optional[ServiceContainer] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_services() -> ServiceContainer:
+    """Return the process-wide service container"""
+    global _shared_services
+    with _shared_lock:
+        if _shared_services is None:
+            _shared_services = create_service_container()
+        return _shared_services
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Single-pass statistics extraction for scraped research text.
+One compiled pattern finds every statistic type, context comes from match
+spans, and repeated values are reported once.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# One alternation per statistic type; trailing words are lookaheads so they stay available as context
+STATISTIC_PATTERN = re.compile(r"""
+    (?=[\d$b])  # Cheap first-character check before trying the alternatives
+    (?:
+      (?P<percentage>\d+(?:\.\d+)?%)(?=\s+(?:of|increase|decrease|growth|decline))
+    | (?P<monetary>\$\d+(?:\.\d+)?\s*(?:billion|million|thousand))
+    | (?P<volume>\d+(?:\.\d+)?\s*(?:billion|million|thousand))(?=\s+(?:users|customers|companies))
+    | (?P<year>\d{4})(?=\s+(?:study|report|survey|research))
+    | (?P<multiplier>\d+(?:\.\d+)?x)(?=\s+(?:more|increase|growth))
+    | by\s+(?P<projection>\d{4})
+    )
+""", re.IGNORECASE | re.VERBOSE)
+
+SCALE_WORDS = {
+    'thousand': 1e3,
+    'million': 1e6,
+    'billion': 1e9,
+}
+
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+SCALE_PATTERN = re.compile(r'billion|million|thousand', re.IGNORECASE)
+
+
+def parse_statistic(value: str, stat_type: str) -> Tuple[Optional[float], Optional[str]]:
+    """Convert a matched statistic into a number and unit, e.g. '$2.5 billion' -> (2.5e9, 'USD')"""
+    number_match = NUMBER_PATTERN.search(value)
+    if not number_match:
+        return None, None
+
+    number = float(number_match.group())
+    scale = SCALE_PATTERN.search(value)
+    if scale:
+        number *= SCALE_WORDS[scale.group().lower()]
+
+    units = {
+        'percentage': '%',
+        'monetary': 'USD',
+        'multiplier': 'x',
+        'year': 'year',
+    }
+    if stat_type == 'year':
+        number = int(number)
+
+    return number, units.get(stat_type)
+
+
+class StatisticsExtractor:
+    """Extract typed statistics from text in one pass"""
+
+    def __init__(self, context_chars: int = 100, max_results: int = 10):
+        self.context_chars = context_chars
+        self.max_results = max_results
+
+    def extract(self, text: str, max_results: Optional[int] = None) -> List[Dict]:
+        """Return up to max_results unique statistics with context, type and numeric value"""
+        limit = self.max_results if max_results is None else max_results
+        stats = []
+        seen_values = set()
+
+        for match in STATISTIC_PATTERN.finditer(text):
+            group = match.lastgroup
+            value = match.group(group)
+            key = " ".join(value.lower().split())
+            if key in seen_values:
+                continue
+            seen_values.add(key)
+
+            # Projections ("by 2030") are reported as years, matching classify_statistic
+            stat_type = 'year' if group == 'projection' else group
+            start, end = match.span(group)
+            number, unit = parse_statistic(value, stat_type)
+
+            stats.append({
+                'value': value,
+                'context': text[max(0, start - self.context_chars):end + self.context_chars].strip(),
+                'type': stat_type,
+                'number': number,
+                'unit': unit
+            })
+
+            if len(stats) >= limit:
+                break
+
+        return stats
+
+
+_default_extractor = StatisticsExtractor()
+
+
+def extract_statistics(text: str, max_results: int = 10) -> List[Dict]:
+    """Extract statistics with the default extractor settings"""
+    return _default_extractor.extract(text, max_results)
@@ -7,23 +7,232 @@ Gathers real data from the internet and creates comprehensive, SEO-optimized con
 import requests
 import json
 import re
-import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from urllib.parse import quote_plus, urljoin
-from bs4 import BeautifulSoup
-import yaml
+from requests.adapters import HTTPAdapter
+from core.rate_limiter import HostRateLimiter, get_shared_rate_limiter
+from core.http_cache import CachedResponse, HTTPResponseCache, get_shared_http_cache
+from core.research_store import ResearchStore, get_shared_research_store
+from core.statistics_extractor import StatisticsExtractor
+from core.keyword_matcher import get_keyword_matcher
+from core.near_duplicates import SimHashIndex, normalize_title
 import random
 from pathlib import Path
 import os
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup  # Imported where pages are parsed, so importing this module stays light
+
+# Topic domains in priority order; acronyms match case-sensitively, everything else ignores case
+TOPIC_DOMAIN_TRIGGERS = [
+    ("ai", ("AI",), ("artificial intelligence",)),
+    ("seo", ("SEO",), ("search",)),
+    ("energy", (), ("oil", "energy")),
+    ("finance", (), ("finance", "banking")),
+    ("marketing", (), ("marketing",)),
+]
+
+
+class ResearchRun:
+    """Bookkeeping for one research_topic_comprehensively call, shared by the sync and async backends.
+
+    Articles are keyed by their Google News link, so redirects are only resolved for
+    the articles we actually scrape or cite. Syndicated copies are dropped before
+    download by title and after download by body, and the scrape budget counts
+    accepted unique articles. Search results are released to the scrape queue in
+    query order, whichever search finishes first, so the same results always
+    produce the same research.
+    """
+    
+    def __init__(self, researcher: 'WebResearchContentGenerator', topic: str):
+        print(f"🔍 Researching: {topic}")
+        self.researcher = researcher
+        self.topic = topic
+        self.research_data = {
+            'topic': topic,
+            'research_date': datetime.now().isoformat(),
+            'articles': [],
+            'statistics': [],
+            'trends': [],
+            'key_insights': [],
+            'sources': []
+        }
+        
+        # Generate topic-specific search queries
+        self.search_queries = researcher.generate_topic_specific_queries(topic)
+        self.scrape_budget = researcher.concurrency_config["max_articles_to_scrape"]
+        self.max_attempts = max(self.scrape_budget, researcher.concurrency_config["max_scrape_attempts"])
+        
+        self.results_by_query: Dict[str, List[Dict]] = {}
+        self.articles_by_key: Dict[str, Dict] = {}
+        self.released_queries = 0  # Queries whose results are in the scrape queue, counted in query order
+        self.scraped_by_index: Dict[int, Dict] = {}  # Accepted so far, used for the scrape budget
+        self.successful_by_index: Dict[int, Dict] = {}  # Every scrape that returned content
+        self.scrapes_submitted = 0
+        
+        self.title_index = SimHashIndex(max_distance=researcher.dedup_config["title_max_distance"], shingle_size=1)
+        self.body_index = SimHashIndex(max_distance=researcher.dedup_config["body_max_distance"])
+        self.duplicate_keys = set()
+        self.duplicate_bodies = 0
+        self.scrape_candidates = deque()
+    
+    @staticmethod
+    def article_key(article: Dict) -> str:
+        return article.get('google_news_url', article['url'])
+    
+    def add_search_results(self, query: str, articles: Optional[List[Dict]]):
+        """Register a query's results; new, non-duplicate articles are queued for scraping
+        once every earlier query has reported too"""
+        self.results_by_query[query] = articles or []
+        
+        while (self.released_queries < len(self.search_queries)
+               and self.search_queries[self.released_queries] in self.results_by_query):
+            for article in self.results_by_query[self.search_queries[self.released_queries]]:
+                key = self.article_key(article)
+                if key in self.articles_by_key:
+                    continue
+                self.articles_by_key[key] = article
+                if self.title_index.check_and_add(key, normalize_title(article.get('title', ''))):
+                    self.duplicate_keys.add(key)
+                    continue
+                self.scrape_candidates.append(article)
+            self.released_queries += 1
+    
+    def add_scraped(self, index: int, result: Optional[Dict]):
+        """Accept a scrape result unless it failed or duplicates an accepted body"""
+        if not result or not result.get('content'):
+            return
+        self.successful_by_index[index] = result
+        if self.body_index.check_and_add(str(index), result['content']) is None:
+            self.scraped_by_index[index] = result
+        else:
+            self.duplicate_bodies += 1
+    
+    def accepted_scrapes(self) -> List[Dict]:
+        """Scraped articles without duplicate bodies, in submission order.
+        Duplicates are decided again in that order, so the copy kept does not depend on which finished first."""
+        body_index = SimHashIndex(max_distance=self.researcher.dedup_config["body_max_distance"])
+        accepted = []
+        for index in sorted(self.successful_by_index):
+            result = self.successful_by_index[index]
+            if body_index.check_and_add(str(index), result['content']) is None:
+                accepted.append(result)
+        return accepted[:self.scrape_budget]
+    
+    def next_scrapes(self, in_flight: int) -> List[Tuple[int, Dict]]:
+        """Articles to scrape now, keeping accepted + in-flight scrapes at the budget"""
+        batch = []
+        while (self.scrape_candidates and self.scrapes_submitted < self.max_attempts
+               and len(self.scraped_by_index) + in_flight < self.scrape_budget):
+            print(f"  📄 Scraping article {len(self.scraped_by_index) + in_flight + 1}/{self.scrape_budget}...")
+            batch.append((self.scrapes_submitted, self.scrape_candidates.popleft()))
+            self.scrapes_submitted += 1
+            in_flight += 1
+        return batch
+    
+    def unique_articles(self) -> List[Dict]:
+        """Articles without duplicates, in query order"""
+        seen_keys = set()
+        unique_articles = []
+        for query in self.search_queries:
+            for article in self.results_by_query.get(query, []):
+                key = self.article_key(article)
+                if key not in seen_keys and key not in self.duplicate_keys:
+                    unique_articles.append(self.articles_by_key[key])
+                    seen_keys.add(key)
+        return unique_articles
+    
+    def finish(self, sources: List[str]) -> Dict:
+        """Assemble the research data once searches and scrapes are done"""
+        researcher = self.researcher
+        research_data = self.research_data
+        
+        if self.duplicate_keys or self.duplicate_bodies:
+            print(f"  🧬 Skipped {len(self.duplicate_keys)} near-duplicate titles and "
+                  f"{self.duplicate_bodies} near-duplicate bodies")
+        
+        research_data['articles'] = self.unique_articles()[:15]  # Top 15 articles
+        research_data['sources'] = sources
+        
+        scraped_content = self.accepted_scrapes()
+        for content in scraped_content:
+            research_data['statistics'].extend(content.get('statistics', []))
+        
+        # Analyze trends and insights
+        research_data['key_insights'] = researcher.analyze_research_data(scraped_content, self.topic)
+        if researcher.research_store is not None:
+            researcher.research_store.save_insights(self.topic, research_data['key_insights'])
+            store_stats = researcher.research_store.get_stats()
+            print(f"  🗄️ Research store: {store_stats['query_hits']} queries and "
+                  f"{store_stats['article_hits']} articles reused")
+        
+        cache_stats = researcher.get_cache_stats()
+        if cache_stats:
+            print(f"  💾 HTTP cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, "
+                  f"{cache_stats['misses']} misses, {cache_stats['bytes_saved'] / 1024:.0f} KB saved, "
+                  f"{cache_stats['redirect_hits']} redirects reused")
+        
+        return research_data
+
 class WebResearchContentGenerator:
-    def __init__(self):
+    def __init__(self, max_workers: int = 6, per_domain_concurrency: int = 2,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 http_cache: Optional[HTTPResponseCache] = None, use_http_cache: bool = True,
+                 research_store: Optional[ResearchStore] = None, use_research_store: bool = True):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
+        # Concurrent research parameters
+        self.concurrency_config = {
+            "max_workers": max(1, max_workers),  # Worker pool size for queries and scrapes
+            "per_domain_concurrency": max(1, per_domain_concurrency),  # Simultaneous requests per host
+            "max_retries_on_throttle": 2,  # Retries after a 429 / Retry-After response
+            "max_articles_to_scrape": 8,
+            "max_scrape_attempts": 16  # Failed or duplicate scrapes are replaced up to this many fetches
+        }
+        
+        # Near-duplicate thresholds (bits of 64-bit SimHash)
+        self.dedup_config = {
+            "title_max_distance": 3,
+            "body_max_distance": 6
+        }
+        
+        # Size the connection pool so workers don't queue for sockets
+        adapter = HTTPAdapter(pool_connections=self.concurrency_config["max_workers"],
+                              pool_maxsize=self.concurrency_config["max_workers"])
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Per-host politeness state shared by all workers
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self._host_lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        
+        # Persistent response cache for RSS feeds and article pages
+        self.http_cache = (http_cache or get_shared_http_cache()) if use_http_cache else None
+        
+        # Research shared across projects and runs; fresh entries skip the network entirely
+        self.research_store = (research_store or get_shared_research_store()) if use_research_store else None
+        
+        # Streaming scrape parameters
+        self.scrape_config = {
+            "max_bytes": 1024 * 1024,  # Stop downloading article bodies past this size
+            "chunk_size": 16 * 1024,
+            "parser": "lxml",  # Falls back to html.parser when lxml is unavailable
+            "content_chars": 2000,  # Article text kept in the result
+            "statistics_chars": 20000  # Article text scanned for statistics
+        }
+        
+        # Single-pass statistics extraction
+        self.statistics_extractor = StatisticsExtractor(context_chars=100)
+        
         # Load research sources from config
         self.research_sources = self._load_research_sources_config()
         
@@ -54,6 +263,72 @@ class WebResearchContentGenerator:
         # Return default configuration as fallback
         return self._get_default_research_sources()
     
+    @contextmanager
+    def _host_slot(self, url: str):
+        """Hold one of the per-host request slots once the host's rate limit allows it"""
+        host = self.rate_limiter.host_for(url)
+        
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.concurrency_config["per_domain_concurrency"])
+                self._host_semaphores[host] = semaphore
+        
+        with semaphore:
+            self.rate_limiter.acquire(url)
+            yield
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a rate-limited request, backing off and retrying when the host throttles us"""
+        max_retries = self.concurrency_config["max_retries_on_throttle"]
+        
+        for attempt in range(max_retries + 1):
+            with self._host_slot(url):
+                response = self.session.request(method, url, **kwargs)
+            
+            delay = self.rate_limiter.update_from_response(url, response)
+            if delay is None or attempt == max_retries or delay > self.rate_limiter.max_retry_after:
+                return response
+            
+            print(f"⏳ {self.rate_limiter.host_for(url)} is throttling us, retrying in {delay:.0f}s")
+        
+        return response
+    
+    def _cached_get(self, url: str, content_type: str, max_bytes: Optional[int] = None, **kwargs):
+        """GET through the response cache, revalidating stale entries with conditional requests.
+        With max_bytes the body is streamed and truncated at that size."""
+        stream = max_bytes is not None
+        
+        def read_body(response) -> bytes:
+            return self._read_capped(response, max_bytes) if stream else response.content
+        
+        if self.http_cache is None:
+            response = self._request('GET', url, stream=stream, **kwargs)
+            return CachedResponse(response.url, response.status_code, read_body(response), dict(response.headers))
+        
+        def fetch(conditional_headers: Dict[str, str]):
+            return self._request('GET', url, headers=conditional_headers, stream=stream, **kwargs)
+        
+        return self.http_cache.fetch(url, content_type, fetch, read_body=read_body)
+    
+    def _read_capped(self, response, max_bytes: int) -> bytes:
+        """Read a streamed body up to max_bytes and release the connection"""
+        chunks = []
+        total = 0
+        try:
+            for chunk in response.iter_content(chunk_size=self.scrape_config["chunk_size"]):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= max_bytes:
+                    break
+        finally:
+            response.close()
+        return b"".join(chunks)[:max_bytes]
+    
+    def get_cache_stats(self) -> Dict:
+        """Return HTTP cache counters for reporting"""
+        return self.http_cache.get_stats() if self.http_cache else {}
+    
     def _get_default_research_sources(self):
         """Get default research sources configuration"""
         return {
@@ -71,39 +346,32 @@ class WebResearchContentGenerator:
             ]
         }
         
-    def search_google_news(self, query: str, days_back: int = 30) -> List[Dict]:
-        """Search Google News for recent articles"""
+    def search_google_news(self, query: str, days_back: int = 30, max_results: int = 10,
+                           resolve_urls: bool = True) -> List[Dict]:
+        """Search Google News for recent articles; with resolve_urls=False redirects are left for resolve_article_url"""
+        if self.research_store is not None:
+            stored = self.research_store.get_search_results(query, max_results)
+            if stored is not None:
+                if resolve_urls:
+                    for article in stored:
+                        self.resolve_article_url(article)
+                return stored
+        
         try:
             # Use Google News RSS feed
-            encoded_query = quote_plus(query)
-            url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
-            
-            response = self.session.get(url, timeout=10)
+            response = self._cached_get(self._google_news_search_url(query), 'rss', timeout=10)
             if response.status_code != 200:
                 return []
             
-            # Parse RSS feed
-            from xml.etree import ElementTree as ET
-            root = ET.fromstring(response.content)
+            articles = self._parse_google_news_rss(response.content, max_results)
             
-            articles = []
-            for item in root.findall('.//item')[:10]:  # Get top 10 articles
-                title = item.find('title')
-                link = item.find('link')
-                pub_date = item.find('pubDate')
-                description = item.find('description')
-                
-                if title is not None and link is not None:
-                    # Extract actual URL from Google News redirect
-                    actual_url = self.extract_actual_url(link.text)
-                    
-                    articles.append({
-                        'title': title.text,
-                        'url': actual_url,
-                        'published': pub_date.text if pub_date is not None else '',
-                        'description': description.text if description is not None else '',
-                        'source': 'Google News'
-                    })
+            # Extract actual URL from Google News redirect
+            if resolve_urls:
+                for article in articles:
+                    self.resolve_article_url(article)
+            
+            if self.research_store is not None:
+                self.research_store.save_search_results(query, articles, max_results)
             
             return articles
             
@@ -111,101 +379,180 @@ class WebResearchContentGenerator:
             print(f"❌ Error searching Google News: {e}")
             return []
     
+    def _google_news_search_url(self, query: str) -> str:
+        return f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-US&gl=US&ceid=US:en"
+    
+    def _parse_google_news_rss(self, content: bytes, max_results: int) -> List[Dict]:
+        """Turn a Google News RSS feed into unresolved article dicts"""
+        from xml.etree import ElementTree as ET
+        root = ET.fromstring(content)
+        
+        articles = []
+        for item in root.findall('.//item')[:max_results]:  # Get top articles
+            title = item.find('title')
+            link = item.find('link')
+            pub_date = item.find('pubDate')
+            description = item.find('description')
+            
+            if title is not None and link is not None:
+                articles.append({
+                    'title': title.text,
+                    'url': link.text,
+                    'google_news_url': link.text,
+                    'resolved': False,
+                    'published': pub_date.text if pub_date is not None else '',
+                    'description': description.text if description is not None else '',
+                    'source': 'Google News'
+                })
+        
+        return articles
+    
+    def resolve_article_url(self, article: Dict) -> str:
+        """Resolve an article's Google News link in place, once, and return the final URL"""
+        if not article.get('resolved'):
+            article['url'] = self.extract_actual_url(article.get('google_news_url', article['url']))
+            article['resolved'] = True
+        return article['url']
+    
     def extract_actual_url(self, google_news_url: str) -> str:
         """Extract actual article URL from Google News redirect"""
+        fallback_url = google_news_url.replace('https://news.google.com/rss/articles/', 'https://news.google.com/articles/')
+        
+        if self.http_cache is not None:
+            cached = self.http_cache.get_redirect(google_news_url)
+            if cached is not None:
+                final_url, resolved = cached
+                return final_url if resolved else fallback_url
+        
+        actual_url = self._follow_redirect(google_news_url)
+        if self.http_cache is not None:
+            self.http_cache.store_redirect(google_news_url, actual_url, resolved=actual_url is not None)
+        
+        return actual_url or fallback_url
+    
+    def _follow_redirect(self, google_news_url: str) -> Optional[str]:
+        """Follow a Google News redirect over the network; returns None on failure"""
         try:
             # Try to follow the redirect to get the actual URL
-            response = self.session.head(google_news_url, allow_redirects=True, timeout=10)
-            actual_url = response.url
-            
-            # If it's still a Google URL, try to extract from the redirect chain
-            if 'google.com' in actual_url:
-                # Look for url parameter in the redirect
-                import urllib.parse as urlparse
-                parsed = urlparse.urlparse(actual_url)
-                params = urlparse.parse_qs(parsed.query)
-                if 'url' in params:
-                    return params['url'][0]
-                elif 'q' in params:
-                    return params['q'][0]
-            
-            return actual_url
+            response = self._request('HEAD', google_news_url, allow_redirects=True, timeout=10)
+            return self._redirect_target(response.url)
             
         except Exception as e:
             print(f"❌ Error extracting URL: {e}")
-            # Return a clean version of the original URL
-            return google_news_url.replace('https://news.google.com/rss/articles/', 'https://news.google.com/articles/')
+            return None
+    
+    def _redirect_target(self, actual_url: str) -> str:
+        """Pick the article URL out of where a Google News redirect ended up"""
+        # If it's still a Google URL, try to extract from the redirect chain
+        if 'google.com' in actual_url:
+            # Look for url parameter in the redirect
+            import urllib.parse as urlparse
+            parsed = urlparse.urlparse(actual_url)
+            params = urlparse.parse_qs(parsed.query)
+            if 'url' in params:
+                return params['url'][0]
+            elif 'q' in params:
+                return params['q'][0]
+        
+        return actual_url
     
     def scrape_article_content(self, url: str) -> Dict:
         """Scrape content from an article URL"""
+        if self.research_store is not None:
+            stored = self.research_store.get_article(url)
+            if stored is not None:
+                return stored
+        
         try:
-            response = self.session.get(url, timeout=15)
-            if response.status_code != 200:
-                return {}
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract article content
-            content = ""
-            
-            # Try common article selectors
-            selectors = [
-                'article', '.article-content', '.post-content', 
-                '.entry-content', '.content', 'main', '.main-content'
-            ]
-            
-            for selector in selectors:
-                elements = soup.select(selector)
-                if elements:
-                    for elem in elements:
-                        # Remove script and style elements
-                        for script in elem(["script", "style"]):
-                            script.decompose()
-                        content += elem.get_text(strip=True) + " "
-                    break
-            
-            # Extract statistics and data points
-            stats = self.extract_statistics(content)
-            
-            return {
-                'url': url,
-                'content': content[:2000],  # Limit content length
-                'statistics': stats,
-                'scraped_at': datetime.now().isoformat()
-            }
+            response = self._cached_get(url, 'article', max_bytes=self.scrape_config["max_bytes"], timeout=15)
+            return self._build_scraped_article(url, response)
             
         except Exception as e:
             print(f"❌ Error scraping {url}: {e}")
             return {}
     
-    def extract_statistics(self, text: str) -> List[Dict]:
-        """Extract statistics and data points from text"""
-        stats = []
-        
-        # Patterns for common statistics
-        patterns = [
-            r'(\d+(?:\.\d+)?%)\s+(?:of|increase|decrease|growth|decline)',
-            r'(\$\d+(?:\.\d+)?\s*(?:billion|million|thousand))',
-            r'(\d+(?:\.\d+)?\s*(?:billion|million|thousand))\s+(?:users|customers|companies)',
-            r'(\d{4})\s+(?:study|report|survey|research)',
-            r'(\d+(?:\.\d+)?x)\s+(?:more|increase|growth)',
-            r'by\s+(\d{4})',  # Future projections
+    def _build_scraped_article(self, url: str, response: CachedResponse) -> Dict:
+        """Extract article text and statistics from a downloaded page and store the result"""
+        if response.status_code != 200:
+            return {}
+        
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type:
+            return {}
+        if not content_type and response.from_cache and not self._looks_like_html(response.content):
+            return {}  # Cached before the Content-Type was stored
+        
+        soup = self._parse_html(response.content)
+        
+        # Try common article selectors
+        selectors = [
+            'article', '.article-content', '.post-content', 
+            '.entry-content', '.content', 'main', '.main-content'
         ]
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                context_start = max(0, text.find(match) - 100)
-                context_end = min(len(text), text.find(match) + len(match) + 100)
-                context = text[context_start:context_end].strip()
-                
-                stats.append({
-                    'value': match,
-                    'context': context,
-                    'type': self.classify_statistic(match)
-                })
+        content = ""
+        for selector in selectors:
+            elements = soup.select(selector)
+            if elements:
+                content = self._collect_text(elements, self.scrape_config["statistics_chars"])
+                break
+        
+        # Extract statistics and data points
+        stats = self.extract_statistics(content)
+        
+        scraped = {
+            'url': url,
+            'content': content[:self.scrape_config["content_chars"]],  # Limit content length
+            'statistics': stats,
+            'scraped_at': datetime.now().isoformat()
+        }
+        
+        if self.research_store is not None:
+            self.research_store.save_article(scraped)
         
-        return stats[:10]  # Limit to top 10 statistics
+        return scraped
+    
+    @staticmethod
+    def _looks_like_html(body: bytes) -> bool:
+        """Sniff a body without a Content-Type: markup, not a PDF, image or JSON payload"""
+        head = body[:1024].lstrip(b"\xef\xbb\xbf \t\r\n")
+        return head.startswith(b"<") and b"\x00" not in head
+    
+    def _parse_html(self, html: bytes) -> "BeautifulSoup":
+        """Parse HTML with the configured backend, falling back to the stdlib parser"""
+        from bs4 import BeautifulSoup, FeatureNotFound
+        
+        try:
+            return BeautifulSoup(html, self.scrape_config["parser"])
+        except FeatureNotFound:
+            return BeautifulSoup(html, 'html.parser')
+    
+    def _collect_text(self, elements, limit: int) -> str:
+        """Join visible text from elements, stopping once limit characters are collected"""
+        from bs4 import Comment, NavigableString
+        
+        parts = []
+        length = 0
+        
+        for elem in elements:
+            for node in elem.descendants:
+                if not isinstance(node, NavigableString) or isinstance(node, Comment):
+                    continue
+                if node.parent is not None and node.parent.name in ('script', 'style', 'noscript'):
+                    continue
+                
+                text = node.strip()
+                if text:
+                    parts.append(text)
+                    length += len(text) + 1
+                    if length >= limit:
+                        return " ".join(parts)[:limit]
+        
+        return " ".join(parts)
+    
+    def extract_statistics(self, text: str) -> List[Dict]:
+        """Extract statistics and data points from text"""
+        return self.statistics_extractor.extract(text, max_results=10)  # Limit to top 10 statistics
     
     def classify_statistic(self, stat: str) -> str:
         """Classify the type of statistic"""
@@ -222,6 +569,19 @@ class WebResearchContentGenerator:
         else:
             return 'numeric'
     
+    def detect_topic_domain(self, topic: str) -> str:
+        """Classify a topic into one of the research domains, or 'general'"""
+        case_sensitive = tuple(word for _, words, _ in TOPIC_DOMAIN_TRIGGERS for word in words)
+        case_insensitive = tuple(word for _, _, words in TOPIC_DOMAIN_TRIGGERS for word in words)
+        
+        found = set(get_keyword_matcher(case_sensitive, case_sensitive=True).first_matches(topic))
+        found.update(get_keyword_matcher(case_insensitive).first_matches(topic))
+        
+        for domain, exact_words, words in TOPIC_DOMAIN_TRIGGERS:
+            if found.intersection(exact_words + words):
+                return domain
+        return "general"
+    
     def generate_topic_specific_queries(self, topic: str) -> List[str]:
         """Generate dynamic, topic-specific search queries"""
         current_year = datetime.now().year
@@ -236,7 +596,8 @@ class WebResearchContentGenerator:
         ]
         
         # Add topic-specific queries based on domain
-        if "AI" in topic or "artificial intelligence" in topic.lower():
+        domain = self.detect_topic_domain(topic)
+        if domain == "ai":
             specific_queries = [
                 f"{topic} machine learning applications",
                 f"{topic} automation benefits",
@@ -244,7 +605,7 @@ class WebResearchContentGenerator:
                 f"{topic} ROI analysis",
                 f"{topic} technology adoption rates"
             ]
-        elif "SEO" in topic or "search" in topic.lower():
+        elif domain == "seo":
             specific_queries = [
                 f"{topic} ranking factors {current_year}",
                 f"{topic} algorithm updates",
@@ -252,7 +613,7 @@ class WebResearchContentGenerator:
                 f"{topic} best practices",
                 f"{topic} tools comparison"
             ]
-        elif "oil" in topic.lower() or "energy" in topic.lower():
+        elif domain == "energy":
             specific_queries = [
                 f"{topic} production statistics",
                 f"{topic} price analysis",
@@ -260,7 +621,7 @@ class WebResearchContentGenerator:
                 f"{topic} technology innovations",
                 f"{topic} environmental impact"
             ]
-        elif "finance" in topic.lower() or "banking" in topic.lower():
+        elif domain == "finance":
             specific_queries = [
                 f"{topic} market analysis",
                 f"{topic} regulatory changes",
@@ -268,7 +629,7 @@ class WebResearchContentGenerator:
                 f"{topic} customer trends",
                 f"{topic} risk management"
             ]
-        elif "marketing" in topic.lower():
+        elif domain == "marketing":
             specific_queries = [
                 f"{topic} campaign performance",
                 f"{topic} customer acquisition",
@@ -286,59 +647,53 @@ class WebResearchContentGenerator:
                 f"{topic} market analysis"
             ]
         
-        # Combine and return unique queries
+        # Combine and return unique queries, keeping their order
         all_queries = base_queries + specific_queries
-        return list(set(all_queries))  # Remove duplicates
+        return list(dict.fromkeys(all_queries))
     
     def research_topic_comprehensively(self, topic: str) -> Dict:
         """Conduct comprehensive research on a topic"""
-        print(f"🔍 Researching: {topic}")
-        
-        research_data = {
-            'topic': topic,
-            'research_date': datetime.now().isoformat(),
-            'articles': [],
-            'statistics': [],
-            'trends': [],
-            'key_insights': [],
-            'sources': []
-        }
-        
-        # Generate topic-specific search queries
-        search_queries = self.generate_topic_specific_queries(topic)
-        
-        all_articles = []
-        for query in search_queries:
-            print(f"  📰 Searching: {query}")
-            articles = self.search_google_news(query, days_back=60)
-            all_articles.extend(articles)
-            time.sleep(2)  # Rate limiting
+        run = ResearchRun(self, topic)
         
-        # Remove duplicates
-        seen_urls = set()
-        unique_articles = []
-        for article in all_articles:
-            if article['url'] not in seen_urls:
-                unique_articles.append(article)
-                seen_urls.add(article['url'])
-        
-        research_data['articles'] = unique_articles[:15]  # Top 15 articles
-        
-        # Scrape content from top articles
-        scraped_content = []
-        for i, article in enumerate(unique_articles[:8]):  # Scrape top 8
-            print(f"  📄 Scraping article {i+1}/8...")
-            content = self.scrape_article_content(article['url'])
-            if content:
-                scraped_content.append(content)
-                research_data['statistics'].extend(content.get('statistics', []))
-            time.sleep(3)  # Rate limiting
-        
-        # Analyze trends and insights
-        research_data['key_insights'] = self.analyze_research_data(scraped_content, topic)
-        research_data['sources'] = [article['url'] for article in unique_articles[:10]]
+        # Fan out searches and scrapes on one bounded pool; scrapes start as soon
+        # as the first search results arrive instead of waiting for every query
+        with ThreadPoolExecutor(max_workers=self.concurrency_config["max_workers"]) as executor:
+            pending = {}
+            
+            def submit_scrapes():
+                in_flight = sum(1 for task_type, _ in pending.values() if task_type == "scrape")
+                for index, article in run.next_scrapes(in_flight):
+                    pending[executor.submit(self._resolve_and_scrape, article)] = ("scrape", index)
+            
+            for query in run.search_queries:
+                print(f"  📰 Searching: {query}")
+                pending[executor.submit(self.search_google_news, query, days_back=60, resolve_urls=False)] = ("search", query)
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_type, payload = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"❌ Research task failed: {e}")
+                        result = None
+                    
+                    if task_type == "search":
+                        run.add_search_results(payload, result)
+                    else:
+                        run.add_scraped(payload, result)
+                    
+                    submit_scrapes()
+            
+            # Resolve only the articles cited as sources
+            sources = list(executor.map(self.resolve_article_url, run.unique_articles()[:10]))
         
-        return research_data
+        return run.finish(sources)
+    
+    def _resolve_and_scrape(self, article: Dict) -> Dict:
+        """Resolve an article's redirect and scrape the final page"""
+        return self.scrape_article_content(self.resolve_article_url(article))
     
     def analyze_research_data(self, scraped_content: List[Dict], topic: str = "") -> List[str]:
         """Analyze scraped content to extract topic-specific key insights"""
@@ -348,31 +703,32 @@ class WebResearchContentGenerator:
         all_text = " ".join([content.get('content', '') for content in scraped_content])
         
         # Generate topic-specific keywords for analysis
-        if "AI" in topic or "artificial intelligence" in topic.lower():
+        domain = self.detect_topic_domain(topic)
+        if domain == "ai":
             trend_keywords = [
                 'artificial intelligence', 'machine learning', 'deep learning',
                 'neural networks', 'automation', 'predictive analytics',
                 'natural language processing', 'computer vision', 'AI adoption'
             ]
-        elif "SEO" in topic or "search" in topic.lower():
+        elif domain == "seo":
             trend_keywords = [
                 'search engine optimization', 'ranking factors', 'algorithm updates',
                 'organic traffic', 'keyword research', 'content optimization',
                 'technical SEO', 'user experience', 'mobile optimization'
             ]
-        elif "oil" in topic.lower() or "energy" in topic.lower():
+        elif domain == "energy":
             trend_keywords = [
                 'oil production', 'energy transition', 'renewable energy',
                 'crude oil prices', 'drilling technology', 'refining capacity',
                 'energy efficiency', 'carbon emissions', 'sustainability'
             ]
-        elif "finance" in topic.lower() or "banking" in topic.lower():
+        elif domain == "finance":
             trend_keywords = [
                 'digital banking', 'fintech innovation', 'cryptocurrency',
                 'regulatory compliance', 'risk management', 'customer experience',
                 'mobile payments', 'blockchain technology', 'financial inclusion'
             ]
-        elif "marketing" in topic.lower():
+        elif domain == "marketing":
             trend_keywords = [
                 'digital marketing', 'customer acquisition', 'conversion optimization',
                 'personalization', 'marketing automation', 'social media marketing',
@@ -386,16 +742,21 @@ class WebResearchContentGenerator:
                 'competitive advantage', 'operational efficiency', 'technology adoption'
             ]
         
+        # Locate every trend keyword in one pass over the corpus
+        first_matches = get_keyword_matcher(tuple(trend_keywords)).first_matches(all_text)
+        
         for keyword in trend_keywords:
-            if keyword.lower() in all_text.lower():
-                # Find context around the keyword
-                pattern = rf'.{{0,100}}{re.escape(keyword)}.{{0,100}}'
-                matches = re.findall(pattern, all_text, re.IGNORECASE)
-                if matches:
-                    # Clean up the match
-                    clean_match = matches[0].replace('\n', ' ').replace('\t', ' ')
-                    clean_match = ' '.join(clean_match.split())  # Remove extra spaces
-                    insights.append(f"Industry analysis reveals: {clean_match[:200]}")
+            if keyword in first_matches:
+                # Context window around the keyword, not crossing line breaks
+                start, end = first_matches[keyword]
+                context_start = max(start - 100, all_text.rfind('\n', 0, start) + 1)
+                line_end = all_text.find('\n', end)
+                context_end = min(end + 100, line_end if line_end != -1 else len(all_text))
+                
+                # Clean up the match
+                clean_match = all_text[context_start:context_end].replace('\t', ' ')
+                clean_match = ' '.join(clean_match.split())  # Remove extra spaces
+                insights.append(f"Industry analysis reveals: {clean_match[:200]}")
         
         return insights[:8]  # Top 8 insights
     
@@ -1003,6 +1364,7 @@ Organizations that embrace these principles and implement the strategies outline
         Path(content_dir).mkdir(exist_ok=True)
         
         # Create full content with YAML front matter
+        import yaml
         yaml_content = yaml.dump(content_data["metadata"], default_flow_style=False)
         full_content = f"---\n{yaml_content}---\n\n{content_data['content']}"
         
@@ -317,6 +317,10 @@ class SettingsDashboard:
         """Display system information"""
         st.header("📊 System Information")
         
+        # Projects live in projects.json or, after migration, in projects.sqlite
+        project_store = os.getenv("PROJECT_STORE") or self.settings_manager.get_setting("project_store", "json")
+        projects_path = "projects.sqlite" if project_store == "sqlite" else "projects.json"
+        
         # System Status
         st.subheader("System Status")
         
@@ -337,7 +341,7 @@ class SettingsDashboard:
         
         with col3:
             # Check projects
-            projects_status = "✅ Found" if os.path.exists("projects.json") else "❌ Missing"
+            projects_status = "✅ Found" if os.path.exists(projects_path) else "❌ Missing"
             st.metric("Projects File", projects_status)
             
             # Check core modules
@@ -354,7 +358,7 @@ class SettingsDashboard:
         paths = {
             "Project Root": str(project_root),
             "Settings File": "config/settings.json",
-            "Projects File": "projects.json",
+            "Projects File": projects_path,
             "Core Directory": "core/",
             "Content Directory": "content/",
             "Dashboards Directory": "dashboards/"
@@ -11,7 +11,6 @@ import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
-import schedule
 
 from core.project_manager import MultilingualProjectManager
 from publishing.wordpress_publisher import WordPressPublisher
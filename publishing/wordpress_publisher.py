@@ -11,8 +11,6 @@ import requests
 import base64
 from datetime import datetime
 from pathlib import Path
-import yaml
-import markdown
 from typing import Dict, List, Optional
 
 class WordPressPublisher:
@@ -102,6 +100,8 @@ class WordPressPublisher:
     
     def parse_markdown_post(self, file_path: str) -> Dict:
         """Parse markdown file and extract metadata with content cleaning"""
+        import markdown
+        import yaml
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start import time of each entry point with `python -X importtime`.
+
+Every run imports the entry point in a fresh interpreter. The median total is
+reported together with the heavy third-party modules that were loaded and the
+slowest individual imports. With --history, results are appended to a JSON
+lines file and compared with the previous run.
+
+Usage:
+    python scripts/benchmarks/benchmark_startup.py
+    python scripts/benchmarks/benchmark_startup.py --entry seo_analyzer --runs 10 --top 15
+    python scripts/benchmarks/benchmark_startup.py --history cache/startup_benchmarks.jsonl
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Entry point -> module it imports at startup
+ENTRY_POINTS: Dict[str, str] = {
+    "settings_manager": "core.settings_manager",
+    "publishing_scheduler": "publishing.publishing_scheduler",
+    "seo_analyzer": "seo.seo_analyzer",
+    "enhanced_research_llm": "core.enhanced_research_llm",
+    "project_dashboard": "dashboards.project_dashboard",
+    "settings_dashboard": "dashboards.settings_dashboard",
+}
+
+# Third-party packages whose presence at startup is worth calling out
+HEAVY_MODULES = ("bs4", "nltk", "yaml", "markdown", "schedule", "requests", "streamlit", "anthropic")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Rows of (module, depth, self_us, cumulative_us) from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            # The name column is indented two spaces per nesting level after one separator space
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(module: str) -> Dict:
+    """Import a module once in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if line and not line.startswith("import time:")]
+        return {"error": errors[-1] if errors else f"exit code {result.returncode}"}
+
+    rows = parse_importtime(result.stderr)
+    loaded = {name for name, _, _, _ in rows}
+    return {
+        "import_ms": sum(cumulative for _, depth, _, cumulative in rows if depth == 0) / 1000,
+        "wall_ms": wall_ms,
+        "modules": len(rows),
+        "heavy": [name for name in HEAVY_MODULES if name in loaded],
+        "slowest": sorted(((name, self_us / 1000) for name, _, self_us, _ in rows),
+                          key=lambda row: row[1], reverse=True),
+    }
+
+
+def benchmark(module: str, runs: int) -> Dict:
+    """Median of several cold imports"""
+    samples = [measure(module) for _ in range(runs)]
+    failed = [sample for sample in samples if "error" in sample]
+    if failed:
+        return {"module": module, "error": failed[0]["error"]}
+
+    return {
+        "module": module,
+        "import_ms": statistics.median(sample["import_ms"] for sample in samples),
+        "wall_ms": statistics.median(sample["wall_ms"] for sample in samples),
+        "modules": samples[-1]["modules"],
+        "heavy": samples[-1]["heavy"],
+        "slowest": samples[-1]["slowest"],
+    }
+
+
+def load_previous(history: Optional[str]) -> Dict[str, Dict]:
+    """Results of the last recorded run"""
+    if not history or not Path(history).exists():
+        return {}
+    with open(history, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1])["results"] if lines else {}
+
+
+def record(history: str, results: Dict[str, Dict]):
+    Path(history).parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "results": {name: {key: value for key, value in result.items() if key != "slowest"}
+                    for name, result in results.items()},
+    }
+    with open(history, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of the entry points")
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS),
+                        help="Entry point to measure (repeatable); all by default")
+    parser.add_argument("--runs", type=int, default=5, help="Cold imports per entry point; the median is reported")
+    parser.add_argument("--top", type=int, default=5, help="Slowest individual imports to list per entry point")
+    parser.add_argument("--history", help="JSON lines file to compare with and append results to")
+    args = parser.parse_args()
+
+    previous = load_previous(args.history)
+    results: Dict[str, Dict] = {}
+
+    print(f"⏱️ Cold-start imports, median of {args.runs} runs")
+    for name in args.entry or list(ENTRY_POINTS):
+        result = benchmark(ENTRY_POINTS[name], args.runs)
+        results[name] = result
+
+        if "error" in result:
+            print(f"  ❌ {name:<22} {result['error']}")
+            continue
+
+        change = ""
+        before = previous.get(name, {}).get("import_ms")
+        if before:
+            change = f"  ({result['import_ms'] - before:+.1f} ms vs last run)"
+        print(f"  {name:<24} {result['import_ms']:8.1f} ms import {result['wall_ms']:8.1f} ms wall "
+              f"{result['modules']:5d} modules{change}")
+        if result["heavy"]:
+            print(f"    heavy: {', '.join(result['heavy'])}")
+        for module, self_ms in result["slowest"][:args.top]:
+            print(f"    {self_ms:8.1f} ms  {module}")
+
+    if args.history:
+        record(args.history, results)
+        print(f"📝 Results appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
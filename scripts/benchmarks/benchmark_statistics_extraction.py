@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass statistics extractor against the legacy
+six-pass implementation on large research corpora.
+
+Usage:
+    python scripts/benchmarks/benchmark_statistics_extraction.py
+    python scripts/benchmarks/benchmark_statistics_extraction.py --store cache/research_store.sqlite
+"""
+
+import argparse
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.statistics_extractor import StatisticsExtractor
+
+
+def legacy_classify_statistic(stat: str) -> str:
+    """classify_statistic as it was before the single-pass extractor"""
+    if '%' in stat:
+        return 'percentage'
+    elif '$' in stat:
+        return 'monetary'
+    elif any(word in stat.lower() for word in ['billion', 'million', 'thousand']):
+        return 'volume'
+    elif 'x' in stat.lower():
+        return 'multiplier'
+    elif len(stat) == 4 and stat.isdigit():
+        return 'year'
+    else:
+        return 'numeric'
+
+
+def legacy_extract_statistics(text: str) -> List[Dict]:
+    """extract_statistics as it was before the single-pass extractor"""
+    stats = []
+    patterns = [
+        r'(\d+(?:\.\d+)?%)\s+(?:of|increase|decrease|growth|decline)',
+        r'(\$\d+(?:\.\d+)?\s*(?:billion|million|thousand))',
+        r'(\d+(?:\.\d+)?\s*(?:billion|million|thousand))\s+(?:users|customers|companies)',
+        r'(\d{4})\s+(?:study|report|survey|research)',
+        r'(\d+(?:\.\d+)?x)\s+(?:more|increase|growth)',
+        r'by\s+(\d{4})',
+    ]
+
+    for pattern in patterns:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        for match in matches:
+            context_start = max(0, text.find(match) - 100)
+            context_end = min(len(text), text.find(match) + len(match) + 100)
+            stats.append({
+                'value': match,
+                'context': text[context_start:context_end].strip(),
+                'type': legacy_classify_statistic(match)
+            })
+
+    return stats[:10]
+
+
+def synthetic_corpus(documents: int, words_per_document: int, seed: int = 42) -> List[str]:
+    """Build article-like text with statistics scattered through filler prose"""
+    rng = random.Random(seed)
+    filler = ("marketing teams report that customer engagement and content strategy continue to "
+              "shape digital growth across industries while budgets shift toward automation").split()
+    statistics = [
+        lambda: f"{rng.randint(1, 99)}% of marketers",
+        lambda: f"${rng.randint(1, 900)} billion market",
+        lambda: f"{rng.randint(1, 500)} million users",
+        lambda: f"{rng.randint(2015, 2025)} survey",
+        lambda: f"{rng.randint(2, 9)}x more engagement",
+        lambda: f"by {rng.randint(2026, 2035)}",
+    ]
+
+    corpus = []
+    for _ in range(documents):
+        words = []
+        for _ in range(words_per_document):
+            if rng.random() < 0.01:
+                words.append(rng.choice(statistics)())
+            else:
+                words.append(rng.choice(filler))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def store_corpus(db_path: str) -> List[str]:
+    """Load scraped article bodies from a research store database"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT content FROM articles WHERE content != ''")]
+    finally:
+        conn.close()
+
+
+def time_extractor(name: str, extract: Callable[[str], List[Dict]], corpus: List[str], repeat: int) -> float:
+    """Run an extractor over the corpus and return the best wall-clock time"""
+    best = float('inf')
+    found = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        found = sum(len(extract(text)) for text in corpus)
+        best = min(best, time.perf_counter() - started)
+
+    print(f"  {name:<14} {best * 1000:10.1f} ms   {found:6d} statistics")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark statistics extraction")
+    parser.add_argument("--store", help="Research store database to load scraped articles from")
+    parser.add_argument("--documents", type=int, default=50, help="Synthetic documents to generate")
+    parser.add_argument("--words", type=int, default=20000, help="Words per synthetic document")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per extractor; the best is reported")
+    args = parser.parse_args()
+
+    corpus = store_corpus(args.store) if args.store else synthetic_corpus(args.documents, args.words)
+    total_chars = sum(len(text) for text in corpus)
+    print(f"📊 Corpus: {len(corpus)} documents, {total_chars / 1_000_000:.1f}M characters")
+
+    extractor = StatisticsExtractor()
+    legacy = time_extractor("legacy", legacy_extract_statistics, corpus, args.repeat)
+    single_pass = time_extractor("single-pass", extractor.extract, corpus, args.repeat)
+    full_scan = time_extractor("single-pass*", lambda text: extractor.extract(text, max_results=10 ** 9),
+                               corpus, args.repeat)
+
+    print(f"✅ Speedup: {legacy / single_pass:.1f}x (top 10), {legacy / full_scan:.1f}x (* every match)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Migrate content projects from projects.json to the SQLite project store.
+
+Usage:
+    python scripts/utilities/migrate_projects_to_sqlite.py
+    python scripts/utilities/migrate_projects_to_sqlite.py --source projects.json --target projects.sqlite --activate
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.project_store import JSONProjectStore, SQLiteProjectStore
+
+
+def migrate(source: str, target: str) -> bool:
+    """Copy every project into the SQLite store and check that it reads back unchanged"""
+    if not os.path.exists(source):
+        print(f"❌ {source} not found")
+        return False
+
+    projects = JSONProjectStore(source).load_all()
+    print(f"📂 Loaded {len(projects)} projects from {source}")
+
+    store = SQLiteProjectStore(target)
+    existing = store.load_all()
+    if existing:
+        print(f"⚠️ {target} already holds {len(existing)} projects; projects with the same ID are overwritten")
+
+    for project_id, data in projects.items():
+        store.save_project(project_id, data)
+
+    migrated = store.load_all()
+    mismatched = [project_id for project_id, data in projects.items() if migrated.get(project_id) != data]
+    if mismatched:
+        print(f"❌ {len(mismatched)} projects did not read back unchanged: {', '.join(mismatched)}")
+        return False
+
+    print(f"✅ Migrated {len(projects)} projects to {target}")
+    return True
+
+
+def activate(target: str):
+    """Switch the project manager to the SQLite store"""
+    from core.settings_manager import SettingsManager
+
+    settings = SettingsManager()
+    settings.set_setting("project_store", "sqlite")
+    print(f"🔧 project_store set to sqlite in {settings.settings_file}")
+    if os.path.abspath(target) != os.path.abspath("projects.sqlite"):
+        print(f"⚠️ The project manager reads projects.sqlite; move {target} there before starting it")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate projects.json to the SQLite project store")
+    parser.add_argument("--source", default="projects.json", help="JSON project file to read")
+    parser.add_argument("--target", default="projects.sqlite", help="SQLite database to write")
+    parser.add_argument("--activate", action="store_true", help="Use the SQLite store from now on")
+    args = parser.parse_args()
+
+    if not migrate(args.source, args.target):
+        sys.exit(1)
+
+    if args.activate:
+        activate(args.target)
+    else:
+        print("💡 Set \"project_store\": \"sqlite\" in config/settings.json (or PROJECT_STORE=sqlite) to use it")
+
+
+if __name__ == "__main__":
+    main()
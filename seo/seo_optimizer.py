@@ -6,16 +6,14 @@ Implements language-specific SEO & content writing rules for English, Farsi (Per
 
 import re
 import json
-import yaml
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from urllib.parse import urlparse
 import requests
-from bs4 import BeautifulSoup
-import nltk
 from collections import Counter
 from core.settings_manager import SettingsManager
+from core.keyword_matcher import get_keyword_matcher
 try:
     import readability
 except ImportError:
@@ -25,6 +23,7 @@ import os
 class MultilingualSEOOptimizer:
     def __init__(self):
         """Initialize Multilingual SEO Optimizer with language-specific rule sets"""
+        import nltk
         
         # Initialize settings manager for language configs
         self.settings_manager = SettingsManager()
@@ -235,6 +234,7 @@ class MultilingualSEOOptimizer:
         word_count = len(words)
         
         # Sentence tokenization
+        import nltk
         sentences = nltk.sent_tokenize(content)
         sentence_count = len(sentences)
         
@@ -282,14 +282,17 @@ class MultilingualSEOOptimizer:
         
         total_words = len(words)
         
+        # Keywords are already lowercased, so a case-sensitive matcher over content_lower counts exactly like str.count
+        keyword_counts = get_keyword_matcher(tuple([primary_keyword] + secondary_keywords), case_sensitive=True).count(content_lower)
+        
         # Primary keyword analysis
-        primary_count = content_lower.count(primary_keyword)
+        primary_count = keyword_counts.get(primary_keyword, 0)
         primary_density = (primary_count / total_words * 100) if total_words > 0 else 0
         
         # Secondary keywords analysis
         secondary_analysis = {}
         for keyword in secondary_keywords:
-            count = content_lower.count(keyword)
+            count = keyword_counts.get(keyword, 0)
             density = (count / total_words * 100) if total_words > 0 else 0
             secondary_analysis[keyword] = {'count': count, 'density': density}
         
@@ -335,6 +338,7 @@ class MultilingualSEOOptimizer:
         
         # Paragraph analysis
         paragraphs = [p.strip() for p in content.split('\n\n') if p.strip() and not p.startswith('#')]
+        import nltk
         paragraph_lengths = [len(nltk.sent_tokenize(p)) for p in paragraphs]
         
         # List usage
@@ -349,6 +353,7 @@ class MultilingualSEOOptimizer:
                 raise ImportError("readability module not available")
         except:
             # Fallback calculation
+            import nltk
             sentences = len(nltk.sent_tokenize(content))
             words = len(content.split())
             syllables = self._count_syllables(content)
@@ -659,6 +664,7 @@ class MultilingualSEOOptimizer:
             
             # Optimize paragraph length
             elif line.strip() and not line.startswith('#'):
+                import nltk
                 sentences = nltk.sent_tokenize(line)
                 if len(sentences) > 4:
                     # Split long paragraphs
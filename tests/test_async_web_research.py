@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio research backend against a local aiohttp server
+"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from urllib.parse import quote_plus
+
+try:
+    import aiohttp
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    aiohttp = None
+
+from core.http_cache import HTTPResponseCache
+from core.rate_limiter import HostRateLimiter
+from core.research_store import ResearchStore
+from core.web_research_content import WebResearchContentGenerator
+
+if aiohttp is not None:
+    from core.async_web_research import AsyncWebResearchContentGenerator
+
+
+class RecordingResearchStore(ResearchStore):
+    """Research store that records which threads touch SQLite"""
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        self.threads = set()
+
+    def get_search_results(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().get_search_results(*args, **kwargs)
+
+    def save_search_results(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().save_search_results(*args, **kwargs)
+
+    def get_article(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().get_article(*args, **kwargs)
+
+    def save_article(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().save_article(*args, **kwargs)
+
+
+def rss_feed(base: str, query: str) -> str:
+    items = "".join(
+        f"<item><title>{query} story {number}</title><link>{base}/redirect/{query}-{number}</link>"
+        f"<pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate><description>{query}</description></item>"
+        for number in (1, 2))
+    return f"<?xml version='1.0'?><rss><channel>{items}</channel></rss>"
+
+
+def article_page(name: str) -> str:
+    return (f"<html><body><article><h1>{name}</h1><script>ignored()</script>"
+            f"<p>{name} reached 45% of companies in 2024, a unique finding about {name}.</p>"
+            f"<p>{' '.join(name for _ in range(40))}</p></article></body></html>")
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncWebResearch(unittest.IsolatedAsyncioTestCase):
+    """Search, redirect resolution and scraping over a real local HTTP server"""
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.requests = []
+
+        async def rss(request):
+            self.requests.append(("rss", request.query["q"]))
+            return web.Response(text=rss_feed(self.base, request.query["q"]), content_type="application/rss+xml")
+
+        async def redirect(request):
+            self.requests.append(("redirect", request.match_info["name"]))
+            raise web.HTTPFound(f"/article/{request.match_info['name']}")
+
+        async def article(request):
+            name = request.match_info["name"]
+            self.requests.append((f"article {request.method}", name))
+            if name.startswith("report"):
+                return web.Response(body=b"%PDF-1.7", content_type="application/pdf")
+            return web.Response(text=article_page(name), content_type="text/html")
+
+        async def throttled(request):
+            self.requests.append(("throttled", ""))
+            return web.Response(status=429, headers={"Retry-After": "86400"})
+
+        app = web.Application()
+        app.router.add_get("/rss", rss)
+        app.router.add_route("*", "/redirect/{name}", redirect)
+        app.router.add_get("/article/{name}", article)
+        app.router.add_get("/throttled", throttled)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.base = str(self.server.make_url("")).rstrip("/")
+
+        self.store = RecordingResearchStore(str(Path(self.temp_dir.name) / "research.sqlite"))
+        self.researcher = WebResearchContentGenerator(
+            rate_limiter=HostRateLimiter(default_rate=1000, default_burst=1000, max_retry_after=5),
+            http_cache=HTTPResponseCache(db_path=str(Path(self.temp_dir.name) / "http.sqlite")),
+            research_store=self.store)
+        self.researcher._google_news_search_url = lambda query: f"{self.base}/rss?q={quote_plus(query)}"
+        self.researcher.generate_topic_specific_queries = lambda topic: ["alpha", "beta"]
+        self.researcher.analyze_research_data = lambda scraped, topic="": []
+        self.async_researcher = AsyncWebResearchContentGenerator(self.researcher)
+
+    async def asyncTearDown(self):
+        await self.async_researcher.close()
+        await self.server.close()
+        self.temp_dir.cleanup()
+
+    async def test_research_topic(self):
+        """Searches, resolves and scrapes; blocking store calls stay off the event loop"""
+        research = await self.async_researcher.research_topic_comprehensively("topic")
+
+        self.assertEqual([item['title'] for item in research['articles']],
+                         ["alpha story 1", "alpha story 2", "beta story 1", "beta story 2"])
+        self.assertEqual(research['sources'][0], f"{self.base}/article/alpha-1")
+        # Redirects are followed with HEAD, so each article body is downloaded once
+        self.assertEqual(len([kind for kind, _ in self.requests if kind == "article GET"]), 4)
+        self.assertTrue(research['statistics'])
+
+        self.assertTrue(self.store.threads)
+        self.assertNotIn(threading.get_ident(), self.store.threads)
+
+    async def test_second_run_is_served_from_store(self):
+        """A repeated search is answered by the research store without requests"""
+        await self.async_researcher.research_topic_comprehensively("topic")
+        count = len(self.requests)
+        await self.async_researcher.search_google_news("alpha", resolve_urls=True)
+        self.assertEqual(len(self.requests), count)
+
+    async def test_scrape_respects_content_type_and_byte_cap(self):
+        """Non-HTML pages are skipped and bodies are cut at max_bytes"""
+        self.assertEqual(await self.async_researcher.scrape_article_content(f"{self.base}/article/report"), {})
+
+        self.researcher.scrape_config["max_bytes"] = 100
+        self.researcher.scrape_config["chunk_size"] = 32
+        response = await self.async_researcher._cached_get(f"{self.base}/article/long", 'article', max_bytes=100)
+        self.assertEqual(len(response.content), 100)
+
+    async def test_long_retry_after_is_not_waited_for(self):
+        """A day-long Retry-After returns the 429 at once instead of retrying"""
+        response = await self.async_researcher._request('GET', f"{self.base}/throttled")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(len(self.requests), 1)
+        self.assertLessEqual(self.researcher.rate_limiter.reserve(self.base), 5.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
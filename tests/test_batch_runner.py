@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent batch runner
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from core.batch_runner import BatchItem, BatchRunner, ThroughputMeter, create_stage_limits
+from core.concurrency_limits import ConcurrencyLimits
+from core.project_manager import MultilingualProjectManager
+from core.services import create_service_container
+
+
+class TestThroughputMeter(unittest.TestCase):
+    """Test completion counting and the hourly rate"""
+
+    def test_items_per_hour(self):
+        """Completions are scaled to an hour; failures are counted separately"""
+        meter = ThroughputMeter()
+        meter.started -= 60
+        for _ in range(3):
+            meter.record(True)
+        meter.record(False)
+
+        stats = meter.snapshot()
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["failed"], 1)
+        self.assertAlmostEqual(stats["items_per_hour"], 180.0, delta=5.0)
+
+
+def source(items):
+    """Hand out items one at a time from several workers, like a job queue"""
+    pending = list(items)
+    lock = threading.Lock()
+
+    def next_item():
+        with lock:
+            return pending.pop(0) if pending else None
+    return next_item
+
+
+class TestBatchRunner(unittest.TestCase):
+    """Test parallel execution, failures and stage caps"""
+
+    def test_items_run_in_parallel(self):
+        """Items overlap instead of running one after another"""
+        def process(item):
+            time.sleep(0.2)
+            return item.index
+
+        items = [BatchItem("project", f"keyword {index}", index) for index in range(1, 5)]
+        started = time.time()
+        finished = BatchRunner(process, max_workers=4).run_from(source(items))
+
+        self.assertLess(time.time() - started, 0.6)
+        self.assertEqual(sorted(item.content_index for item in finished), [1, 2, 3, 4])
+        self.assertTrue(all(item.success for item in finished))
+
+    def test_failures_are_recorded(self):
+        """Items returning None or raising are failed, not fatal"""
+        def process(item):
+            if item.index == 2:
+                raise RuntimeError("boom")
+            return None if item.index == 3 else item.index
+
+        runner = BatchRunner(process, max_workers=2)
+        finished = runner.run_from(source([BatchItem("project", "keyword", index) for index in range(1, 4)]))
+
+        self.assertEqual([item.success for item in sorted(finished, key=lambda item: item.index)], [True, False, False])
+        self.assertEqual(runner.get_stats()["failed"], 2)
+
+    def test_stage_cap_limits_overlap(self):
+        """A stage never runs more items at once than its cap"""
+        stages = create_stage_limits({"save": 2})
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def process(item):
+            with stages.slot("save"):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+            return item.index
+
+        BatchRunner(process, max_workers=6).run_from(source([BatchItem("project", "keyword", index) for index in range(6)]))
+        self.assertEqual(peak[0], 2)
+
+
+class TestProviderSlotsBeforeStageSlots(unittest.TestCase):
+    """Items queued for a busy provider must not starve other providers of llm slots"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.manager = MultilingualProjectManager(services=create_service_container())
+        self.manager.stage_limits = create_stage_limits({"llm": 2})
+        self.manager.provider_limits = ConcurrencyLimits(default_limit=1)
+        # Research, prompt enrichment and saving need the network or NLTK data
+        self.manager.perform_targeted_research = lambda project, keyword: {}
+        self.manager.create_enhanced_prompt = lambda project, keyword, research_data: ""
+        self.manager.save_project_content = lambda project, content_data, keyword: f"{keyword}.md"
+
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+        def generate(topic, content_type="blog_post", provider=None, cache_scope=None):
+            if provider == "deepseek":
+                self.started.set()
+                self.release.wait(5)
+            return f"{topic} article"
+
+        self.manager.local_llm.generate_content_with_local_llm = generate
+
+    def tearDown(self):
+        self.release.set()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_blocked_provider_does_not_hold_llm_slots(self):
+        """With provider A stuck, more A items queue on A while provider B items still finish"""
+        slow = self.manager.create_project("Slow", "", ["a"], "local_llm", target_count=5, llm_model="deepseek")
+        fast = self.manager.create_project("Fast", "", ["b"], "local_llm", target_count=3, llm_model="llamacpp")
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            blocked = [executor.submit(self.manager._generate_content_item, slow, "a")]
+            self.assertTrue(self.started.wait(5))
+            blocked += [executor.submit(self.manager._generate_content_item, slow, "a") for _ in range(2)]
+            time.sleep(0.1)
+
+            finished = [executor.submit(self.manager._generate_content_item, fast, "b") for _ in range(3)]
+            results = [future.result(timeout=3) for future in finished]
+            self.assertTrue(all(future.running() for future in blocked))
+
+            self.release.set()
+            self.assertTrue(all(future.result(timeout=5) for future in blocked))
+
+        self.assertEqual(sorted(results), [1, 2, 3])
+        self.assertEqual(self.manager.projects[slow].completed_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
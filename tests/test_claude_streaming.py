@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for Claude streaming generation against a local mock SSE server
+"""
+
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from content.claude_content import ClaudeContentGenerator, _claim_checkpoint, _release_checkpoint
+
+
+def sse_events(texts, complete=True, output_tokens=10):
+    """Build the Messages API event sequence for the given text deltas"""
+    events = [
+        ("message_start", {"type": "message_start", "message": {"usage": {"input_tokens": 25, "output_tokens": 1}}}),
+        ("content_block_start", {"type": "content_block_start", "index": 0,
+                                 "content_block": {"type": "text", "text": ""}}),
+    ]
+    for text in texts:
+        events.append(("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                               "delta": {"type": "text_delta", "text": text}}))
+    if complete:
+        events += [
+            ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+            ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"},
+                               "usage": {"output_tokens": output_tokens}}),
+            ("message_stop", {"type": "message_stop"}),
+        ]
+    return events
+
+
+class MockSSEHandler(BaseHTTPRequestHandler):
+    """Replays one scripted event list per request and records the request bodies"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        events = self.server.scripts.pop(0)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for event_type, data in events:
+            self.wfile.write(f"event: {event_type}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        # Closing without message_stop simulates a dropped connection
+
+    def log_message(self, *args):
+        pass
+
+
+class TestClaudeStreaming(unittest.TestCase):
+    """Test SSE parsing, checkpointing and continuation"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MockSSEHandler)
+        self.server.scripts = []
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.generator = ClaudeContentGenerator()
+        self.generator.api_key = "test-key"
+        self.generator.api_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/messages"
+        self.generator.streaming_config["checkpoint_dir"] = self.temp_dir.name
+        self.generator.streaming_config["retry_delay"] = 0
+        self.generator.llm_cache = None
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def test_complete_stream(self):
+        """Deltas are joined, usage is recorded and the checkpoint is removed"""
+        self.server.scripts = [sse_events(["Hello", ", ", "world"])]
+
+        generation = self.generator.generate_with_details("Say hello")
+        self.assertEqual(generation.content, "Hello, world")
+        self.assertTrue(self.server.requests[0]["stream"])
+        self.assertEqual(generation.metrics["input_tokens"], 25)
+        self.assertEqual(generation.metrics["output_tokens"], 10)
+        self.assertFalse(hasattr(self.generator, "last_generation_metrics"))
+        self.assertEqual(list(Path(self.temp_dir.name).iterdir()), [])
+
+    def test_dropped_stream_continues_from_partial(self):
+        """A dropped stream is continued with the partial text as an assistant prefill"""
+        self.server.scripts = [sse_events(["# Title\n\n", "First part "], complete=False),
+                               sse_events([" and the rest."])]
+
+        generation = self.generator.generate_with_details("Write an article")
+
+        self.assertEqual(generation.content, "# Title\n\nFirst part and the rest.")
+        continuation = self.server.requests[1]["messages"]
+        self.assertEqual(continuation[-1], {"role": "assistant", "content": "# Title\n\nFirst part"})
+        self.assertEqual(generation.metrics["resumes"], 1)
+        self.assertEqual(self.generator.max_tokens, 8000)
+
+    def test_failed_generation_keeps_checkpoint(self):
+        """Text survives in the checkpoint when every attempt fails, and a rerun picks it up"""
+        self.generator.streaming_config["max_resume_attempts"] = 0
+        self.server.scripts = [sse_events(["Saved text"], complete=False)]
+
+        self.assertIsNone(self.generator.generate_content_with_custom_prompt("Prompt"))
+        checkpoint = self.generator._checkpoint_path("Prompt")
+        self.assertEqual(checkpoint.read_text(encoding="utf-8"), "Saved text")
+
+        self.server.scripts = [sse_events([" continued."])]
+        self.assertEqual(self.generator.generate_content_with_custom_prompt("Prompt"), "Saved text continued.")
+        self.assertEqual(self.server.requests[1]["messages"][-1]["content"], "Saved text")
+        self.assertFalse(checkpoint.exists())
+
+    def test_concurrent_identical_request_gets_its_own_checkpoint(self):
+        """A request whose checkpoint is held by another generation neither resumes nor removes its text"""
+        checkpoint = self.generator._checkpoint_path("Prompt")
+        self.assertTrue(_claim_checkpoint(checkpoint))
+        try:
+            checkpoint.write_text("Other request's text", encoding="utf-8")
+            self.server.scripts = [sse_events(["Own text."])]
+
+            self.assertEqual(self.generator.generate_content_with_custom_prompt("Prompt"), "Own text.")
+            self.assertEqual(len(self.server.requests[0]["messages"]), 1)
+            self.assertEqual(checkpoint.read_text(encoding="utf-8"), "Other request's text")
+            self.assertEqual(list(Path(self.temp_dir.name).iterdir()), [checkpoint])
+        finally:
+            _release_checkpoint(checkpoint)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
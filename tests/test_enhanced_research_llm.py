@@ -167,6 +167,22 @@ class TestEnhancedResearchLLMGenerator(unittest.TestCase):
         self.assertEqual(generator.local_llm, self.mock_local_llm)
         self.assertEqual(generator.seo_optimizer, self.mock_seo_optimizer)
     
+    def test_llm_provider_is_passed_per_call(self):
+        """Enhancement passes its provider to the shared local LLM instead of switching the LLM's default"""
+        generator = EnhancedResearchLLMGenerator(
+            web_researcher=self.mock_web_researcher,
+            local_llm=self.mock_local_llm,
+            seo_optimizer=self.mock_seo_optimizer
+        )
+        generator._create_research_enhanced_prompt = lambda topic, research_data: "research prompt"
+        generator._merge_research_and_llm_content = lambda *args: {"content": "merged"}
+        
+        generator.enhance_with_local_llm("topic", {}, {}, "llamacpp")
+        
+        self.mock_local_llm.set_provider.assert_not_called()
+        self.mock_local_llm.test_connection.assert_called_with("llamacpp")
+        self.assertEqual(self.mock_local_llm.generate_content_with_local_llm.call_args.kwargs["provider"], "llamacpp")
+    
     def test_content_generation_success(self):
         """Test successful content generation"""
         generator = EnhancedResearchLLMGenerator(
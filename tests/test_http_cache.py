@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent HTTP response cache
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+from core.http_cache import HTTPResponseCache, normalize_url
+
+
+def make_response(status_code=200, content=b"<rss></rss>", headers=None, url="https://example.com/feed"):
+    return Mock(status_code=status_code, content=content, headers=headers or {}, url=url)
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    """Test cache key normalization"""
+
+    def test_equivalent_urls_share_key(self):
+        """Case, default ports, fragments, tracking params and query order are ignored"""
+        self.assertEqual(
+            normalize_url("HTTPS://Example.com:443/a?b=2&a=1&utm_source=x#top"),
+            normalize_url("https://example.com/a?a=1&b=2"))
+
+    def test_different_queries_differ(self):
+        """Meaningful query parameters stay in the key"""
+        self.assertNotEqual(normalize_url("https://example.com/?q=a"), normalize_url("https://example.com/?q=b"))
+
+
+class TestHTTPResponseCache(unittest.TestCase):
+    """Test hits, revalidation and eviction"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = HTTPResponseCache(db_path=str(Path(self.temp_dir.name) / "http.sqlite"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_fresh_entry_is_served_without_fetch(self):
+        """A second fetch within the TTL never calls the network"""
+        fetcher = Mock(return_value=make_response(headers={"ETag": '"v1"'}))
+        first = self.cache.fetch("https://example.com/feed", "rss", fetcher)
+        second = self.cache.fetch("https://example.com/feed", "rss", fetcher)
+
+        self.assertEqual(fetcher.call_count, 1)
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.content, b"<rss></rss>")
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_stale_entry_is_revalidated(self):
+        """Stale entries send validators and reuse the body on 304"""
+        cache = HTTPResponseCache(db_path=str(Path(self.temp_dir.name) / "stale.sqlite"), ttls={"rss": 0})
+        cache.fetch("https://example.com/feed", "rss",
+                    Mock(return_value=make_response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})))
+        time.sleep(0.01)
+
+        fetcher = Mock(return_value=make_response(status_code=304, content=b""))
+        result = cache.fetch("https://example.com/feed", "rss", fetcher)
+
+        sent_headers = fetcher.call_args[0][0]
+        self.assertEqual(sent_headers["If-None-Match"], '"v1"')
+        self.assertEqual(sent_headers["If-Modified-Since"], "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertEqual(result.content, b"<rss></rss>")
+        self.assertEqual(cache.get_stats()["revalidated"], 1)
+
+    def test_errors_are_not_cached(self):
+        """Non-200 responses are returned but not stored"""
+        fetcher = Mock(return_value=make_response(status_code=500, content=b"error"))
+        self.cache.fetch("https://example.com/feed", "rss", fetcher)
+        self.cache.fetch("https://example.com/feed", "rss", fetcher)
+        self.assertEqual(fetcher.call_count, 2)
+
+    def test_eviction_keeps_cache_under_budget(self):
+        """Least recently used entries are dropped once the size budget is exceeded"""
+        cache = HTTPResponseCache(db_path=str(Path(self.temp_dir.name) / "small.sqlite"), max_size_bytes=3000)
+        for index in range(10):
+            body = os.urandom(1024)  # Incompressible, so each entry takes real space
+            cache.fetch(f"https://example.com/{index}", "article", Mock(return_value=make_response(content=body)))
+
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["size_bytes"], 3000)
+        self.assertGreater(stats["evicted"], 0)
+
+    def test_redirects_are_remembered(self):
+        """Resolved redirects are served from the cache"""
+        self.assertIsNone(self.cache.get_redirect("https://news.google.com/rss/articles/abc"))
+        self.cache.store_redirect("https://news.google.com/rss/articles/abc", "https://example.com/story")
+        self.assertEqual(self.cache.get_redirect("https://news.google.com/rss/articles/abc"),
+                         ("https://example.com/story", True))
+
+    def test_failed_redirects_expire_sooner(self):
+        """Failed resolutions are cached negatively with their own TTL"""
+        cache = HTTPResponseCache(db_path=str(Path(self.temp_dir.name) / "neg.sqlite"), negative_redirect_ttl=0)
+        cache.store_redirect("https://news.google.com/rss/articles/bad", None, resolved=False)
+        self.assertIsNone(cache.get_redirect("https://news.google.com/rss/articles/bad"))
+
+        self.cache.store_redirect("https://news.google.com/rss/articles/bad", None, resolved=False)
+        self.assertEqual(self.cache.get_redirect("https://news.google.com/rss/articles/bad"), (None, False))
+
+    def test_content_type_is_kept(self):
+        """Cache hits carry the server's Content-Type, also in databases created before it was stored"""
+        db_path = Path(self.temp_dir.name) / "legacy.sqlite"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("""CREATE TABLE responses (url TEXT PRIMARY KEY, final_url TEXT, content_type TEXT,
+                        status_code INTEGER, body BLOB, size INTEGER, etag TEXT, last_modified TEXT,
+                        fetched_at REAL, expires_at REAL, last_accessed REAL, fetch_seconds REAL)""")
+        conn.close()
+
+        cache = HTTPResponseCache(db_path=str(db_path))
+        fetcher = Mock(return_value=make_response(content=b"%PDF", headers={"Content-Type": "application/pdf"}))
+        cache.fetch("https://example.com/report", "article", fetcher)
+        cached = cache.fetch("https://example.com/report", "article", fetcher)
+
+        self.assertTrue(cached.from_cache)
+        self.assertEqual(cached.headers.get("content-type"), "application/pdf")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the durable content job queue
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from core.batch_runner import BatchItem
+from core.job_queue import CANCELLED, DONE, FAILED, LEASED, PENDING, JobQueue
+from core.llm_cache import LLMResponseCache
+from core.project_manager import MultilingualProjectManager
+from core.services import create_service_container
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test enqueueing, leases, retries and completion"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.queue = JobQueue(str(Path(self.temp_dir) / "jobs.sqlite"), lease_seconds=60,
+                              max_attempts=2, backoff_seconds=30)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def expire(self, job):
+        conn = self.queue._connection()
+        conn.execute("UPDATE jobs SET lease_expires = 0, available_at = 0 WHERE id = ?", (job.id,))
+
+    def test_enqueue_is_idempotent(self):
+        """Re-enqueueing keeps existing jobs; completed items start as done"""
+        self.assertEqual(self.queue.enqueue_project("p1", ["a", "b"], 5, completed_count=2), 5)
+        self.assertEqual(self.queue.enqueue_project("p1", ["a", "b"], 5, completed_count=0), 0)
+        self.assertEqual(self.queue.counts("p1"), {PENDING: 3, LEASED: 0, DONE: 2, FAILED: 0, CANCELLED: 0})
+
+        job = self.queue.lease("worker")
+        self.assertEqual((job.item_index, job.keyword), (3, "a"))
+
+    def test_empty_inputs(self):
+        """A project without keywords is rejected, and no projects have no retry time"""
+        with self.assertRaises(ValueError):
+            self.queue.enqueue_project("p1", [], 3)
+        self.assertEqual(sum(self.queue.counts("p1").values()), 0)
+        self.assertIsNone(self.queue.next_retry_in([]))
+
+    def test_leases_are_exclusive(self):
+        """Concurrent workers never lease the same job"""
+        self.queue.enqueue_project("p1", ["a"], 20)
+        leased, lock = [], threading.Lock()
+
+        def worker(name):
+            while True:
+                job = self.queue.lease(name)
+                if job is None:
+                    return
+                with lock:
+                    leased.append(job.id)
+
+        threads = [threading.Thread(target=worker, args=(f"w{index}",)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(leased), 20)
+        self.assertEqual(len(set(leased)), 20)
+
+    def test_completion_is_idempotent(self):
+        """Only the first completion counts, even after the lease moved to another worker"""
+        self.queue.enqueue_project("p1", ["a"], 1)
+        first = self.queue.lease("w1")
+        self.expire(first)
+        second = self.queue.lease("w2")
+
+        self.assertFalse(self.queue.heartbeat(first))
+        self.assertTrue(self.queue.heartbeat(second))
+        self.assertTrue(self.queue.complete(second, "file.md"))
+        self.assertFalse(self.queue.complete(first, "file.md"))
+        self.assertEqual(self.queue.counts("p1")[DONE], 1)
+
+    def test_retries_with_backoff_then_fail(self):
+        """A failed job waits out its backoff and is failed after the last attempt"""
+        self.queue.enqueue_project("p1", ["a"], 1)
+        job = self.queue.lease("w1")
+        self.assertEqual(self.queue.fail(job, "timeout"), PENDING)
+
+        self.assertIsNone(self.queue.lease("w1"))
+        self.assertGreater(self.queue.next_retry_in(["p1"]), 25)
+
+        self.expire(job)
+        job = self.queue.lease("w1")
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(self.queue.fail(job, "timeout"), FAILED)
+        self.assertIsNone(self.queue.next_retry_in(["p1"]))
+
+        self.assertEqual(self.queue.retry_failed("p1"), 1)
+        self.assertIsNotNone(self.queue.lease("w1"))
+
+    def test_cancel_closes_without_retry(self):
+        """A cancelled job is neither retried nor counted as done"""
+        self.queue.enqueue_project("p1", ["a"], 1)
+        job = self.queue.lease("w1")
+
+        self.assertTrue(self.queue.cancel(job, "project target reached"))
+        self.assertEqual(self.queue.fail(job, "generation failed"), CANCELLED)
+        self.assertIsNone(self.queue.lease("w1"))
+        self.assertIsNone(self.queue.next_retry_in(["p1"]))
+        counts = self.queue.counts("p1")
+        self.assertEqual((counts[DONE], counts[CANCELLED]), (0, 1))
+
+
+class TestQueuedProjectItems(unittest.TestCase):
+    """Leased jobs of a project that has already reached its target"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.manager = MultilingualProjectManager(services=create_service_container())
+        self.manager.job_queue = JobQueue(str(Path(self.temp_dir) / "jobs.sqlite"))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_job_of_completed_project_is_cancelled(self):
+        """The job is closed rather than failed into retries"""
+        project_id = self.manager.create_project("Done", "", ["a"], "template", target_count=2)
+        # The queue lags behind the project, e.g. another process finished the items
+        self.manager.job_queue.enqueue_project(project_id, ["a"], 2)
+        self.manager.projects[project_id].completed_count = 2
+
+        job = self.manager.job_queue.lease("w1")
+        self.assertIsNone(self.manager._run_job(BatchItem(project_id, job.keyword, job.item_index, job=job)))
+
+        counts = self.manager.job_queue.counts(project_id)
+        self.assertEqual((counts[CANCELLED], counts[PENDING], counts[FAILED]), (1, 1, 0))
+        self.assertEqual(self.manager.projects[project_id].completed_count, 2)
+
+    def test_project_without_keywords_is_skipped(self):
+        """A keywordless project is left out of the batch instead of aborting it"""
+        project_id = self.manager.create_project("Empty", "", [], "template", target_count=2)
+
+        self.assertEqual(self.manager.run_projects([project_id]), {})
+        self.assertEqual(sum(self.manager.job_queue.counts(project_id).values()), 0)
+
+    def test_items_with_the_same_keyword_are_generated_separately(self):
+        """The response cache is scoped to the job, so repeated keywords never republish one article"""
+        project_id = self.manager.create_project("Repeat", "", ["seo"], "local_llm", target_count=2)
+        self.manager.job_queue.enqueue_project(project_id, ["seo"], 2)
+        # Research, prompt enrichment and saving need the network or NLTK data
+        self.manager.perform_targeted_research = lambda project, keyword: {}
+        self.manager.create_enhanced_prompt = lambda project, keyword, research_data: ""
+        self.manager.save_project_content = lambda project, content_data, keyword: content_data["content"]
+
+        local_llm = self.manager.local_llm
+        local_llm.llm_cache = LLMResponseCache(str(Path(self.temp_dir) / "llm.sqlite"))
+        prompts = []
+
+        def run_generation(prompt, generation, resume_from=None):
+            prompts.append(prompt)
+            return f"Article {len(prompts)} about seo"
+
+        local_llm._run_generation = run_generation
+
+        first, second = self.manager.job_queue.lease("w1"), self.manager.job_queue.lease("w1")
+        self.assertEqual((first.keyword, second.keyword), ("seo", "seo"))
+        for job in (first, second):
+            self.assertIsNotNone(self.manager._generate_content_item(project_id, job.keyword, job=job))
+
+        self.assertEqual(len(prompts), 2)
+        self.assertEqual(prompts[0], prompts[1])
+
+        # A retry of the same job is served its cached article
+        self.assertEqual(local_llm.generate_content_with_local_llm("seo", "blog_post", cache_scope=first.id),
+                         "Article 1 about seo")
+        self.assertEqual(len(prompts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Aho-Corasick keyword matcher
+"""
+
+import unittest
+from unittest.mock import patch
+
+from core.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test matching semantics against the str methods they replace"""
+
+    def test_overlapping_keywords(self):
+        """Keywords that share prefixes or contain each other are all found"""
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        matches = sorted(matcher.iter_matches("ushers"))
+        self.assertEqual(matches, [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+    def test_counts_match_str_count(self):
+        """Counts are non-overlapping per keyword, like str.count"""
+        text = "aaaa marketing automation and marketing automation tools; automation"
+        keywords = ["aa", "marketing automation", "automation", "missing"]
+        counts = KeywordMatcher(keywords).count(text)
+        self.assertEqual(counts, {keyword: text.count(keyword) for keyword in keywords})
+
+    def test_automaton_counts_match_str_count(self):
+        """Large keyword sets are counted by the automaton with the same results"""
+        text = "aaaa marketing automation and marketing automation tools; automation"
+        keywords = ["aa", "marketing automation", "automation", "missing"]
+        with patch("core.keyword_matcher.DIRECT_COUNT_LIMIT", 0):
+            counts = KeywordMatcher(keywords).count(text)
+        self.assertEqual(counts, {keyword: text.count(keyword) for keyword in keywords})
+
+    def test_spans_survive_length_changing_lowercase(self):
+        """Characters that lowercase to two code points do not shift the reported spans"""
+        text = "İstanbul hosts the Digital Marketing summit"
+        start, end = KeywordMatcher(["digital marketing"]).first_matches(text)["digital marketing"]
+        self.assertEqual(text[start:end], "Digital Marketing")
+
+        start, end = KeywordMatcher(["istanbul"]).first_matches("Visit ISTANBUL")["istanbul"]
+        self.assertEqual((start, end), (6, 14))
+
+    def test_case_insensitive_by_default(self):
+        """Matching ignores case unless asked not to"""
+        self.assertEqual(KeywordMatcher(["seo"]).count("SEO and seo"), {"seo": 2})
+        self.assertEqual(KeywordMatcher(["AI"], case_sensitive=True).count("AI said"), {"AI": 1})
+        self.assertEqual(KeywordMatcher(["AI"], case_sensitive=True).count("said"), {"AI": 0})
+
+    def test_case_sensitive_counts_over_lowered_text(self):
+        """Lowercased keywords over lowercased content count exactly like str.count, as the SEO density check needs"""
+        content_lower = "AI Marketing tools. ai-marketing wins; İstanbul marketing".lower()
+        keywords = ["ai marketing", "marketing", "istanbul", "i̇stanbul"]
+        counts = get_keyword_matcher(tuple(keywords), case_sensitive=True).count(content_lower)
+        self.assertEqual(counts, {keyword: content_lower.count(keyword) for keyword in keywords})
+
+    def test_first_matches_report_spans(self):
+        """First occurrence spans point into the original text"""
+        text = "Intro. Digital Marketing grows; digital marketing again."
+        spans = KeywordMatcher(["digital marketing", "grows"]).first_matches(text)
+        start, end = spans["digital marketing"]
+        self.assertEqual(text[start:end], "Digital Marketing")
+        self.assertIn("grows", spans)
+
+    def test_find_any(self):
+        """find_any returns the earliest keyword or None"""
+        matcher = KeywordMatcher(["energy", "oil"])
+        self.assertEqual(matcher.find_any("Oil and energy"), "oil")
+        self.assertIsNone(matcher.find_any("gardening"))
+
+    def test_matchers_are_cached(self):
+        """The same keyword set reuses one automaton"""
+        self.assertIs(get_keyword_matcher(("a", "b")), get_keyword_matcher(("a", "b")))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Unit tests for lazy package exports and deferred heavy imports
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("bs4", "nltk", "yaml", "markdown", "schedule")
+
+
+def loaded_after(statement: str) -> list:
+    """Heavy modules present after running an import statement in a fresh interpreter"""
+    code = f"import sys\n{statement}\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=ROOT))
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+class TestLazyImports(unittest.TestCase):
+    """Importing a module loads only what it needs"""
+
+    def test_settings_manager_is_light(self):
+        """A dashboard importing the settings manager does not pull in the generator stack"""
+        self.assertEqual(loaded_after("import core.settings_manager\n"
+                                      "assert 'core.project_manager' not in sys.modules"), [])
+
+    def test_entry_points_defer_heavy_imports(self):
+        """Parsers, NLTK and schedulers load when used, not when imported"""
+        self.assertEqual(loaded_after("import core.enhanced_research_llm"), [])
+        self.assertEqual(loaded_after("import publishing.publishing_scheduler"), [])
+
+    def test_seo_analyzer_imports(self):
+        """The SEO entry point imports without a circular import through the core package"""
+        self.assertNotIn("nltk", loaded_after("import seo.seo_analyzer"))
+
+    def test_package_exports(self):
+        """Package exports resolve on first access"""
+        import core
+        from core.settings_manager import SettingsManager
+
+        self.assertIs(core.SettingsManager, SettingsManager)
+        self.assertIn("ContentProject", dir(core))
+        with self.assertRaises(AttributeError):
+            core.NotAnExport
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent LLM response cache
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.llm_cache import LLMResponseCache, make_cache_key
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test keys, hits, bypass and eviction"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = LLMResponseCache(db_path=str(Path(self.temp_dir.name) / "llm.sqlite"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_covers_every_parameter(self):
+        """Changing any generation input changes the key"""
+        base = make_cache_key("deepseek", "deepseek-r1:32b", "prompt", 0.7, 4000)
+        self.assertEqual(base, make_cache_key("deepseek", "deepseek-r1:32b", "prompt", 0.7, 4000))
+        for variant in [("claude", "deepseek-r1:32b", "prompt", 0.7, 4000),
+                        ("deepseek", "deepseek-r1:14b", "prompt", 0.7, 4000),
+                        ("deepseek", "deepseek-r1:32b", "prompt!", 0.7, 4000),
+                        ("deepseek", "deepseek-r1:32b", "prompt", 0.2, 4000),
+                        ("deepseek", "deepseek-r1:32b", "prompt", 0.7, 2000)]:
+            self.assertNotEqual(base, make_cache_key(*variant))
+        self.assertNotEqual(base, make_cache_key("deepseek", "deepseek-r1:32b", "prompt", 0.7, 4000, "job-1"))
+
+    def test_get_or_generate_caches_results(self):
+        """The second call is served from cache without generating"""
+        calls = []
+
+        def generate():
+            calls.append(1)
+            return "Generated article"
+
+        args = ("claude", "claude-sonnet-4-20250514", "Write about SEO", 0.7, 8000)
+        self.assertEqual(self.cache.get_or_generate(*args, generate), "Generated article")
+        self.assertEqual(self.cache.get_or_generate(*args, generate), "Generated article")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_bypass_regenerates_and_refreshes(self):
+        """Bypass skips the cached value and stores the new one"""
+        args = ("ollama", "llama3", "prompt", 0.7, 1000)
+        self.cache.put(*args, "old")
+        self.assertEqual(self.cache.get_or_generate(*args, lambda: "new", bypass=True), "new")
+        self.assertEqual(self.cache.get(*args), "new")
+
+    def test_failures_are_not_cached(self):
+        """Empty or failed generations are retried next time"""
+        args = ("ollama", "llama3", "prompt", 0.7, 1000)
+        self.assertIsNone(self.cache.get_or_generate(*args, lambda: None))
+        self.assertIsNone(self.cache.get(*args))
+
+    def test_lru_eviction(self):
+        """Least recently used entries are dropped first once over budget"""
+        self.cache.max_size_bytes = 4000
+        for index in range(3):
+            self.cache.put("ollama", "llama3", f"prompt {index}", 0.7, 1000, os.urandom(1000).hex())
+        self.cache.get("ollama", "llama3", "prompt 0", 0.7, 1000)
+        self.cache.put("ollama", "llama3", "prompt 3", 0.7, 1000, os.urandom(1000).hex())
+
+        self.assertIsNotNone(self.cache.get("ollama", "llama3", "prompt 0", 0.7, 1000))
+        self.assertIsNone(self.cache.get("ollama", "llama3", "prompt 1", 0.7, 1000))
+        self.assertLessEqual(self.cache.get_stats()["size_bytes"], 4000)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
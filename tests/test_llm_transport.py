@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pooled LLM transport
+"""
+
+import unittest
+
+from core.llm_transport import LLMTransport
+
+
+class TestLLMTransport(unittest.TestCase):
+    """Test session pooling per endpoint"""
+
+    def test_sessions_are_shared_per_endpoint(self):
+        """Paths on one endpoint share a session; other endpoints get their own"""
+        transport = LLMTransport()
+        generate = transport.session_for("http://localhost:11434/api/generate")
+        tags = transport.session_for("http://LOCALHOST:11434/api/tags")
+        llamacpp = transport.session_for("http://localhost:8080/completion")
+
+        self.assertIs(generate, tags)
+        self.assertIsNot(generate, llamacpp)
+        self.assertEqual(transport.get_stats(), {"http://localhost:11434": 2, "http://localhost:8080": 1})
+        transport.close()
+
+    def test_adapter_settings(self):
+        """Pool size can be set per endpoint and POST is retried only before it is sent"""
+        transport = LLMTransport(pool_maxsize=4, pool_sizes={"https://api.anthropic.com/v1/messages": 16})
+        adapter = transport.session_for("https://api.anthropic.com/v1/messages").get_adapter("https://api.anthropic.com")
+        default_adapter = transport.session_for("http://localhost:11434/api/generate").get_adapter("http://localhost")
+
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(default_adapter._pool_maxsize, 4)
+        self.assertIn("POST", adapter.max_retries.allowed_methods)
+        self.assertEqual(adapter.max_retries.read, 0)
+        transport.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for local LLM streaming (Ollama NDJSON and llama.cpp SSE) against a local mock server
+"""
+
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.local_llm_content import MultilingualLocalLLMContentGenerator
+from core.provider_health import ProviderHealthRegistry
+
+
+def ollama_lines(texts, done=True):
+    """Ollama /api/generate NDJSON lines; the final line carries the timings"""
+    lines = [json.dumps({"response": text, "done": False}) for text in texts]
+    if done:
+        lines.append(json.dumps({"response": "", "done": True, "load_duration": 2_000_000_000,
+                                 "eval_count": 40, "eval_duration": 500_000_000}))
+    return lines
+
+
+def sse_lines(texts, stop=True):
+    """llama.cpp /completion server-sent events"""
+    lines = [f"data: {json.dumps({'content': text, 'stop': False})}" for text in texts]
+    if stop:
+        lines.append(f"data: {json.dumps({'content': '', 'stop': True})}")
+    return lines
+
+
+class MockStreamHandler(BaseHTTPRequestHandler):
+    """Replays scripted lines per request, picked by the first word of the prompt, with
+    chunked transfer encoding like Ollama and llama.cpp. A number in a script pauses the
+    stream for that many seconds; the stream ends with the script, with or without a final event."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        key = body["prompt"].split()[0]
+        with self.server.lock:
+            self.server.requests.append(body)
+            script = self.server.scripts[key].pop(0)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for step in script:
+                if isinstance(step, (int, float)):
+                    time.sleep(step)
+                    continue
+                data = f"{step}\n".encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLocalLLMStreaming(unittest.TestCase):
+    """Streaming, idle timeouts and resuming partial generations"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MockStreamHandler)
+        self.server.scripts = {}
+        self.server.requests = []
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.generator = MultilingualLocalLLMContentGenerator()
+        self.generator.llm_cache = None
+        self.generator.health = ProviderHealthRegistry()
+        self.generator.providers["deepseek"]["api_url"] = f"{base}/api/generate"
+        self.generator.providers["llamacpp"]["api_url"] = f"{base}/completion"
+        self.generator.streaming_config["idle_timeout"] = 0.5
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_ollama_stream(self):
+        """NDJSON chunks are joined and the final chunk's timings are recorded for this call"""
+        self.server.scripts["alpha"] = [ollama_lines(["Hello ", "world"])]
+        generation = self.generator.generate_with_details("alpha prompt", provider="deepseek")
+
+        self.assertEqual(generation.content, "Hello world")
+        self.assertEqual(generation.partial, "")
+        self.assertTrue(generation.metrics["completed"])
+        self.assertEqual(generation.metrics["chunks"], 2)
+        self.assertIsNotNone(generation.metrics["ttft_seconds"])
+        self.assertAlmostEqual(generation.metrics["load_seconds"], 2.0)
+        self.assertAlmostEqual(generation.metrics["tokens_per_second"], 80.0)
+        self.assertTrue(self.server.requests[0]["stream"])
+
+    def test_dropped_ollama_stream_is_resumed(self):
+        """A stream that closes before its final chunk is continued from the partial text"""
+        self.server.scripts["alpha"] = [ollama_lines(["First half. "], done=False),
+                                        ollama_lines(["Second half."])]
+        generation = self.generator.generate_with_details("alpha prompt", provider="deepseek")
+
+        self.assertEqual(generation.content, "First half. Second half.")
+        self.assertEqual(generation.metrics["resumes"], 1)
+        resumed_prompt = self.server.requests[1]["prompt"]
+        self.assertIn("cut off", resumed_prompt)
+        self.assertTrue(resumed_prompt.endswith("First half. "))
+
+    def test_llamacpp_stream_is_resumed_by_extending_the_prompt(self):
+        """llama.cpp SSE resumes by appending the partial text to the raw prompt"""
+        self.server.scripts["alpha"] = [sse_lines(["Once upon "], stop=False), sse_lines(["a time."])]
+        generation = self.generator.generate_with_details("alpha prompt", provider="llamacpp")
+
+        self.assertEqual(generation.content, "Once upon a time.")
+        self.assertEqual(self.server.requests[1]["prompt"], "alpha promptOnce upon ")
+
+    def test_idle_timeout_triggers_resume(self):
+        """Silence longer than idle_timeout interrupts the stream, which is then resumed"""
+        self.server.scripts["alpha"] = [ollama_lines(["Slow "], done=False) + [2.0] + ollama_lines(["never"]),
+                                        ollama_lines(["recovered."])]
+        started = time.time()
+        generation = self.generator.generate_with_details("alpha prompt", provider="deepseek")
+
+        self.assertEqual(generation.content, "Slow recovered.")
+        self.assertEqual(generation.metrics["resumes"], 1)
+        self.assertLess(time.time() - started, 2.0)
+
+    def test_partials_belong_to_their_call(self):
+        """Concurrent failed calls on one generator each get their own partial to resume from"""
+        self.generator.streaming_config["max_resume_attempts"] = 0
+        self.server.scripts["alpha"] = [ollama_lines(["alpha draft "], done=False), ollama_lines(["alpha end"])]
+        self.server.scripts["beta"] = [ollama_lines(["beta draft "], done=False)]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            alpha, beta = executor.map(
+                lambda prompt: self.generator.generate_with_details(prompt, provider="deepseek"),
+                ["alpha prompt", "beta prompt"])
+
+        self.assertIsNone(alpha.content)
+        self.assertEqual(alpha.partial, "alpha draft ")
+        self.assertEqual(beta.partial, "beta draft ")
+        self.assertFalse(hasattr(self.generator, "last_partial_output"))
+
+        resumed = self.generator.generate_with_details("alpha prompt", provider="deepseek", resume_from=alpha.partial)
+        self.assertEqual(resumed.content, "alpha draft alpha end")
+        self.assertNotIn("beta", self.server.requests[-1]["prompt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
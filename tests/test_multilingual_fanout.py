@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Unit tests for multilingual fan-out generation with stubbed models and research
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from content.auto_content_system import AutoContentSystem
+from core.concurrency_limits import ConcurrencyLimits
+from core.local_llm_content import MultilingualLocalLLMContentGenerator
+from core.services import ServiceContainer
+
+
+class FakeResearcher:
+    """Counts research passes and returns one statistic"""
+
+    def __init__(self):
+        self.topics = []
+
+    def research_topic_comprehensively(self, topic):
+        self.topics.append(topic)
+        return {'statistics': [{'value': '45%', 'context': 'of companies adopted it'}], 'key_insights': []}
+
+
+class FakeModel:
+    """Answers "<language>: <topic>" prompts and tracks overlapping calls per provider"""
+
+    def __init__(self, fail_languages=(), delays=None):
+        self.fail_languages = fail_languages
+        self.delays = delays or {}
+        self.calls = []
+        self.active = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, provider=None):
+        language = prompt.split(":")[0]
+        with self._lock:
+            self.calls.append((language, provider, prompt))
+            self.active[provider] = self.active.get(provider, 0) + 1
+            self.peak[provider] = max(self.peak.get(provider, 0), self.active[provider])
+        time.sleep(self.delays.get(language, 0.05))
+        with self._lock:
+            self.active[provider] -= 1
+        return None if language in self.fail_languages else f"{language} article"
+
+
+class FakeClaude:
+    """Fallback provider that answers every prompt"""
+
+    def __init__(self, available=True):
+        self.available = available
+        self.prompts = []
+
+    def is_available(self):
+        return self.available
+
+    def generate_content_with_custom_prompt(self, prompt):
+        self.prompts.append(prompt)
+        return f"{prompt.split(':')[0]} from claude"
+
+
+class TestMultilingualFanout(unittest.TestCase):
+    """One research pass, concurrent languages, per-provider caps"""
+
+    def setUp(self):
+        self.researcher = FakeResearcher()
+        self.generator = MultilingualLocalLLMContentGenerator(web_researcher=self.researcher)
+        self.generator.provider_limits = ConcurrencyLimits(default_limit=1)
+        self.generator.is_available = lambda provider=None: provider != "ollama"
+        self.generator.create_multilingual_content_prompt = lambda topic, content_type, language: f"{language}: {topic}"
+        self.model = FakeModel()
+        self.generator.generate_from_prompt = self.model
+
+    def make_system(self, claude=None):
+        """AutoContentSystem on the stubbed generator; the fallback Claude is unavailable unless given"""
+        services = ServiceContainer()
+        services.set("local_llm", self.generator)
+        services.set("claude", claude or FakeClaude(available=False))
+        return AutoContentSystem(services=services)
+
+    def test_results_follow_language_order(self):
+        """Results keep the requested language order whichever finishes first"""
+        self.model.delays = {"english": 0.15, "farsi": 0.0, "spanish": 0.05}
+        posts = self.generator.generate_multilingual_fanout("Topic", ["english", "farsi", "spanish"],
+                                                            providers=["deepseek", "llamacpp"])
+
+        self.assertEqual(list(posts), ["english", "farsi", "spanish"])
+        self.assertEqual([post["provider"] for post in posts.values()], ["deepseek", "llamacpp", "deepseek"])
+        self.assertEqual([post["content"] for post in posts.values()],
+                         ["english article", "farsi article", "spanish article"])
+
+    def test_one_research_pass_for_all_languages(self):
+        """The injected researcher runs once and every prompt carries its findings"""
+        self.generator.generate_multilingual_fanout("Topic", ["english", "farsi", "spanish"])
+
+        self.assertEqual(self.researcher.topics, ["Topic"])
+        self.assertTrue(all("45%" in prompt for _, _, prompt in self.model.calls))
+
+    def test_research_is_packed_into_the_prompt_budget(self):
+        """Research is ranked by relevance to the topic and trimmed to the tokens the prompt has left"""
+        research = {'statistics': [{'value': f'{n}%', 'context': f'unrelated figure {n}'} for n in range(10, 20)],
+                    'key_insights': ['Topic adoption doubled last year']}
+        self.generator.research_budget["max_statistics"] = 2
+        self.generator.generate_multilingual_fanout("Topic", ["english"], research_data=research)
+        prompt = self.model.calls[0][2]
+
+        self.assertIn("Topic adoption doubled last year", prompt)
+        self.assertEqual(sum(f"{n}%" in prompt for n in range(10, 20)), 2)
+
+        self.model.calls.clear()
+        self.generator.prompt_budget.max_input_tokens = self.generator.prompt_budget.count("english: Topic") + 20
+        self.generator.generate_multilingual_fanout("Topic", ["english"], research_data=research)
+        self.assertEqual(self.model.calls[0][2], "english: Topic")
+
+    def test_provider_caps(self):
+        """Each provider serves one request at a time"""
+        started = time.time()
+        self.generator.generate_multilingual_fanout("Topic", ["english", "farsi", "spanish"],
+                                                    providers=["deepseek", "llamacpp"], use_research=False)
+
+        self.assertEqual(self.model.peak, {"deepseek": 1, "llamacpp": 1})
+        # english and spanish queue for deepseek
+        self.assertGreaterEqual(time.time() - started, 0.1)
+
+    def test_partial_failure(self):
+        """A failed language is None while the others are kept; unavailable providers get no work"""
+        self.model.fail_languages = ("farsi",)
+        posts = self.generator.generate_multilingual_fanout("Topic", ["english", "farsi", "spanish"],
+                                                            providers=["ollama", "deepseek"], use_research=False)
+
+        self.assertIsNone(posts["farsi"])
+        self.assertEqual(posts["english"]["content"], "english article")
+        self.assertEqual(posts["spanish"]["content"], "spanish article")
+        self.assertEqual({provider for _, provider, _ in self.model.calls}, {"deepseek"})
+
+    def test_auto_content_system_uses_fanout(self):
+        """The local LLM posting path writes every configured language and saves each post"""
+        system = self.make_system()
+        system.languages = ["english", "spanish"]
+
+        with tempfile.TemporaryDirectory() as content_dir:
+            system.content_dir = content_dir
+            post, translations = system.generate_local_llm_posts("Topic")
+
+            self.assertEqual(post["language"], "english")
+            self.assertEqual([item["language"] for item in translations], ["spanish"])
+            self.assertEqual(len(self.researcher.topics), 1)
+            for item in [post] + translations:
+                with open(item["file_path"], encoding="utf-8") as f:
+                    self.assertTrue(f.read().startswith("---\n"))
+            self.assertEqual(len(os.listdir(content_dir)), 2)
+
+    def test_auto_content_system_fails_over_down_the_routing_chain(self):
+        """A language the local model fails is answered by the next provider of the chain"""
+        self.model.fail_languages = ("spanish",)
+        claude = FakeClaude()
+        system = self.make_system(claude)
+        system.languages = ["english", "spanish"]
+
+        with tempfile.TemporaryDirectory() as content_dir:
+            system.content_dir = content_dir
+            post, translations = system.generate_local_llm_posts("Topic")
+
+        self.assertEqual(post["provider"], "deepseek")
+        self.assertEqual([(item["language"], item["provider"]) for item in translations], [("spanish", "claude")])
+        self.assertEqual(translations[0]["content"], "spanish from claude")
+        self.assertEqual(len(claude.prompts), 1)
+
+    def test_auto_content_system_skips_translations_without_main_post(self):
+        """Without the main language there is nothing to publish translations alongside"""
+        self.model.fail_languages = ("english",)
+        system = self.make_system()
+        system.languages = ["english", "spanish"]
+
+        with tempfile.TemporaryDirectory() as content_dir:
+            system.content_dir = content_dir
+            self.assertEqual(system.generate_local_llm_posts("Topic"), (None, []))
+
+    def test_enabled_provider_stays_with_the_system(self):
+        """Enabling a provider does not change the default of the shared generator"""
+        self.generator.test_connection = lambda provider=None: True
+        system = self.make_system()
+
+        self.assertTrue(system.enable_local_llm("llamacpp"))
+        self.assertEqual(self.generator.current_provider, "deepseek")
+
+        with tempfile.TemporaryDirectory() as content_dir:
+            system.content_dir = content_dir
+            post, _ = system.generate_local_llm_posts("Topic")
+        self.assertEqual(post["provider"], "llamacpp")
+        self.assertEqual({provider for _, provider, _ in self.model.calls}, {"llamacpp"})
+
+
+if __name__ == "__main__":
+    unittest.main()
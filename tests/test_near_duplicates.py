@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Unit tests for SimHash near-duplicate detection
+"""
+
+import random
+import unittest
+
+from core.near_duplicates import SimHashIndex, hamming_distance, normalize_title, simhash
+
+
+def random_text(seed: int, words: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(f"word{rng.randint(0, 5000)}" for _ in range(words))
+
+
+class TestSimHash(unittest.TestCase):
+    """Test fingerprint similarity"""
+
+    def test_identical_texts_match(self):
+        """Identical texts produce identical fingerprints"""
+        self.assertEqual(simhash("Marketing budgets grow again"), simhash("Marketing budgets grow again"))
+
+    def test_small_edits_stay_close(self):
+        """A light edit moves few bits while unrelated text moves many"""
+        original = random_text(1)
+        edited = original.replace("word", "term", 3)
+        unrelated = random_text(2)
+
+        self.assertLess(hamming_distance(simhash(original), simhash(edited)), 10)
+        self.assertGreater(hamming_distance(simhash(original), simhash(unrelated)), 15)
+
+    def test_normalize_title_strips_publisher(self):
+        """Publisher suffixes do not make syndicated titles differ"""
+        self.assertEqual(normalize_title("Acme raises $5B for chips - Reuters"), "Acme raises $5B for chips")
+        self.assertEqual(normalize_title("Acme raises $5B for chips | Yahoo Finance"), "Acme raises $5B for chips")
+
+
+class TestSimHashIndex(unittest.TestCase):
+    """Test LSH lookups"""
+
+    def test_duplicates_are_reported(self):
+        """The first copy is indexed and later copies point back to it"""
+        index = SimHashIndex(max_distance=6)
+        text = random_text(3)
+
+        self.assertIsNone(index.check_and_add("first", text))
+        self.assertEqual(index.check_and_add("copy", text + " extra"), "first")
+        self.assertIsNone(index.check_and_add("other", random_text(4)))
+        self.assertEqual(len(index), 2)
+
+    def test_empty_text_is_ignored(self):
+        """Empty bodies never count as duplicates of each other"""
+        index = SimHashIndex()
+        self.assertIsNone(index.check_and_add("a", ""))
+        self.assertIsNone(index.check_and_add("b", "   "))
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the JSON and SQLite project stores
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.project_store import JSONProjectStore, SQLiteProjectStore, create_project_store, fcntl
+
+
+def make_project(project_id, completed_count=0):
+    return {"id": project_id, "name": f"Project {project_id}", "keywords": ["سئو", "AI SEO"],
+            "completed_count": completed_count, "status": "active"}
+
+
+def add_items(backend, path, times):
+    """Worker process counting generated items one at a time"""
+    store = create_project_store(backend, path)
+    for _ in range(times):
+        store.add_completed("a")
+
+
+class ProjectStoreContract:
+    """Behaviour every backend must share"""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = self.make_store()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_empty_store(self):
+        """A store that was never written loads as empty"""
+        self.assertEqual(self.store.load_all(), {})
+
+    def test_save_and_update_one_project(self):
+        """Per-project saves insert, update and leave other projects alone"""
+        self.store.save_all({"a": make_project("a"), "b": make_project("b")})
+        self.store.save_project("a", make_project("a", completed_count=3))
+        self.store.save_project("c", make_project("c"))
+
+        projects = self.store.load_all()
+        self.assertEqual(list(projects), ["a", "b", "c"])
+        self.assertEqual(projects["a"]["completed_count"], 3)
+        self.assertEqual(projects["b"], make_project("b"))
+        self.assertEqual(projects["a"]["keywords"][0], "سئو")
+
+    def test_save_all_replaces_and_delete(self):
+        """save_all replaces the stored set; delete removes one project"""
+        self.store.save_all({"a": make_project("a"), "b": make_project("b")})
+        self.store.save_all({"b": make_project("b", 1), "c": make_project("c")})
+        self.store.delete_project("c")
+
+        self.assertEqual(self.store.load_all(), {"b": make_project("b", 1)})
+
+    def test_stale_save_keeps_progress(self):
+        """Saving an older copy of a project does not lower its completed count"""
+        self.store.save_project("a", make_project("a", completed_count=3))
+        saved = self.store.save_project("a", dict(make_project("a", completed_count=1), status="paused"))
+
+        self.assertEqual(saved["completed_count"], 3)
+        self.assertEqual(self.store.load_all()["a"], dict(make_project("a", 3), status="paused"))
+
+    def test_add_completed(self):
+        """Progress is added to the stored count; unknown projects are rejected"""
+        self.store.save_project("a", make_project("a", completed_count=2))
+        self.assertEqual(self.store.add_completed("a", 2), 4)
+        self.assertEqual(self.store.load_all()["a"]["completed_count"], 4)
+        with self.assertRaises(KeyError):
+            self.store.add_completed("missing")
+
+    def test_processes_do_not_lose_progress(self):
+        """Items counted by several processes at once all end up in the store"""
+        if isinstance(self.store, JSONProjectStore) and fcntl is None:
+            self.skipTest("the JSON store only locks across processes where fcntl exists")
+        self.store.save_project("a", make_project("a"))
+        workers = [multiprocessing.Process(target=add_items, args=(self.backend, self.store.location(), 10))
+                   for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+
+        self.assertEqual(self.store.load_all()["a"]["completed_count"], 40)
+
+
+class TestJSONProjectStore(ProjectStoreContract, unittest.TestCase):
+    """Test the projects.json backend"""
+    backend = "json"
+
+    def make_store(self):
+        return JSONProjectStore(str(Path(self.temp_dir) / "projects.json"))
+
+    def test_writes_are_atomic(self):
+        """The file is replaced by rename and no temporary files are left behind"""
+        self.store.save_all({"a": make_project("a")})
+        self.store.save_project("a", make_project("a", 1))
+
+        self.assertEqual(os.listdir(self.temp_dir), ["projects.json"])
+        with open(self.store.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["a"]["completed_count"], 1)
+
+
+class TestSQLiteProjectStore(ProjectStoreContract, unittest.TestCase):
+    """Test the SQLite backend"""
+    backend = "sqlite"
+
+    def make_store(self):
+        return SQLiteProjectStore(str(Path(self.temp_dir) / "projects.sqlite"))
+
+    def test_concurrent_reader_sees_updates(self):
+        """A second connection, as a dashboard would open, reads committed rows"""
+        self.store.save_project("a", make_project("a"))
+        reader = SQLiteProjectStore(str(self.store.db_path))
+        self.store.save_project("a", make_project("a", 2))
+
+        self.assertEqual(reader.load_all()["a"]["completed_count"], 2)
+
+    def test_factory(self):
+        """The factory picks the backend and rejects unknown ones"""
+        self.assertIsInstance(create_project_store("sqlite", str(self.store.db_path)), SQLiteProjectStore)
+        self.assertIsInstance(create_project_store("json"), JSONProjectStore)
+        with self.assertRaises(ValueError):
+            create_project_store("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Unit tests for token-budgeted research packing
+"""
+
+import unittest
+
+from core.prompt_budget import PromptBudget, estimate_tokens
+
+
+def make_research(count=20):
+    return {
+        'key_insights': [f"Insight {index} about retail logistics trends" for index in range(count)],
+        'statistics': [{'value': f"{index}%", 'context': f"of firms adopted warehouse robots in survey {index}"}
+                       for index in range(count)] + [{'value': '67%', 'context': 'of marketers use AI SEO tools'}],
+        'articles': [{'title': 'AI SEO tools reshape search', 'description': 'How AI SEO changes rankings'}],
+    }
+
+
+class TestEstimateTokens(unittest.TestCase):
+    """Test token estimates"""
+
+    def test_scales_with_length(self):
+        """Longer text costs more, and Farsi costs more per character than English"""
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertGreater(estimate_tokens("word " * 200), estimate_tokens("word " * 100))
+        self.assertGreater(estimate_tokens("بازاریابی" * 10), estimate_tokens("marketing" * 10))
+
+
+class TestPromptBudget(unittest.TestCase):
+    """Test ranking and packing"""
+
+    def test_relevant_snippets_come_first(self):
+        """Snippets mentioning the keyword survive a tight budget"""
+        packed = PromptBudget(provider="claude").pack(make_research(), "AI SEO", budget_tokens=60)
+
+        self.assertIn("67%: of marketers use AI SEO tools", packed.text)
+        self.assertIn("AI SEO tools reshape search", packed.text)
+        self.assertTrue(packed.dropped)
+        self.assertLessEqual(packed.tokens, 60)
+
+    def test_budget_and_caps_are_respected(self):
+        """Packed context never exceeds the budget or the per-kind caps"""
+        budget = PromptBudget(provider="claude")
+        for budget_tokens in (0, 50, 200, 5000):
+            packed = budget.pack(make_research(), "retail logistics", budget_tokens,
+                                 max_per_kind={"statistic": 3, "insight": 2, "article": 1})
+            self.assertLessEqual(packed.tokens, budget_tokens)
+            self.assertLessEqual(sum(1 for snippet in packed.used if snippet.kind == "statistic"), 3)
+            self.assertLessEqual(sum(1 for snippet in packed.used if snippet.kind == "insight"), 2)
+
+    def test_remaining_budget(self):
+        """The research budget is what the fixed prompt leaves over"""
+        budget = PromptBudget(max_input_tokens=100)
+        self.assertEqual(budget.remaining(""), 100)
+        self.assertEqual(budget.remaining("word " * 1000), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
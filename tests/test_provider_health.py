@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the provider health registry and circuit breaker
+"""
+
+import unittest
+
+from core.provider_health import CLOSED, HALF_OPEN, OPEN, ProviderHealthRegistry
+
+
+class TestProviderHealthRegistry(unittest.TestCase):
+    """Test cached probes and circuit transitions"""
+
+    def setUp(self):
+        self.registry = ProviderHealthRegistry(ttl_seconds=300, failure_threshold=3, reset_timeout=60)
+        self.probes = []
+
+    def probe(self, result=True):
+        def run():
+            self.probes.append(result)
+            return result
+        return run
+
+    def test_healthy_state_is_cached(self):
+        """A successful probe is trusted for the TTL"""
+        for _ in range(5):
+            self.assertTrue(self.registry.is_available("claude", self.probe()))
+        self.assertEqual(len(self.probes), 1)
+
+    def test_passive_success_skips_probe(self):
+        """A real successful request counts as a health check"""
+        self.registry.record_success("claude")
+        self.assertTrue(self.registry.is_available("claude", self.probe()))
+        self.assertEqual(self.probes, [])
+
+    def test_circuit_opens_after_repeated_failures(self):
+        """Consecutive failures open the circuit and stop probing"""
+        for _ in range(3):
+            self.registry.record_failure("deepseek", "timeout")
+
+        self.assertEqual(self.registry.state("deepseek"), OPEN)
+        self.assertFalse(self.registry.is_available("deepseek", self.probe()))
+        self.assertEqual(self.probes, [])
+
+    def test_half_open_trial(self):
+        """After the cool-down one trial is allowed; its outcome closes or reopens the circuit"""
+        for _ in range(3):
+            self.registry.record_failure("deepseek")
+        self.registry._providers["deepseek"].opened_at -= 61
+
+        self.assertEqual(self.registry.state("deepseek"), HALF_OPEN)
+        self.assertTrue(self.registry.is_available("deepseek"))
+        self.assertFalse(self.registry.is_available("deepseek"))
+
+        self.registry.record_failure("deepseek")
+        self.assertEqual(self.registry.state("deepseek"), OPEN)
+
+        self.registry._providers["deepseek"].opened_at -= 61
+        self.assertTrue(self.registry.is_available("deepseek"))
+        self.registry.record_success("deepseek")
+        self.assertEqual(self.registry.state("deepseek"), CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Unit tests for hedged, failover provider routing
+"""
+
+import threading
+import time
+import unittest
+
+from core.concurrency_limits import ConcurrencyLimits
+from core.provider_router import LatencyTracker, ProviderRouter
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test latency percentiles"""
+
+    def test_percentiles(self):
+        """Nearest-rank percentiles over the recorded window"""
+        tracker = LatencyTracker(window=100)
+        for seconds in range(1, 101):
+            tracker.record("claude", float(seconds))
+
+        self.assertEqual(tracker.percentile("claude", 50), 50.0)
+        self.assertEqual(tracker.percentile("claude", 95), 95.0)
+        self.assertIsNone(tracker.percentile("deepseek", 50))
+
+
+class TestProviderRouter(unittest.TestCase):
+    """Test hedging, failover and availability"""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def provider(self, name, content="text", delay=0.0, wait_for_release=False):
+        def generate(prompt):
+            self.calls.append(name)
+            if wait_for_release:
+                self.release.wait(5)
+            time.sleep(delay)
+            return content
+        return generate
+
+    def make_router(self, providers, available=lambda provider: True):
+        router = ProviderRouter(providers, is_available=available, limits=ConcurrencyLimits(default_limit=4))
+        router.config.update({"hedge_delay_seconds": 0.1, "min_hedge_delay": 0.05})
+        return router
+
+    def test_fast_primary_is_not_hedged(self):
+        """A primary that answers before the hedge delay is the only call"""
+        router = self.make_router({"claude": self.provider("claude", "from claude"),
+                                   "deepseek": self.provider("deepseek")})
+        result = router.route("prompt")
+
+        self.assertEqual(result.provider, "claude")
+        self.assertEqual(result.content, "from claude")
+        self.assertFalse(result.hedged)
+        self.assertEqual(self.calls, ["claude"])
+
+    def test_slow_primary_is_hedged(self):
+        """The hedge request wins when the primary is still running"""
+        router = self.make_router({"claude": self.provider("claude", wait_for_release=True),
+                                   "deepseek": self.provider("deepseek", "from deepseek")})
+        result = router.route("prompt")
+
+        self.assertEqual(result.provider, "deepseek")
+        self.assertTrue(result.hedged)
+        self.assertEqual(result.attempted, ["claude", "deepseek"])
+
+    def test_failover_down_the_chain(self):
+        """Failures and unavailable providers move on to the next provider"""
+        router = self.make_router({"claude": self.provider("claude", None),
+                                   "llama": self.provider("llama"),
+                                   "deepseek": self.provider("deepseek", "from deepseek")},
+                                  available=lambda provider: provider != "llama")
+        result = router.route("prompt")
+
+        self.assertEqual(result.provider, "deepseek")
+        self.assertFalse(result.hedged)
+        self.assertEqual(result.attempted, ["claude", "deepseek"])
+
+        router.providers["deepseek"] = self.provider("deepseek", None)
+        self.assertIsNone(router.generate("prompt"))
+
+    def test_hedge_delay_follows_latency(self):
+        """Enough samples replace the default delay with the latency percentile"""
+        router = self.make_router({"claude": self.provider("claude")})
+        self.assertEqual(router.hedge_delay("claude"), 0.1)
+
+        for seconds in (1.0, 2.0, 3.0, 4.0, 5.0):
+            router.latency.record("claude", seconds)
+        self.assertEqual(router.hedge_delay("claude"), 5.0)
+        self.assertEqual(router.get_stats()["claude"]["p50"], 3.0)
+
+    def test_queue_time_is_not_hedged(self):
+        """The hedge timer starts once the primary holds its provider slot"""
+        limits = ConcurrencyLimits(default_limit=1)
+        router = ProviderRouter({"claude": self.provider("claude", "from claude", delay=0.05),
+                                 "deepseek": self.provider("deepseek")},
+                                is_available=lambda provider: True, limits=limits)
+        router.config.update({"hedge_delay_seconds": 0.1, "min_hedge_delay": 0.05, "slot_poll_seconds": 0.02})
+
+        def hold_slot():
+            with limits.slot("claude"):
+                self.release.wait(5)
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        threading.Timer(0.3, self.release.set).start()
+        result = router.route("prompt")
+        holder.join()
+
+        self.assertEqual(result.provider, "claude")
+        self.assertFalse(result.hedged)
+        self.assertEqual(self.calls, ["claude"])
+
+    def test_default_hedge_delay_without_samples(self):
+        """Unmeasured providers are hedged after the default delay; None waits for samples instead"""
+        router = ProviderRouter({"claude": self.provider("claude", "from claude", delay=0.2),
+                                 "deepseek": self.provider("deepseek")},
+                                is_available=lambda provider: True, limits=ConcurrencyLimits(default_limit=4))
+        self.assertEqual(router.hedge_delay("claude"), router.config["hedge_delay_seconds"])
+        self.assertIsNotNone(router.hedge_delay("claude"))
+
+        router.config.update({"hedge_delay_seconds": None, "min_hedge_delay": 0.05})
+        self.assertIsNone(router.hedge_delay("claude"))
+
+        result = router.route("prompt")
+        self.assertEqual(result.provider, "claude")
+        self.assertFalse(result.hedged)
+
+    def test_stage_slot_is_taken_after_the_provider_slot(self):
+        """A request queued for a busy provider holds no stage slot, so other providers keep running"""
+        limits, stages = ConcurrencyLimits(default_limit=1), ConcurrencyLimits(limits={"llm": 1})
+        router = ProviderRouter({"ollama": self.provider("ollama"), "deepseek": self.provider("deepseek", "from deepseek")},
+                                is_available=lambda provider: True, limits=limits, stage_limits=stages)
+
+        held = threading.Event()
+
+        def hold_slot():
+            with limits.slot("ollama"):
+                held.set()
+                self.release.wait(5)
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        held.wait(5)
+        queued = threading.Thread(target=router.route, args=("prompt", ["ollama"]))
+        queued.start()
+        time.sleep(0.1)
+
+        self.assertEqual(router.route("prompt", chain=["deepseek"]).content, "from deepseek")
+        self.release.set()
+        holder.join()
+        queued.join(5)
+        self.assertEqual(self.calls, ["deepseek", "ollama"])
+
+    def test_losers_do_not_block_new_routes(self):
+        """Requests that lost a race keep running without delaying later routes"""
+        router = self.make_router({"claude": self.provider("claude", wait_for_release=True),
+                                   "deepseek": self.provider("deepseek", "from deepseek")})
+        router.limits = ConcurrencyLimits(limits={"claude": 20})
+        started = time.time()
+        results = [router.route("prompt") for _ in range(12)]
+
+        self.assertTrue(all(result.provider == "deepseek" for result in results))
+        self.assertLess(time.time() - started, 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-host token-bucket rate limiter
+"""
+
+import unittest
+from unittest.mock import Mock
+
+from core.rate_limiter import TokenBucket, HostRateLimiter
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test token reservation and pauses"""
+
+    def test_burst_is_free(self):
+        """Requests within the burst allowance need no wait"""
+        bucket = TokenBucket(rate=1.0, burst=3)
+        waits = [bucket.reserve() for _ in range(3)]
+        self.assertTrue(all(wait == 0 for wait in waits))
+
+    def test_reservations_queue_after_burst(self):
+        """Each request past the burst waits one more refill interval"""
+        bucket = TokenBucket(rate=10.0, burst=1)
+        bucket.reserve()
+        second = bucket.reserve()
+        third = bucket.reserve()
+        self.assertAlmostEqual(second, 0.1, delta=0.02)
+        self.assertAlmostEqual(third, 0.2, delta=0.02)
+
+    def test_pause_delays_next_reservation(self):
+        """A pause pushes the next request out by the pause length"""
+        bucket = TokenBucket(rate=100.0, burst=5)
+        bucket.pause_for(2.0)
+        self.assertAlmostEqual(bucket.reserve(), 2.0, delta=0.05)
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    """Test host keying and throttling signals"""
+
+    def test_hosts_have_independent_buckets(self):
+        """Exhausting one host does not slow down another"""
+        limiter = HostRateLimiter(default_rate=1.0, default_burst=1)
+        limiter.acquire("https://a.example.com/one")
+        self.assertGreater(limiter._bucket("a.example.com").reserve(), 0)
+        self.assertEqual(limiter.acquire("https://b.example.com/two"), 0)
+
+    def test_google_news_default_limit(self):
+        """news.google.com gets its own gentler limit"""
+        limiter = HostRateLimiter()
+        bucket = limiter._bucket("news.google.com")
+        self.assertEqual((bucket.rate, bucket.burst), limiter.host_limits["news.google.com"])
+
+    def test_parse_retry_after(self):
+        """Retry-After accepts seconds and HTTP dates"""
+        self.assertEqual(HostRateLimiter.parse_retry_after("30"), 30.0)
+        self.assertEqual(HostRateLimiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(HostRateLimiter.parse_retry_after("soon"))
+        self.assertIsNone(HostRateLimiter.parse_retry_after(None))
+
+    def test_429_penalizes_host(self):
+        """A 429 response pauses the host for the Retry-After period"""
+        limiter = HostRateLimiter()
+        response = Mock(status_code=429, headers={"Retry-After": "5"})
+        delay = limiter.update_from_response("https://a.example.com/", response)
+        self.assertEqual(delay, 5.0)
+        self.assertAlmostEqual(limiter._bucket("a.example.com").reserve(), 5.0, delta=0.1)
+
+    def test_429_without_retry_after_uses_default_backoff(self):
+        """A bare 429 falls back to the default backoff"""
+        limiter = HostRateLimiter(default_backoff=7.0)
+        response = Mock(status_code=429, headers={})
+        self.assertEqual(limiter.update_from_response("https://a.example.com/", response), 7.0)
+
+    def test_long_retry_after_is_capped(self):
+        """A day-long Retry-After is reported but pauses the host for at most max_retry_after"""
+        limiter = HostRateLimiter(max_retry_after=3.0)
+        response = Mock(status_code=429, headers={"Retry-After": "86400"})
+        self.assertEqual(limiter.update_from_response("https://a.example.com/", response), 86400.0)
+        self.assertAlmostEqual(limiter._bucket("a.example.com").reserve(), 3.0, delta=0.1)
+
+    def test_success_does_not_penalize(self):
+        """Normal responses leave the bucket untouched"""
+        limiter = HostRateLimiter()
+        response = Mock(status_code=200, headers={})
+        self.assertIsNone(limiter.update_from_response("https://a.example.com/", response))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
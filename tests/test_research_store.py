@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent research store
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.research_store import ResearchStore
+
+
+class TestResearchStore(unittest.TestCase):
+    """Test freshness-aware reuse of search results and articles"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ResearchStore(db_path=str(Path(self.temp_dir.name) / "research.sqlite"))
+        self.articles = [{
+            'title': f"Marketing trend {index}",
+            'url': f"https://news.google.com/rss/articles/{index}",
+            'google_news_url': f"https://news.google.com/rss/articles/{index}",
+            'published': '',
+            'description': "Email automation adoption keeps growing",
+            'source': 'Google News'
+        } for index in range(5)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_search_results_round_trip(self):
+        """Stored results come back in order and unresolved"""
+        self.store.save_search_results("marketing trends", self.articles, max_results=5)
+        results = self.store.get_search_results("marketing trends", max_results=3)
+
+        self.assertEqual([article['title'] for article in results],
+                         ["Marketing trend 0", "Marketing trend 1", "Marketing trend 2"])
+        self.assertFalse(results[0]['resolved'])
+
+    def test_incomplete_results_are_refetched(self):
+        """A query stored with fewer results than requested is a miss"""
+        self.store.save_search_results("marketing trends", self.articles[:3], max_results=3)
+        self.assertIsNone(self.store.get_search_results("marketing trends", max_results=10))
+
+    def test_stale_results_are_refetched(self):
+        """Results older than the allowed age are a miss"""
+        self.store.save_search_results("marketing trends", self.articles, max_results=5)
+        self.assertIsNone(self.store.get_search_results("marketing trends", max_results=5, max_age_hours=0))
+
+    def test_article_round_trip(self):
+        """Scraped articles are stored with their statistics"""
+        self.store.save_article({
+            'url': "https://example.com/story",
+            'content': "45% of marketers use automation",
+            'statistics': [{'value': '45%', 'context': '45% of marketers', 'type': 'percentage'}],
+            'scraped_at': '2025-01-01T00:00:00'
+        })
+        article = self.store.get_article("https://example.com/story")
+
+        self.assertEqual(article['content'], "45% of marketers use automation")
+        self.assertEqual(article['statistics'][0]['value'], '45%')
+        self.assertIsNone(self.store.get_article("https://example.com/other"))
+
+    def test_insights_round_trip(self):
+        """Insights are keyed by topic regardless of case"""
+        self.store.save_insights("Email Marketing", ["Automation is rising"])
+        self.assertEqual(self.store.get_insights("email marketing"), ["Automation is rising"])
+
+    def test_search(self):
+        """Full-text search finds stored titles and bodies"""
+        self.store.save_search_results("marketing trends", self.articles, max_results=5)
+        self.store.save_article({'url': "https://example.com/story", 'content': "Influencer budgets doubled",
+                                 'statistics': [], 'scraped_at': ''})
+
+        self.assertEqual(len(self.store.search("automation")), 5)
+        self.assertEqual(self.store.search("influencer")[0]['url'], "https://example.com/story")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
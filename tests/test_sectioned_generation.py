@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit tests for section-parallel article generation
+"""
+
+import threading
+import time
+import unittest
+
+from core.concurrency_limits import ConcurrencyLimits
+from core.sectioned_generation import SectionedGenerator, parse_outline
+
+
+class FakeModel:
+    """Answers outline and section prompts and tracks how many calls overlap"""
+
+    def __init__(self, outline="1. Alpha\n2. Beta\n3. Gamma", fail_on=None):
+        self.outline = outline
+        self.fail_on = fail_on
+        self.active = 0
+        self.max_active = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+
+        if prompt.startswith("Create an outline"):
+            return self.outline
+        title = prompt.split("\n")[0]
+        return None if title == self.fail_on else f"Body of {title}"
+
+
+class TestParseOutline(unittest.TestCase):
+    """Test outline parsing"""
+
+    def test_mixed_list_styles(self):
+        """Numbered, bulleted and heading lines are all recognized"""
+        text = "Here is the outline:\n1. Market Overview\n- **Key Trends**\n## Case Studies\n2) Market Overview"
+        self.assertEqual(parse_outline(text), ["Market Overview", "Key Trends", "Case Studies"])
+
+
+class TestSectionedGenerator(unittest.TestCase):
+    """Test ordering, concurrency limits and fallbacks"""
+
+    def test_sections_are_stitched_in_outline_order(self):
+        """The outline comes first and sections are joined in its order"""
+        model = FakeModel()
+        generator = SectionedGenerator(model, "claude", limits=ConcurrencyLimits(limits={"claude": 3}))
+
+        article = generator.generate_article("Topic", lambda title: title)
+
+        self.assertEqual(article, "## Alpha\n\nBody of Alpha\n\n## Beta\n\nBody of Beta\n\n## Gamma\n\nBody of Gamma")
+        self.assertTrue(any("section 2 of 3" in prompt and "3. Gamma" in prompt for prompt in model.prompts))
+
+    def test_provider_limit_bounds_concurrency(self):
+        """No more requests than the provider's limit run at once"""
+        model = FakeModel()
+        generator = SectionedGenerator(model, "deepseek", limits=ConcurrencyLimits(limits={"deepseek": 2}))
+
+        generator.generate_sections("Topic", ["A", "B", "C", "D", "E"], lambda title: title)
+        self.assertEqual(model.max_active, 2)
+
+    def test_unusable_outline_falls_back_to_defaults(self):
+        """A reply without a list uses the default sections"""
+        generator = SectionedGenerator(FakeModel(outline="Sorry, I cannot help."), "claude")
+        self.assertEqual(generator.build_outline("SEO", section_count=3)[0], "Current State of SEO")
+
+    def test_failed_section_fails_article(self):
+        """An article with a missing section is not returned"""
+        generator = SectionedGenerator(FakeModel(fail_on="Beta"), "claude")
+        self.assertIsNone(generator.generate_article("Topic", lambda title: title))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
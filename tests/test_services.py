@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the lazy service container
+"""
+
+import threading
+import unittest
+
+from core.services import DEFAULT_FACTORIES, LazyService, ServiceContainer, create_service_container
+
+
+class Consumer:
+    """Object resolving its components from a container"""
+    component = LazyService("component")
+    other = LazyService("dependency")
+
+    def __init__(self, services):
+        self.services = services
+
+
+class TestServiceContainer(unittest.TestCase):
+    """Test lazy construction, sharing and overrides"""
+
+    def setUp(self):
+        self.builds = []
+        self.services = ServiceContainer()
+
+        def component(services):
+            self.builds.append("component")
+            return {"dependency": services.get("dependency")}
+
+        def dependency(services):
+            self.builds.append("dependency")
+            return object()
+
+        self.services.register("component", component)
+        self.services.register("dependency", dependency)
+
+    def test_built_once_on_first_use(self):
+        """Nothing is built until asked for; later calls share the instance"""
+        self.assertEqual(self.builds, [])
+        first = self.services.get("component")
+        self.assertIs(self.services.get("component"), first)
+        self.assertIs(first["dependency"], self.services.get("dependency"))
+        self.assertEqual(self.builds, ["component", "dependency"])
+
+    def test_concurrent_get_builds_once(self):
+        """Threads racing for a service get the same instance"""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.services.get("dependency")))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.builds, ["dependency"])
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_set_and_reset(self):
+        """A ready-made instance replaces the factory until reset"""
+        double = object()
+        self.services.set("dependency", double)
+        self.assertIs(self.services.get("component")["dependency"], double)
+
+        self.services.reset("dependency")
+        self.assertFalse(self.services.is_built("dependency"))
+        self.assertIsNot(self.services.get("dependency"), double)
+        self.assertTrue(self.services.is_built("component"))
+
+        self.services.reset()
+        self.assertFalse(self.services.is_built("component"))
+
+    def test_unknown_and_circular(self):
+        """Unknown names and dependency cycles are reported"""
+        with self.assertRaises(KeyError):
+            self.services.get("missing")
+
+        self.services.register("a", lambda services: services.get("b"))
+        self.services.register("b", lambda services: services.get("a"))
+        with self.assertRaises(RuntimeError):
+            self.services.get("a")
+        self.assertFalse(self.services.is_built("a"))
+
+    def test_lazy_service_attribute(self):
+        """The attribute resolves on first access, is cached and can be overridden"""
+        consumer = Consumer(self.services)
+        self.assertEqual(self.builds, [])
+        self.assertIs(consumer.other, self.services.get("dependency"))
+        self.assertIn("other", consumer.__dict__)
+
+        replacement = object()
+        consumer.component = replacement
+        self.assertIs(consumer.component, replacement)
+        self.assertFalse(self.services.is_built("component"))
+
+    def test_default_container(self):
+        """Default factories are registered but nothing is built"""
+        services = create_service_container()
+        for name in DEFAULT_FACTORIES:
+            self.assertFalse(services.is_built(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
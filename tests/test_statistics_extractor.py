@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the single-pass statistics extractor
+"""
+
+import unittest
+
+from core.statistics_extractor import StatisticsExtractor, parse_statistic
+
+
+class TestStatisticsExtractor(unittest.TestCase):
+    """Test matching, typing, context and deduplication"""
+
+    def setUp(self):
+        self.extractor = StatisticsExtractor(context_chars=20)
+
+    def test_all_statistic_types(self):
+        """Every legacy pattern is recognized with its type"""
+        text = ("Roughly 45% of teams agree. The market hit $2.5 billion this year with "
+                "300 million users. A 2024 survey found 3x more leads, and by 2030 it doubles.")
+        stats = {stat['value']: stat for stat in self.extractor.extract(text)}
+
+        self.assertEqual(stats['45%']['type'], 'percentage')
+        self.assertEqual(stats['$2.5 billion']['type'], 'monetary')
+        self.assertEqual(stats['300 million']['type'], 'volume')
+        self.assertEqual(stats['2024']['type'], 'year')
+        self.assertEqual(stats['3x']['type'], 'multiplier')
+        self.assertEqual(stats['2030']['type'], 'year')
+
+    def test_typed_numbers(self):
+        """Values are converted to numbers with units"""
+        self.assertEqual(parse_statistic('$2.5 billion', 'monetary'), (2.5e9, 'USD'))
+        self.assertEqual(parse_statistic('45%', 'percentage'), (45.0, '%'))
+        self.assertEqual(parse_statistic('300 million', 'volume'), (3e8, None))
+        self.assertEqual(parse_statistic('2024', 'year'), (2024, 'year'))
+
+    def test_context_comes_from_each_match(self):
+        """Context surrounds the match itself, not the first occurrence of the value"""
+        text = "Intro mentions 12% here. " + "filler " * 20 + "Finally 30% of buyers convert."
+        stats = self.extractor.extract(text)
+
+        self.assertEqual(len(stats), 1)
+        self.assertIn("buyers", stats[0]['context'])
+        self.assertNotIn("Intro", stats[0]['context'])
+
+    def test_repeated_values_are_reported_once(self):
+        """The same value appearing twice yields one statistic"""
+        text = "50% of users agree. Later, 50% of users agree again."
+        self.assertEqual(len(self.extractor.extract(text)), 1)
+
+    def test_max_results(self):
+        """Extraction stops at the requested number of statistics"""
+        text = " ".join(f"{value}% of people" for value in range(1, 30))
+        self.assertEqual(len(self.extractor.extract(text, max_results=5)), 5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
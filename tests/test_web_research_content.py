@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Unit tests for web research and article scraping with stubbed network calls
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from core.http_cache import HTTPResponseCache
+from core.web_research_content import WebResearchContentGenerator
+
+
+def article(query: str, number: int, title: str = None) -> dict:
+    link = f"https://news.google.com/rss/articles/{query.replace(' ', '-')}-{number}"
+    return {'title': title or f"{query} story {number}", 'url': link, 'google_news_url': link,
+            'resolved': False, 'published': '', 'description': '', 'source': 'Google News'}
+
+
+class TestConcurrentResearch(unittest.TestCase):
+    """Searches finish in any order, but research follows query order"""
+
+    def setUp(self):
+        self.researcher = WebResearchContentGenerator(max_workers=4, use_http_cache=False, use_research_store=False)
+        self.researcher.concurrency_config["max_articles_to_scrape"] = 3
+        self.queries = ["alpha", "beta", "gamma"]
+        self.results = {
+            "alpha": [article("alpha", 1), article("alpha", 2)],
+            # The second result is a syndicated copy of alpha's first story
+            "beta": [article("beta", 1), article("beta", 2, title="alpha story 1")],
+            "gamma": [article("gamma", 1), article("alpha", 2)],
+        }
+        # Later queries answer first
+        self.delays = {"alpha": 0.15, "beta": 0.05, "gamma": 0.0}
+        self.scraped = []
+        self.lock = threading.Lock()
+
+        self.researcher.generate_topic_specific_queries = lambda topic: list(self.queries)
+        self.researcher.search_google_news = self.search
+        self.researcher.resolve_article_url = lambda item: item['url']
+        self.researcher.scrape_article_content = self.scrape
+        self.researcher.analyze_research_data = lambda scraped, topic="": []
+
+    def search(self, query, days_back=30, max_results=10, resolve_urls=True):
+        time.sleep(self.delays[query])
+        return [dict(item) for item in self.results[query]]
+
+    def scrape(self, url):
+        with self.lock:
+            self.scraped.append(url)
+        return {'url': url, 'content': f"Body of {url} " * 20, 'statistics': []}
+
+    def test_articles_follow_query_order(self):
+        """Articles and scrapes come from the top results in query order, with duplicates removed"""
+        research = self.researcher.research_topic_comprehensively("topic")
+
+        titles = [item['title'] for item in research['articles']]
+        self.assertEqual(titles, ["alpha story 1", "alpha story 2", "beta story 1", "gamma story 1"])
+        self.assertEqual(sorted(self.scraped), sorted(item['url'] for item in research['articles'][:3]))
+        self.assertEqual(research['sources'], [item['url'] for item in research['articles']])
+
+    def test_repeatable(self):
+        """The same search results give the same research whatever the timing"""
+        first = self.researcher.research_topic_comprehensively("topic")
+        self.delays = {"alpha": 0.0, "beta": 0.1, "gamma": 0.05}
+        second = self.researcher.research_topic_comprehensively("topic")
+
+        self.assertEqual(first['articles'], second['articles'])
+        self.assertEqual(first['sources'], second['sources'])
+
+    def test_queries_keep_order(self):
+        """Generated queries are deduplicated without reordering them"""
+        researcher = WebResearchContentGenerator(use_http_cache=False, use_research_store=False)
+        queries = researcher.generate_topic_specific_queries("AI marketing")
+        self.assertEqual(queries, researcher.generate_topic_specific_queries("AI marketing"))
+        self.assertEqual(len(queries), len(set(queries)))
+        self.assertTrue(queries[0].startswith("AI marketing"))
+
+
+class FakeStreamedResponse:
+    """Streamed response that records how much of the body was read"""
+
+    def __init__(self, body: bytes, content_type: str = "text/html; charset=utf-8", url="https://example.com/a"):
+        self.url = url
+        self.status_code = 200
+        self.headers = {"Content-Type": content_type}
+        self.body = body
+        self.bytes_read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), chunk_size):
+            chunk = self.body[start:start + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    @property
+    def content(self):
+        return self.body
+
+    def close(self):
+        self.closed = True
+
+
+ARTICLE_HTML = b"""<html><head><style>.x { color: red }</style></head><body>
+<article><h1>Headline</h1><script>var tracking = 1;</script><!-- editor note -->
+<p>Adoption grew 45% of companies in 2024.</p><noscript>enable js</noscript><p>Second paragraph.</p></article>
+</body></html>"""
+
+
+class TestStreamedScrape(unittest.TestCase):
+    """Byte caps, content types and text extraction when scraping articles"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.researcher = WebResearchContentGenerator(use_http_cache=False, use_research_store=False)
+        self.responses = []
+        self.researcher._request = self.request
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def request(self, method, url, **kwargs):
+        return self.responses.pop(0)
+
+    def test_body_is_truncated_at_max_bytes(self):
+        """Downloads stop at the byte cap and release the connection"""
+        self.researcher.scrape_config["chunk_size"] = 100
+        response = FakeStreamedResponse(b"<html>" + b"x" * 10000)
+        self.responses.append(response)
+
+        cached = self.researcher._cached_get("https://example.com/a", 'article', max_bytes=250)
+        self.assertEqual(len(cached.content), 250)
+        self.assertLessEqual(response.bytes_read, 300)
+        self.assertTrue(response.closed)
+
+    def test_non_html_is_skipped(self):
+        """A PDF behind an article link is not parsed"""
+        self.responses.append(FakeStreamedResponse(b"%PDF-1.7 binary", content_type="application/pdf"))
+        self.assertEqual(self.researcher.scrape_article_content("https://example.com/report.pdf"), {})
+
+    def test_non_html_is_skipped_on_cache_hit(self):
+        """The stored Content-Type is checked again when the page comes from the cache"""
+        self.researcher.http_cache = HTTPResponseCache(db_path=str(Path(self.temp_dir.name) / "http.sqlite"))
+        self.responses.append(FakeStreamedResponse(b"%PDF-1.7 binary", content_type="application/pdf"))
+
+        self.assertEqual(self.researcher.scrape_article_content("https://example.com/report.pdf"), {})
+        self.assertEqual(self.researcher.scrape_article_content("https://example.com/report.pdf"), {})
+        self.assertEqual(self.researcher.http_cache.get_stats()["hits"], 1)
+
+    def test_script_style_and_comments_are_skipped(self):
+        """Only visible article text is kept, and the parser falls back when lxml is unavailable"""
+        self.researcher.scrape_config["parser"] = "no-such-parser"
+        self.responses.append(FakeStreamedResponse(ARTICLE_HTML))
+
+        scraped = self.researcher.scrape_article_content("https://example.com/a")
+        self.assertEqual(scraped['content'], "Headline Adoption grew 45% of companies in 2024. Second paragraph.")
+        self.assertTrue(scraped['statistics'])
+
+    def test_text_collection_stops_at_limit(self):
+        """Extraction stops once enough text is collected"""
+        soup = self.researcher._parse_html(b"<article>" + b"<p>word word word</p>" * 1000 + b"</article>")
+        text = self.researcher._collect_text(soup.select('article'), 50)
+        self.assertEqual(len(text), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()